@@ -0,0 +1,45 @@
+"""
+Green Data Center Manager: simulação e gestão de um data center alimentado por energia
+renovável e comum.
+
+Importar o pacote não importa nenhum módulo: as classes abaixo são carregadas na primeira
+vez que são usadas, e a interface gráfica (Tkinter e Matplotlib) só quando `Dashboard` ou
+`Application` é pedido. A linha de comando fica em `__main__`:
+
+    python -m Tkinker simulate --hours 24
+    python -m Tkinker dashboard
+    python -m Tkinker bench --startup
+"""
+import importlib
+
+# Nome exportado -> módulo do pacote que o define.
+_EXPORTS = {
+    "EnergySource": "main",
+    "Server": "modelo",
+    "DataCenter": "main",
+    "FleetDataCenter": "frota",
+    "Simulation": "simulacao",
+    "SimulationRunner": "simulacao",
+    "Snapshot": "simulacao",
+    "StateServer": "api_estado",
+    "TelemetryLog": "telemetria",
+    "TelemetryWriter": "telemetria",
+    "ThermalEngine": "termica",
+    "Application": "painel",
+    "Dashboard": "painel",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
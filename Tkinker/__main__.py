@@ -0,0 +1,96 @@
+"""
+Linha de comando do Green Data Center Manager.
+
+    python -m Tkinker simulate [--servers 20] [--hours 24] [--fleet] [--telemetry arquivo.bin]
+    python -m Tkinker dashboard [--no-login] [--speed 1] [--api-port 8765] [--instrumented] ...
+    python -m Tkinker bench [opções de benchmark.py, como --startup ou --compare base.json]
+
+Cada subcomando importa só o que usa: `simulate` e `bench` não carregam a interface gráfica.
+"""
+import argparse
+import sys
+import time
+
+
+def simulate(args):
+    from .simulacao import Simulation
+
+    if args.fleet:
+        from .frota import FleetDataCenter as DataCenter
+    else:
+        from .main import DataCenter
+
+    data_center = DataCenter(renewable_capacity_kW=args.servers * 5, regular_capacity_kW=args.servers * 5 / 2,
+                             server_energy_consumption_kW=5, num_servers=args.servers)
+    simulation = Simulation(data_center, seed=args.seed)
+    simulation.schedule_ticks(max_tasks=args.servers * 5 // 2)
+    telemetry = None
+    if args.telemetry:
+        from .telemetria import TelemetryWriter
+
+        telemetry = TelemetryWriter(args.telemetry, args.servers)
+        telemetry.attach(simulation)
+    last = []
+    simulation.subscribe(last.append)
+    start = time.perf_counter()
+    simulation.run(until=args.hours * 60 * 60)
+    elapsed = time.perf_counter() - start
+    if telemetry is not None:
+        telemetry.close()
+    snapshot = last[-1]
+    print(f"{args.hours:g} h simuladas ({len(last)} ticks) em {elapsed:.2f} s. Último estado: "
+          f"{snapshot.active} ativos, {snapshot.idle} ociosos, {snapshot.renewable:.2f} kW renováveis, "
+          f"{snapshot.regular:.2f} kW comuns")
+    return 0
+
+
+def dashboard(args):
+    from .painel import main
+
+    main(login=not args.no_login, simulation_speed=args.speed, render_interval_ms=args.render_interval_ms,
+         telemetry_path=args.telemetry, replay_path=args.replay, instrumented=args.instrumented,
+         api_port=args.api_port)
+    return 0
+
+
+def bench(args):
+    from .benchmark import main
+
+    return main(args.options, prog="python -m Tkinker bench")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Tkinker", description="Green Data Center Manager.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_simulate = commands.add_parser("simulate", help="Simula o data center sem interface gráfica.")
+    parser_simulate.add_argument("--servers", type=int, default=20, help="Número de servidores.")
+    parser_simulate.add_argument("--hours", type=float, default=24, help="Horas simuladas (um tick por segundo).")
+    parser_simulate.add_argument("--seed", type=int, default=0)
+    parser_simulate.add_argument("--fleet", action="store_true", help="Usa a frota vetorizada (frota.FleetDataCenter).")
+    parser_simulate.add_argument("--telemetry", help="Grava a telemetria de cada tick neste arquivo.")
+    parser_simulate.set_defaults(run=simulate)
+
+    parser_dashboard = commands.add_parser("dashboard", help="Abre a interface gráfica.")
+    parser_dashboard.add_argument("--no-login", action="store_true", help="Abre o painel direto, sem a tela de login.")
+    parser_dashboard.add_argument("--speed", type=float, default=1.0, help="Segundos virtuais por segundo real.")
+    parser_dashboard.add_argument("--render-interval-ms", type=int, default=1000, help="Intervalo entre redesenhos.")
+    parser_dashboard.add_argument("--telemetry", help="Grava a telemetria de cada tick neste arquivo.")
+    parser_dashboard.add_argument("--replay", help="Reproduz um arquivo de telemetria em vez de simular.")
+    parser_dashboard.add_argument("--instrumented", action="store_true", help="Mostra as latências por operação.")
+    parser_dashboard.add_argument("--api-port", type=int, help="Serve o estado em HTTP e WebSocket nesta porta.")
+    parser_dashboard.set_defaults(run=dashboard)
+
+    # As opções de `bench` (inclusive --help) são as de `benchmark.main`, repassadas sem interpretar.
+    parser_bench = commands.add_parser("bench", help="Executa a suíte de benchmarks.", add_help=False)
+    parser_bench.set_defaults(run=bench)
+
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.command != "bench":
+        parser.error(f"argumentos não reconhecidos: {' '.join(extra)}")
+    args.options = extra
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+import time
+
+import numpy as np
+
+
+def allocate_sequence(total_renewable, regular_capacity, num_servers, demands):
+    """
+    Calcula, de uma só vez, o resultado de chamar `EnergySource.allocate_energy`
+    em ordem para cada demanda do vetor. A cota renovável por servidor é sempre
+    o total restante dividido por `num_servers`, como em
+    `main.EnergySource.renewable_capacity_per_server`.
+
+    A fonte alterna entre dois regimes: enquanto a demanda cabe na cota
+    renovável por servidor, o total renovável cai de forma linear (soma de
+    prefixos das demandas); quando não cabe, cada alocação consome 1/N do
+    total, que decai geometricamente. Cada trecho contínuo de um mesmo regime
+    é resolvido em forma fechada com operações vetoriais, usando busca
+    galopante para encontrar o fim do trecho. A energia comum é uma soma de
+    prefixos limitada pela capacidade restante.
+
+    Os resultados coincidem com a execução sequencial a menos de arredondamento
+    de ponto flutuante.
+
+    Args:
+        total_renewable (float): Energia renovável total disponível (kW).
+        regular_capacity (float): Energia comum disponível (kW).
+        num_servers (int): Número de servidores que dividem a cota renovável.
+        demands (array-like): Demandas de energia, na ordem de atendimento (kW).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, float, float]: Energia renovável e comum usada
+        por demanda, e as capacidades renovável e comum restantes.
+    """
+    demands = np.asarray(demands, dtype=np.float64)
+    n = demands.size
+    renewable = np.empty(n)
+    keep = 1.0 - 1.0 / num_servers
+    if n:
+        renewable[0] = min(demands[0], total_renewable / num_servers)
+        total_renewable -= renewable[0]
+    start = 1
+    linear = True
+
+    while start < n:
+        length = _regime_length(demands, start, total_renewable, num_servers, keep, linear)
+        stop = start + length
+        if linear:
+            renewable[start:stop] = demands[start:stop]
+            total_renewable -= renewable[start:stop].sum()
+        else:
+            decay = _decay(keep, length)
+            renewable[start:stop] = total_renewable * decay / num_servers
+            total_renewable *= keep ** length
+        start = stop
+        linear = not linear
+
+    needed = demands - renewable
+    consumed = np.cumsum(needed)
+    available = np.maximum(regular_capacity - (consumed - needed), 0.0)
+    regular = np.minimum(needed, available)
+    regular_capacity = max(regular_capacity - (consumed[-1] if n else 0.0), 0.0)
+    return renewable, regular, float(total_renewable), float(regular_capacity)
+
+
+def allocate_candidates(total_renewable, regular_capacity, num_servers, demands):
+    """
+    Aloca energia, em ordem, às demandas de servidores candidatos à ativação, como em
+    `FleetDataCenter.simulate_tick`: uma demanda só é aceita se a energia renovável total
+    restante a cobrir no momento da alocação; as recusadas não consomem energia.
+
+    A energia renovável só diminui, então quem não cabe em um momento não cabe depois:
+    a cada rodada, as demandas que já não cabem são descartadas e as demais são alocadas
+    com `allocate_sequence` até a primeira recusa.
+
+    Args:
+        total_renewable (float): Energia renovável total disponível (kW).
+        regular_capacity (float): Energia comum disponível (kW).
+        num_servers (int): Número de servidores que dividem a cota renovável.
+        demands (np.ndarray): Demandas dos candidatos, na ordem de atendimento (kW).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, float, float]: Posições das demandas
+        aceitas, energia renovável e comum alocada a cada uma, e as capacidades renovável
+        e comum restantes.
+    """
+    accepted_positions, renewable_used, regular_used = [], [], []
+    pending = np.arange(len(demands))
+    while pending.size:
+        pending = pending[demands[pending] <= total_renewable]
+        if not pending.size:
+            break
+        chunk = demands[pending]
+        renewable, _, _, _ = allocate_sequence(total_renewable, regular_capacity, num_servers, chunk)
+        before = total_renewable - (np.cumsum(renewable) - renewable)
+        refused = np.flatnonzero(before < chunk)
+        accepted = int(refused[0]) if refused.size else pending.size
+        renewable, regular, total_renewable, regular_capacity = allocate_sequence(
+            total_renewable, regular_capacity, num_servers, chunk[:accepted])
+        accepted_positions.append(pending[:accepted])
+        renewable_used.append(renewable)
+        regular_used.append(regular)
+        pending = pending[accepted:]
+    if not accepted_positions:
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), total_renewable, regular_capacity
+    return (np.concatenate(accepted_positions), np.concatenate(renewable_used), np.concatenate(regular_used),
+            total_renewable, regular_capacity)
+
+
+def _decay(keep, length):
+    """Retorna o vetor keep**k para k = 0, ..., length - 1."""
+    if keep == 0.0:
+        decay = np.zeros(length)
+        decay[:1] = 1.0
+        return decay
+    return np.exp(np.arange(length) * np.log(keep))
+
+
+def _regime_length(demands, start, total_renewable, num_servers, keep, linear):
+    """
+    Retorna quantas demandas a partir de `start` permanecem no regime atual.
+
+    A janela examinada dobra de tamanho a cada rodada, então o custo total é
+    proporcional ao comprimento do trecho encontrado.
+    """
+    n = demands.size
+    window = 64
+    while True:
+        stop = min(start + window, n)
+        chunk = demands[start:stop]
+        if linear:
+            spent = np.cumsum(chunk) - chunk
+            inside = chunk * num_servers <= total_renewable - spent
+        else:
+            share = total_renewable * _decay(keep, chunk.size) / num_servers
+            inside = chunk > share
+        broken = np.flatnonzero(~inside)
+        if broken.size:
+            return int(broken[0])
+        if stop == n:
+            return stop - start
+        window *= 2
+
+
+def benchmark_bulk_activation(num_servers, server_energy_consumption_kW=5, repeat=3):
+    """
+    Compara uma ativação em massa (partida a frio) feita com `allocate_energy`
+    chamada servidor a servidor e com `allocate_batch` em uma única chamada.
+
+    Args:
+        num_servers (int): Número de servidores ligados de uma vez.
+        server_energy_consumption_kW (float): Demanda de cada servidor (kW).
+        repeat (int): Número de repetições; vale o menor tempo.
+
+    Returns:
+        Tuple[float, float]: Tempo da versão sequencial e da versão em lote, em segundos.
+    """
+    from .main import EnergySource
+
+    demands = np.full(num_servers, server_energy_consumption_kW, dtype=np.float64)
+    renewable_kW = num_servers * server_energy_consumption_kW * 0.6
+    regular_kW = num_servers * server_energy_consumption_kW * 0.5
+    sequential = batch = float("inf")
+    for _ in range(repeat):
+        source = EnergySource(renewable_kW, regular_kW, num_servers)
+        start = time.perf_counter()
+        for demand in demands.tolist():
+            source.allocate_energy(demand)
+        sequential = min(sequential, time.perf_counter() - start)
+
+        source = EnergySource(renewable_kW, regular_kW, num_servers)
+        start = time.perf_counter()
+        source.allocate_batch(demands)
+        batch = min(batch, time.perf_counter() - start)
+    return sequential, batch
+
+
+if __name__ == "__main__":
+    for num_servers in [1000, 10000, 100000, 1000000]:
+        sequential, batch = benchmark_bulk_activation(num_servers)
+        print(f"{num_servers} servidores: sequencial {sequential * 1000:.2f} ms, "
+              f"lote {batch * 1000:.2f} ms ({sequential / batch:.0f}x)")
@@ -0,0 +1,441 @@
+"""
+API local do estado do data center, em HTTP e WebSocket, sobre `asyncio` (sem dependências).
+
+O servidor assina os snapshots de uma `simulacao.Simulation`. A cada tick, a linha de
+execução da simulação só copia os vetores de estado dos servidores e os entrega ao laço
+de eventos; a comparação com o tick anterior, a serialização e o envio acontecem no laço.
+Se o laço atrasa, os ticks acumulados são publicados juntos, como um único delta. Cada
+resposta é serializada uma única vez por publicação e reaproveitada por todos os clientes.
+
+Rotas HTTP (JSON):
+    GET /status                   Servidores ativos e ociosos e energia restante (como `get_status`).
+    GET /servidores               Estado de todos os servidores.
+    GET /servidores/<id>          Estado de um servidor.
+    GET /historico?campo=active&segundos=3600&estatistica=mean
+                                  Série do histórico (campos renewable_used, regular_used e active).
+    GET /ws                       WebSocket: uma mensagem "completo" com todo o estado e, a cada
+                                  tick, uma mensagem "delta" só com os servidores que mudaram.
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .serie_temporal import TimeSeriesStore
+from .telemetria import _server_columns
+
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+SERVER_FIELDS = ("ativo", "carga", "renovavel", "comum")
+HISTORY_FIELDS = ("renewable_used", "regular_used", "active")
+# Acima deste volume pendente de envio, o cliente deixa de receber deltas e recebe o estado completo depois.
+MAX_PENDING_BYTES = 1 << 20
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _status(snapshot, tick):
+    return {"tick": tick, "time": snapshot.time, "active": snapshot.active, "idle": snapshot.idle,
+            "renewable": snapshot.renewable, "regular": snapshot.regular,
+            "renewable_used": snapshot.renewable_used, "regular_used": snapshot.regular_used}
+
+
+def _server_state(data_center, snapshot):
+    """Cópia do estado por servidor (campos de `SERVER_FIELDS`) ao fim de um tick."""
+    active, renewable_used, regular_used, _ = _server_columns(data_center)
+    loads = getattr(data_center, "loads", None)
+    return {"ativo": np.array(active, dtype=bool),
+            "carga": np.array(snapshot.server_loads if loads is None else loads, dtype=np.int64),
+            "renovavel": np.array(renewable_used, dtype=np.float64),
+            "comum": np.array(regular_used, dtype=np.float64)}
+
+
+def _rows(state, ids):
+    """Linhas [ativo, carga, renovável, comum] dos servidores `ids`."""
+    return [list(row) for row in zip(state["ativo"][ids].tolist(), state["carga"][ids].tolist(),
+                                     state["renovavel"][ids].tolist(), state["comum"][ids].tolist())]
+
+
+def websocket_frame(payload, opcode=0x1):
+    """Quadro WebSocket final, sem máscara (como o servidor deve enviar)."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+async def read_websocket_frame(reader):
+    """Lê um quadro WebSocket (com ou sem máscara) e retorna (opcode, conteúdo)."""
+    first, second = await reader.readexactly(2)
+    length = second & 0x7F
+    if length == 126:
+        length, = struct.unpack("!H", await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack("!Q", await reader.readexactly(8))
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return first & 0x0F, payload
+
+
+class StateServer:
+    """
+    Servidor HTTP e WebSocket do estado de uma simulação, em uma linha de execução própria.
+
+    A cada tick são guardados o snapshot, o estado por servidor e o histórico; as respostas
+    HTTP são serializadas na primeira consulta e reaproveitadas até a próxima publicação. Os
+    assinantes WebSocket recebem o mesmo quadro de delta, montado uma vez por publicação.
+    Há no máximo uma publicação agendada no laço: os ticks que chegam antes dela ser
+    executada só substituem o estado pendente, e os seus snapshots vão para o histórico. Um
+    cliente lento demais (com mais de `MAX_PENDING_BYTES` por enviar) perde os deltas
+    seguintes e recebe de novo o estado completo quando voltar a ter espaço.
+
+    Atributos:
+        simulation (Simulation): A simulação observada.
+        host (str), port (int): Endereço do servidor (port=0 escolhe uma porta livre).
+        history (TimeSeriesStore): Histórico de energia usada e servidores ativos.
+        clients (set): Assinantes WebSocket conectados.
+        tick (int): Número de ticks publicados.
+        publish_seconds (float): Tempo total (de relógio) gasto na linha de execução da simulação.
+
+    Métodos:
+        start(): Inicia o servidor e passa a assinar a simulação.
+        stop(): Fecha as conexões e encerra o servidor.
+    """
+
+    def __init__(self, simulation, host="127.0.0.1", port=8765):
+        self.simulation = simulation
+        self.host = host
+        self.port = port
+        self.history = TimeSeriesStore(HISTORY_FIELDS)
+        self.clients = set()
+        self.tick = 0
+        self.publish_seconds = 0.0
+        self._snapshot = None
+        self._state = None
+        self._cache = {}
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        simulation.subscribe(self._on_snapshot)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, self.host, self.port, backlog=1024))
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _close(self):
+        self._server.close()
+        for writer in list(self.clients):
+            writer.close()
+        await self._server.wait_closed()
+
+    # ----- Linha de execução da simulação: só cópias, o resto fica para o laço -----
+
+    def _on_snapshot(self, snapshot):
+        if self._loop is None:
+            return
+        start = time.perf_counter()
+        state = _server_state(self.simulation.data_center, snapshot)
+        with self._pending_lock:
+            scheduled = self._pending is not None
+            if scheduled:
+                self._pending[0].append(snapshot)
+                self._pending[1] = state
+            else:
+                self._pending = [[snapshot], state]
+        if not scheduled:
+            self._loop.call_soon_threadsafe(self._publish)
+        self.publish_seconds += time.perf_counter() - start
+
+    # ----- Laço de eventos -----
+
+    def _publish(self):
+        with self._pending_lock:
+            (snapshots, state), self._pending = self._pending, None
+        previous = self._state
+        snapshot = snapshots[-1]
+        self.tick += len(snapshots)
+        self._snapshot, self._state, self._cache = snapshot, state, {}
+        for past in snapshots:
+            self.history.append(past.time, (past.renewable_used, past.regular_used, past.active))
+        if not self.clients:
+            return
+        if previous is None or len(previous["carga"]) != len(state["carga"]):
+            changed = np.arange(len(state["carga"]))
+        else:
+            differs = np.zeros(len(state["carga"]), dtype=bool)
+            for field in SERVER_FIELDS:
+                differs |= previous[field] != state[field]
+            changed = np.flatnonzero(differs)
+        frame = websocket_frame(_encode({"tipo": "delta", "status": _status(snapshot, self.tick),
+                                         "ids": changed.tolist(), "valores": _rows(state, changed)}).encode())
+        for writer in list(self.clients):
+            if writer.is_closing():
+                # Conexão já encerrada, mas cuja tarefa ainda não saiu de `_websocket`.
+                self.clients.discard(writer)
+            elif writer.needs_full:
+                if writer.transport.get_write_buffer_size() < MAX_PENDING_BYTES:
+                    writer.write(self._full_frame())
+                    writer.needs_full = False
+            elif writer.transport.get_write_buffer_size() < MAX_PENDING_BYTES:
+                writer.write(frame)
+            else:
+                writer.needs_full = True
+
+    def _cached(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def _full_frame(self):
+        return self._cached("ws", lambda: websocket_frame(self._full_message()))
+
+    def _full_message(self):
+        return self._cached("completo", lambda: _encode({
+            "tipo": "completo", "status": _status(self._snapshot, self.tick), "campos": SERVER_FIELDS,
+            "valores": _rows(self._state, slice(None))}).encode())
+
+    def _route(self, target):
+        """Corpo JSON e código HTTP de uma rota GET."""
+        url = urlsplit(target)
+        path = url.path.rstrip("/")
+        if self._snapshot is None and (path == "/status" or path.startswith("/servidores")):
+            return 503, _encode({"erro": "nenhum tick publicado ainda"}).encode()
+        if path == "/status":
+            return 200, self._cached("status", lambda: _encode(_status(self._snapshot, self.tick)).encode())
+        if path == "/servidores":
+            return 200, self._cached("servidores", lambda: _encode(
+                {"tick": self.tick, "campos": SERVER_FIELDS, "valores": _rows(self._state, slice(None))}).encode())
+        if path.startswith("/servidores/"):
+            try:
+                server_id = int(path.rsplit("/", 1)[1])
+                if server_id < 0:
+                    raise IndexError(server_id)
+                row = _rows(self._state, [server_id])[0]
+            except (ValueError, IndexError):
+                return 404, _encode({"erro": "servidor inexistente"}).encode()
+            return 200, _encode({"tick": self.tick, "id": server_id, **dict(zip(SERVER_FIELDS, row))}).encode()
+        if path == "/historico":
+            query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            field = query.get("campo", "active")
+            if field not in HISTORY_FIELDS:
+                return 400, _encode({"erro": f"campo deve ser um de {list(HISTORY_FIELDS)}"}).encode()
+            try:
+                times, values = self.history.window(field, float(query.get("segundos", 3600)),
+                                                    query.get("estatistica", "mean"))
+            except (KeyError, ValueError) as error:
+                return 400, _encode({"erro": str(error)}).encode()
+            return 200, _encode({"campo": field, "tempos": times.tolist(), "valores": values.tolist()}).encode()
+        return 404, _encode({"erro": "rota inexistente"}).encode()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = (request_line.split(" ") + ["", ""])[:3]
+                headers = {}
+                for line in header_lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._websocket(reader, writer, headers)
+                    return
+                if method != "GET":
+                    status, body = 405, _encode({"erro": "só GET é aceito"}).encode()
+                else:
+                    status, body = self._route(target)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                             b"Connection: %s\r\n\r\n" % (status, _REASONS.get(status, b"OK"), len(body),
+                                                          b"keep-alive" if keep_alive else b"close") + body)
+                await writer.drain()
+                if not keep_alive:
+                    return
+        finally:
+            writer.close()
+
+    async def _websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key", "").encode()
+        accept = base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        writer.needs_full = self._snapshot is None
+        if self._snapshot is not None:
+            writer.write(self._full_frame())
+        self.clients.add(writer)
+        try:
+            while True:
+                opcode, payload = await read_websocket_frame(reader)
+                if opcode == 0x8:
+                    writer.write(websocket_frame(payload[:2], opcode=0x8))
+                    return
+                if opcode == 0x9:
+                    writer.write(websocket_frame(payload, opcode=0xA))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            self.clients.discard(writer)
+
+
+_REASONS = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 405: b"Method Not Allowed",
+            503: b"Service Unavailable"}
+
+
+async def _viewer(host, port, stop, results):
+    """Cliente WebSocket mínimo do benchmark: aplica os deltas a uma cópia local do estado."""
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(np.random.bytes(16))
+    writer.write(b"GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 b"Sec-WebSocket-Key: " + key + b"\r\nSec-WebSocket-Version: 13\r\n\r\n")
+    await reader.readuntil(b"\r\n\r\n")
+    state, messages, received = {}, 0, 0
+    tick = 0
+    while not (stop.is_set() and tick >= results["last_tick"]):
+        try:
+            _, payload = await asyncio.wait_for(read_websocket_frame(reader), 0.5)
+        except asyncio.TimeoutError:
+            continue
+        message = json.loads(payload)
+        messages += 1
+        received += len(payload)
+        if message["tipo"] == "completo":
+            state = dict(enumerate(message["valores"]))
+        else:
+            state.update(zip(message["ids"], message["valores"]))
+        tick = message["status"]["tick"]
+    writer.close()
+    results["viewers"].append((messages, received, state))
+
+
+def _viewers_process(host, port, num_clients, last_tick, connection):
+    """Processo de clientes do benchmark: conecta `num_clients` visualizadores e espera o aviso de fim."""
+    results = {"viewers": [], "last_tick": last_tick}
+
+    async def main():
+        stop = asyncio.Event()
+        viewers = asyncio.gather(*(_viewer(host, port, stop, results) for _ in range(num_clients)))
+        await asyncio.to_thread(connection.recv)
+        stop.set()
+        await viewers
+
+    asyncio.run(main())
+    connection.send(results["viewers"])
+    connection.close()
+
+
+def benchmark_api(num_clients=300, num_ticks=200, num_servers=1000, seed=0):
+    """
+    Mede quanto o servidor acrescenta ao tick da simulação, em tempo de relógio, sem
+    clientes e com `num_clients` assinantes WebSocket conectados, e confere se o estado
+    montado por cada cliente a partir dos deltas é igual ao estado servido em /servidores.
+
+    Os clientes rodam em outro processo, para que o custo de decodificar as mensagens não
+    entre na conta do servidor; com um único núcleo, porém, esse processo ainda disputa a
+    CPU com a simulação.
+
+    Returns:
+        dict: Tempo médio do tick sem o servidor, com o servidor e sem clientes e com os
+        clientes (ms), o acréscimo por tick com os clientes (ms), o tempo gasto no assinante
+        da linha de execução da simulação por tick (ms), bytes médios por mensagem e quantos
+        clientes terminaram com o estado correto.
+    """
+    import multiprocessing
+
+    from .main import DataCenter
+    from .simulacao import Simulation
+
+    def make():
+        data_center = DataCenter(renewable_capacity_kW=num_servers * 3, regular_capacity_kW=num_servers * 2,
+                                 server_energy_consumption_kW=5, num_servers=num_servers)
+        return Simulation(data_center, seed=seed)
+
+    def run_ticks(simulation):
+        start = time.perf_counter()
+        for _ in range(num_ticks):
+            simulation.clock += 1
+            simulation.tick(max_tasks=num_servers, max_load=200000)
+        return (time.perf_counter() - start) / num_ticks * 1e3
+
+    baseline = run_ticks(make())
+    with StateServer(make(), port=0) as server:
+        without_clients = run_ticks(server.simulation)
+
+    simulation = make()
+    with StateServer(simulation, port=0) as server:
+        parent, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=_viewers_process,
+                                          args=(server.host, server.port, num_clients, num_ticks, child))
+        process.start()
+        child.close()
+        while len(server.clients) < num_clients:
+            time.sleep(0.01)
+        with_server = run_ticks(simulation)
+        parent.send("fim")
+        viewers = parent.recv()
+        process.join()
+        expected = json.loads(server._route("/servidores")[1])["valores"]
+
+    correct = sum(1 for _, _, state in viewers if [state[i] for i in range(len(state))] == expected)
+    messages = sum(count for count, _, _ in viewers)
+    return {"tick_sem_servidor_ms": baseline, "tick_sem_clientes_ms": without_clients,
+            "tick_com_servidor_ms": with_server, "acrescimo_por_tick_ms": with_server - baseline,
+            "servidor_por_tick_ms": server.publish_seconds / num_ticks * 1e3,
+            "bytes_por_mensagem": sum(size for _, size, _ in viewers) / max(messages, 1),
+            "clientes_corretos": correct, "clientes": num_clients}
+
+
+if __name__ == "__main__":
+    results = benchmark_api()
+    print(f"Acréscimo no tick com {results['clientes']} clientes WebSocket em outro processo: "
+          f"{results['acrescimo_por_tick_ms']:.3f} ms (tick de {results['tick_sem_servidor_ms']:.3f} ms sem "
+          f"servidor, {results['tick_sem_clientes_ms']:.3f} ms com servidor e sem clientes, "
+          f"{results['tick_com_servidor_ms']:.3f} ms com os clientes)")
+    print(f"Tempo do assinante na linha de execução da simulação: {results['servidor_por_tick_ms']:.3f} ms por tick")
+    print(f"Núcleos disponíveis: {os.cpu_count()}; mensagens de {results['bytes_por_mensagem']:.0f} bytes em média; "
+          f"{results['clientes_corretos']} de {results['clientes']} clientes com o estado correto")
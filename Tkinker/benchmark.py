@@ -0,0 +1,301 @@
+"""
+Suíte de benchmarks de vazão do motor de simulação.
+
+Mede as operações centrais do data center em vários tamanhos de frota e
+quantidades de tarefas, sem pausas artificiais, e reporta operações por
+segundo, latência p50/p99 por operação e pico de memória. O resultado é
+emitido em JSON e pode ser comparado com uma linha de base salva.
+
+Também mede o tempo de importação dos módulos do pacote, cada um em um interpretador
+novo (`--startup`).
+
+Uso:
+    python -m Tkinker bench --sizes 1000 10000 --tasks 1000 100000 --output resultado.json
+    python -m Tkinker bench --compare linha_de_base.json --threshold 0.15
+    python -m Tkinker bench --startup --cases simulate_tick
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .eventos import disabled
+
+
+def _case_add_task(num_servers, num_tasks, rng):
+    from .carga import DataCenter
+
+    data_center = DataCenter(num_servers=num_servers)
+    loads = [rng.randint(5, 50) for _ in range(num_tasks)]
+    return None, lambda i: data_center.add_task(loads[i]), num_tasks
+
+
+def _case_check_and_cool(num_servers, num_tasks, rng):
+    from .carga import DataCenter
+
+    data_center = DataCenter(num_servers=num_servers)
+    loads = [rng.randint(5, 50) for _ in range(num_tasks)]
+
+    def prepare(i):
+        server = data_center.coolest_server()
+        server.add_task(loads[i])
+        data_center._reindex(server)
+
+    return prepare, lambda i: data_center.check_and_cool(), num_tasks
+
+
+def _case_redistribute_load(num_servers, num_tasks, rng):
+    from .carga import DataCenter
+
+    data_center = DataCenter(num_servers=num_servers)
+    loads = [rng.randint(100, 300) for _ in range(num_tasks)]
+    target = []
+
+    def prepare(i):
+        # Sobrecarrega o servidor mais frio para que haja carga a redistribuir.
+        server = data_center.coolest_server()
+        server.add_task(loads[i])
+        data_center._reindex(server)
+        target[:] = [server]
+
+    return prepare, lambda i: data_center.redistribute_load(target[0]), num_tasks
+
+
+def _case_allocate_energy(num_servers, num_tasks, rng):
+    from .main import EnergySource
+
+    source = EnergySource(num_servers * 3, num_servers * 2, num_servers)
+    demands = [rng.uniform(1, 10) for _ in range(num_tasks)]
+    return None, lambda i: source.allocate_energy(demands[i]), num_tasks
+
+
+def _case_simulate_tasks(num_servers, num_tasks, rng):
+    from .main import DataCenter
+    from .simulacao import Simulation
+
+    data_center = DataCenter(renewable_capacity_kW=num_servers * 5, regular_capacity_kW=num_servers * 2.5,
+                             server_energy_consumption_kW=5, num_servers=num_servers)
+    simulation = Simulation(data_center, seed=rng.random())
+    # Cada tick percorre a frota inteira; limita o número de ticks para frotas grandes.
+    num_ticks = max(1, min(num_tasks, 10 ** 7 // num_servers))
+    return None, lambda i: simulation.tick(max_tasks=num_servers), num_ticks
+
+
+def _case_simulate_tick(num_servers, num_tasks, rng):
+    from .frota import FleetDataCenter
+    from .simulacao import Simulation
+
+    data_center = FleetDataCenter(renewable_capacity_kW=num_servers * 5, regular_capacity_kW=num_servers * 2.5,
+                                  server_energy_consumption_kW=5, num_servers=num_servers)
+    simulation = Simulation(data_center, seed=rng.random())
+    num_ticks = max(1, min(num_tasks, 10 ** 8 // num_servers))
+    return None, lambda i: simulation.tick(max_tasks=num_servers), num_ticks
+
+
+CASES = {
+    "add_task": _case_add_task,
+    "check_and_cool": _case_check_and_cool,
+    "redistribute_load": _case_redistribute_load,
+    "allocate_energy": _case_allocate_energy,
+    "simulate_tasks": _case_simulate_tasks,
+    "simulate_tick": _case_simulate_tick,
+}
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def run_case(name, num_servers, num_tasks, seed=0, memory=True):
+    """
+    Executa um caso de benchmark e mede cada operação individualmente.
+
+    A preparação de cada operação (quando o caso precisa de uma) fica fora da medição.
+    O pico de memória é medido em uma segunda execução sob `tracemalloc`, para não
+    distorcer as latências.
+
+    Args:
+        name (str): Nome do caso (uma chave de CASES).
+        num_servers (int): Tamanho da frota.
+        num_tasks (int): Número de operações (ou de ticks, limitado nos casos de tick).
+        seed (int): Semente das cargas e demandas geradas.
+        memory (bool): Se deve medir o pico de memória.
+
+    Returns:
+        dict: Caso, tamanhos, operações, tempo total, ops/s, p50/p99 em µs e pico de memória em bytes.
+    """
+    prepare, operation, count = CASES[name](num_servers, num_tasks, random.Random(seed))
+    latencies = [0] * count
+    clock = time.perf_counter_ns
+    with disabled():
+        for i in range(count):
+            if prepare is not None:
+                prepare(i)
+            start = clock()
+            operation(i)
+            latencies[i] = clock() - start
+
+    total = sum(latencies) / 1e9
+    latencies.sort()
+    result = {
+        "case": name,
+        "servers": num_servers,
+        "tasks": num_tasks,
+        "ops": count,
+        "seconds": total,
+        "ops_per_sec": count / total if total else float("inf"),
+        "p50_us": _percentile(latencies, 0.50) / 1e3,
+        "p99_us": _percentile(latencies, 0.99) / 1e3,
+        "peak_memory_bytes": None,
+    }
+
+    if memory:
+        tracemalloc.start()
+        try:
+            prepare, operation, count = CASES[name](num_servers, num_tasks, random.Random(seed))
+            with disabled():
+                for i in range(count):
+                    if prepare is not None:
+                        prepare(i)
+                    operation(i)
+            result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_suite(cases=None, sizes=(1000, 10000), tasks=(1000, 10000), seed=0, memory=True, progress=None):
+    """
+    Executa todos os casos pedidos na grade de tamanhos de frota e quantidades de tarefas.
+
+    Returns:
+        dict: Metadados da execução e a lista de resultados de `run_case`.
+    """
+    results = []
+    for name in cases or CASES:
+        for num_servers in sizes:
+            for num_tasks in tasks:
+                result = run_case(name, num_servers, num_tasks, seed=seed, memory=memory)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+# Módulos cujo tempo de importação é medido: o pacote, o backend e, por último, a interface gráfica.
+STARTUP_MODULES = ("", ".main", ".simulacao", ".carga", ".priorizacao", ".painel")
+
+
+def measure_startup(modules=STARTUP_MODULES, repeats=5):
+    """
+    Mede o tempo de importação de cada módulo em um interpretador novo (sem nada em cache
+    na memória), descontando o tempo de iniciar o próprio Python.
+
+    Args:
+        modules (tuple): Módulos relativos ao pacote ("" é o próprio pacote).
+        repeats (int): Execuções por módulo; vale a mais rápida.
+
+    Returns:
+        list: Um dicionário por módulo, com o nome e o tempo de importação em milissegundos.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = ("import importlib, time; start = time.perf_counter(); importlib.import_module({!r}); "
+              "print(time.perf_counter() - start)")
+    results = []
+    for module in modules:
+        name = __package__ + module
+        best = min(float(subprocess.run([sys.executable, "-c", script.format(name)], cwd=root, check=True,
+                                        capture_output=True, text=True).stdout)
+                   for _ in range(repeats))
+        results.append({"module": name, "ms": best * 1e3})
+    return results
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Compara resultados com uma linha de base e aponta regressões.
+
+    Uma regressão é uma queda de ops/s ou um aumento de p99 acima de `threshold`
+    (fração) para o mesmo caso, tamanho de frota e quantidade de tarefas, ou um aumento
+    do tempo de importação de um módulo acima de `threshold`.
+
+    Returns:
+        list: Uma mensagem por regressão encontrada.
+    """
+    reference = {(r["case"], r["servers"], r["tasks"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get((result["case"], result["servers"], result["tasks"]))
+        if base is None:
+            continue
+        label = f"{result['case']} (servidores={result['servers']}, tarefas={result['tasks']})"
+        if result["ops_per_sec"] < base["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{label}: ops/s {base['ops_per_sec']:.0f} -> {result['ops_per_sec']:.0f}")
+        if result["p99_us"] > base["p99_us"] * (1 + threshold):
+            regressions.append(f"{label}: p99 {base['p99_us']:.1f} µs -> {result['p99_us']:.1f} µs")
+    startup = {r["module"]: r["ms"] for r in baseline.get("startup", ())}
+    for result in current.get("startup", ()):
+        base = startup.get(result["module"])
+        if base is not None and result["ms"] > base * (1 + threshold):
+            regressions.append(f"importação de {result['module']}: {base:.1f} ms -> {result['ms']:.1f} ms")
+    return regressions
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Benchmarks de vazão do Green Data Center Manager.")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), help="Casos a executar (padrão: todos).")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 10000], help="Tamanhos de frota.")
+    parser.add_argument("--tasks", nargs="+", type=int, default=[1000, 10000], help="Quantidades de tarefas.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Não mede o pico de memória.")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: saída padrão).")
+    parser.add_argument("--compare", help="Arquivo JSON de linha de base para detectar regressões.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Tolerância de regressão (fração).")
+    parser.add_argument("--startup", action="store_true", help="Mede também o tempo de importação dos módulos.")
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        print(f"{result['case']:>18} servidores={result['servers']:<8} tarefas={result['tasks']:<8} "
+              f"{result['ops_per_sec']:>12.0f} ops/s  p50 {result['p50_us']:8.1f} µs  "
+              f"p99 {result['p99_us']:8.1f} µs", file=sys.stderr)
+
+    report = run_suite(args.cases, args.sizes, args.tasks, seed=args.seed, memory=not args.no_memory,
+                       progress=progress)
+    if args.startup:
+        report["startup"] = measure_startup()
+        for result in report["startup"]:
+            print(f"{'importação':>18} {result['module']:<30} {result['ms']:>8.1f} ms", file=sys.stderr)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            regressions = compare(report, json.load(baseline_file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSÃO: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Fontes de carga de trabalho em fluxo para `carga.DataCenter`.
+
+Todas as fontes produzem lotes `(chegadas, cargas)` de vetores NumPy, lidos ou gerados
+sob demanda, então um traço de milhões de tarefas é consumido com memória constante
+(proporcional ao tamanho do lote). As chegadas são instantes em segundos, em ordem
+crescente; as cargas são inteiros.
+
+Formatos de traço:
+    CSV: cabeçalho com as colunas `arrival` e `load` (outras colunas são ignoradas).
+    Binário: cabeçalho de 16 bytes seguido de registros fixos (float64 chegada, int32 carga).
+"""
+import itertools
+import os
+import struct
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from .eventos import disabled
+from .simulacao import TASK
+
+TRACE_MAGIC = b"GDCTRACE"
+TRACE_HEADER = struct.Struct("<8s8x")
+TRACE_DTYPE = np.dtype([("arrival", "<f8"), ("load", "<i4")])
+
+
+def synthetic_tasks(num_tasks, seed=0, batch_size=65536, low=5, high=50, rate=100.0, start=0.0):
+    """
+    Gera tarefas sintéticas em lotes vetorizados: cargas uniformes em [low, high] e
+    chegadas de um processo de Poisson com `rate` tarefas por segundo.
+
+    A mesma semente e o mesmo tamanho de lote reproduzem o mesmo traço.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Chegadas (s) e cargas de cada lote.
+    """
+    rng = np.random.default_rng(seed)
+    clock = start
+    remaining = num_tasks
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        arrivals = clock + np.cumsum(rng.exponential(1.0 / rate, size))
+        loads = rng.integers(low, high + 1, size, dtype=np.int32)
+        clock = float(arrivals[-1])
+        remaining -= size
+        yield arrivals, loads
+
+
+def read_csv_trace(path, chunk_size=65536):
+    """
+    Lê um traço CSV simples (sem aspas), em lotes de até `chunk_size` linhas, cada
+    lote convertido de uma vez por `np.loadtxt`.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Chegadas (s) e cargas de cada lote.
+    """
+    with open(path, encoding="utf-8") as trace:
+        header = [name.strip() for name in trace.readline().split(",")]
+        columns = (header.index("arrival"), header.index("load"))
+        while True:
+            lines = list(itertools.islice(trace, chunk_size))
+            if not lines:
+                break
+            data = np.loadtxt(lines, delimiter=",", usecols=columns, ndmin=2)
+            if len(data):
+                yield data[:, 0], data[:, 1].astype(np.int32)
+
+
+def write_csv_trace(path, batches):
+    """Grava lotes `(chegadas, cargas)` em um traço CSV. Retorna o número de tarefas gravadas."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as trace:
+        trace.write("arrival,load\n")
+        for arrivals, loads in batches:
+            trace.writelines(f"{arrival!r},{load}\n" for arrival, load in zip(arrivals.tolist(), loads.tolist()))
+            count += len(loads)
+    return count
+
+
+def write_binary_trace(path, batches):
+    """Grava lotes `(chegadas, cargas)` no formato binário. Retorna o número de tarefas gravadas."""
+    count = 0
+    with open(path, "wb") as trace:
+        trace.write(TRACE_HEADER.pack(TRACE_MAGIC))
+        for arrivals, loads in batches:
+            records = np.empty(len(loads), dtype=TRACE_DTYPE)
+            records["arrival"] = arrivals
+            records["load"] = loads
+            trace.write(memoryview(records).cast("B"))
+            count += len(loads)
+    return count
+
+
+def read_binary_trace(path, chunk_size=65536):
+    """
+    Lê um traço binário mapeado em memória, em lotes de até `chunk_size` tarefas.
+    Só as páginas do lote atual precisam estar em memória.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: Chegadas (s) e cargas de cada lote.
+    """
+    with open(path, "rb") as trace:
+        magic, = TRACE_HEADER.unpack(trace.read(TRACE_HEADER.size))
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"{path} não é um traço de carga binário")
+    count = (os.path.getsize(path) - TRACE_HEADER.size) // TRACE_DTYPE.itemsize
+    if not count:
+        return
+    records = np.memmap(path, dtype=TRACE_DTYPE, mode="r", offset=TRACE_HEADER.size, shape=(count,))
+    for start in range(0, count, chunk_size):
+        chunk = records[start:start + chunk_size]
+        yield np.array(chunk["arrival"]), np.array(chunk["load"])
+
+
+def read_trace(path, chunk_size=65536):
+    """Lê um traço CSV ou binário, escolhendo o formato pela assinatura do arquivo."""
+    with open(path, "rb") as trace:
+        binary = trace.read(len(TRACE_MAGIC)) == TRACE_MAGIC
+    return read_binary_trace(path, chunk_size) if binary else read_csv_trace(path, chunk_size)
+
+
+def tasks(batches):
+    """Achata lotes `(chegadas, cargas)` em pares `(chegada, carga)`, um por tarefa."""
+    for arrivals, loads in batches:
+        yield from zip(arrivals.tolist(), loads.tolist())
+
+
+def feed(data_center, batches):
+    """
+    Aloca, em ordem, a carga de cada tarefa dos lotes com `data_center.add_task`,
+    ignorando os instantes de chegada.
+
+    Returns:
+        int: Número de tarefas alocadas.
+    """
+    count = 0
+    add_task = data_center.add_task
+    for _, loads in batches:
+        for load in loads.tolist():
+            add_task(load)
+        count += len(loads)
+    return count
+
+
+def schedule_trace(simulation, batches):
+    """
+    Agenda as tarefas dos lotes em uma `simulacao.Simulation`, cada uma no seu instante
+    de chegada, chamando `data_center.add_task(load)`. Como em `schedule_arrivals`, só a
+    próxima tarefa fica na fila de eventos; o traço é consumido sob demanda.
+    """
+    pending = tasks(batches)
+
+    def schedule_next():
+        for arrival, load in pending:
+            simulation.schedule(arrival, TASK, lambda load=load: on_arrival(load))
+            break
+
+    def on_arrival(load):
+        simulation.data_center.add_task(load)
+        schedule_next()
+
+    schedule_next()
+
+
+def measure_stream(num_tasks=5000000, seed=0, binary=True):
+    """
+    Grava um traço sintético em disco e o lê em lotes, medindo a vazão da leitura e o
+    pico de memória alocada, que depende do tamanho do lote e não do tamanho do traço.
+
+    Returns:
+        dict: Tarefas, segundos, tarefas por segundo e pico de memória (MB) da leitura.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "traco.bin" if binary else "traco.csv")
+        write = write_binary_trace if binary else write_csv_trace
+        write(path, synthetic_tasks(num_tasks, seed=seed))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        count = total_load = 0
+        for _, loads in read_trace(path):
+            count += len(loads)
+            total_load += int(loads.sum())
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "tarefas": count,
+        "segundos": elapsed,
+        "tarefas_por_segundo": count / elapsed,
+        "pico_de_memoria_mb": peak / 2 ** 20,
+    }
+
+
+def measure_replay(num_tasks=100000, num_servers=5, seed=0):
+    """
+    Reproduz um traço sintético em um `carga.DataCenter`, com o registro de eventos desligado.
+
+    Returns:
+        dict: Tarefas, segundos e tarefas por segundo.
+    """
+    from .carga import DataCenter
+
+    data_center = DataCenter(num_servers=num_servers)
+    with disabled():
+        start = time.perf_counter()
+        count = feed(data_center, synthetic_tasks(num_tasks, seed=seed))
+        elapsed = time.perf_counter() - start
+    return {"tarefas": count, "segundos": elapsed, "tarefas_por_segundo": count / elapsed}
+
+
+if __name__ == "__main__":
+    for num_tasks in [100000, 5000000]:
+        for binary in (True, False) if num_tasks <= 1000000 else (True,):
+            result = measure_stream(num_tasks, binary=binary)
+            print(f"Leitura de {num_tasks} tarefas ({'binário' if binary else 'CSV'}): {result['segundos']:.2f} s, "
+                  f"{result['tarefas_por_segundo']:.0f} tarefas/s, pico de memória {result['pico_de_memoria_mb']:.2f} MB")
+    result = measure_replay()
+    print(f"Reprodução de {result['tarefas']} tarefas em carga.DataCenter: {result['segundos']:.2f} s, "
+          f"{result['tarefas_por_segundo']:.0f} tarefas/s")
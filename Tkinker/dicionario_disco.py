@@ -0,0 +1,523 @@
+import itertools
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+from sortedcontainers import SortedDict
+
+from .eficiencia import DicionarioOrdenado
+
+MANIFESTO = "manifesto.json"
+
+
+class DicionarioEmDisco:
+    """
+    Dicionário ordenado gravado em disco, com a mesma interface de `eficiencia.DicionarioOrdenado`,
+    para conjuntos de chaves que não cabem na memória.
+
+    A organização segue uma árvore LSM: as escritas vão para uma tabela em memória
+    (`SortedDict`) de tamanho limitado, que, ao encher, é gravada como um segmento
+    ordenado e imutável. Os segmentos são lidos por `np.memmap`, então só as páginas
+    consultadas ocupam memória (e o sistema operacional pode descartá-las). Remoções
+    gravam marcas de remoção, que escondem as versões mais antigas da chave. Quando há
+    segmentos demais, uma linha de execução em segundo plano os compacta em um só,
+    descartando versões antigas e marcas de remoção.
+
+    Chaves e valores têm tipos fixos do NumPy (por padrão, chaves float64 e valores
+    int64), o que permite a busca binária direto nos segmentos mapeados. Não há log de
+    escrita antecipada: o que estiver na tabela em memória só chega ao disco ao encher
+    ou em `fechar()`.
+
+    Atributos:
+        pasta (str): Pasta dos segmentos e do manifesto.
+        limite_memoria (int): Número máximo de itens na tabela em memória.
+        max_segmentos (int): Número de segmentos a partir do qual a compactação é iniciada.
+
+    Métodos:
+        inserir(chave, valor) / inserir_lote(pares): Insere ou substitui itens.
+        buscar(chave) / buscar_lote(chaves): Retorna valores (KeyError se a chave não existir).
+        existe(chave), remover(chave), remover_lote(chaves): Como em `DicionarioOrdenado`.
+        menor_chave(), maior_chave(), remover_menor(), remover_maior(): Acesso aos extremos.
+        itens(minimo, maximo) / intervalo(minimo, maximo): Itens em ordem de chave.
+        iterar(): Exibe todos os itens, em ordem.
+        compactar(esperar): Compacta os segmentos, opcionalmente esperando o fim.
+        fechar(): Grava a tabela em memória e espera a compactação em andamento.
+    """
+
+    def __init__(self, pasta, tipo_chave="f8", tipo_valor="i8", limite_memoria=100000, max_segmentos=4):
+        self.pasta = pasta
+        self.limite_memoria = limite_memoria
+        self.max_segmentos = max_segmentos
+        os.makedirs(pasta, exist_ok=True)
+        caminho = os.path.join(pasta, MANIFESTO)
+        manifesto = {"tipo_chave": tipo_chave, "tipo_valor": tipo_valor, "segmentos": [], "tamanho": 0, "proximo": 0}
+        if os.path.exists(caminho):
+            with open(caminho) as arquivo:
+                manifesto = json.load(arquivo)
+        self.tipo_chave = np.dtype(manifesto["tipo_chave"])
+        self.tipo_valor = np.dtype(manifesto["tipo_valor"])
+        self._tamanho = manifesto["tamanho"]
+        self._proximo = manifesto["proximo"]
+        # Segmentos do mais antigo para o mais novo, como pares (nome do arquivo, colunas mapeadas).
+        self._segmentos = [(nome, self._mapear(nome)) for nome in manifesto["segmentos"]]
+        self._memoria = SortedDict()
+        # Colunas NumPy da tabela em memória, refeitas só depois de uma escrita.
+        self._colunas_memoria = None
+        # Segmentos compactados que ainda não puderam ser apagados por estarem mapeados.
+        self._a_remover = []
+        self._trava = threading.Lock()
+        self._compactacao = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.fechar()
+
+    def __len__(self):
+        return self._tamanho
+
+    def inserir(self, chave, valor):
+        if not self.existe(chave):
+            self._tamanho += 1
+        self._memoria[chave] = (valor, False)
+        self._colunas_memoria = None
+        self._verificar_memoria()
+
+    def inserir_lote(self, pares):
+        """
+        Insere vários pares (chave, valor); a existência das chaves nos segmentos é
+        verificada com uma busca binária vetorizada por segmento. Os pares são lidos em
+        lotes de até `limite_memoria`, então podem vir de um iterador maior que a memória.
+        """
+        pares = iter(pares)
+        while True:
+            lote = dict(itertools.islice(pares, self.limite_memoria))
+            if not lote:
+                return
+            chaves = np.array(list(lote), dtype=self.tipo_chave)
+            novos = ~self._encontrar(chaves)[0]
+            self._tamanho += int(np.count_nonzero(novos))
+            self._memoria.update((chave, (valor, False)) for chave, valor in lote.items())
+            self._colunas_memoria = None
+            self._verificar_memoria()
+
+    def buscar(self, chave):
+        encontrado, valor = self._procurar(chave)
+        if not encontrado:
+            raise KeyError(chave)
+        return valor
+
+    def buscar_lote(self, chaves):
+        """
+        Busca várias chaves de uma vez.
+
+        Retorna:
+        np.ndarray: Os valores, na ordem das chaves.
+
+        Levanta:
+        KeyError: Se alguma chave não existir.
+        """
+        chaves = np.asarray(chaves, dtype=self.tipo_chave)
+        encontrados, valores = self._encontrar(chaves)
+        if not encontrados.all():
+            raise KeyError(chaves[np.argmin(encontrados)].item())
+        return valores
+
+    def existe(self, chave):
+        return self._procurar(chave)[0]
+
+    def remover(self, chave):
+        if not self.existe(chave):
+            raise KeyError(chave)
+        self._tamanho -= 1
+        self._memoria[chave] = (self.tipo_valor.type(0), True)
+        self._colunas_memoria = None
+        self._verificar_memoria()
+
+    def remover_lote(self, chaves):
+        chaves = np.unique(np.asarray(list(chaves), dtype=self.tipo_chave))
+        encontrados = self._encontrar(chaves)[0]
+        if not encontrados.all():
+            raise KeyError(chaves[np.argmin(encontrados)].item())
+        self._tamanho -= len(chaves)
+        marca = (self.tipo_valor.type(0), True)
+        self._memoria.update((chave, marca) for chave in chaves.tolist())
+        self._colunas_memoria = None
+        self._verificar_memoria()
+
+    def menor_chave(self):
+        return self._extremo(maior=False)
+
+    def maior_chave(self):
+        return self._extremo(maior=True)
+
+    def remover_menor(self):
+        self.remover(self.menor_chave()[0])
+
+    def remover_maior(self):
+        self.remover(self.maior_chave()[0])
+
+    def itens(self, minimo=None, maximo=None):
+        """Gera os pares (chave, valor) com chave entre `minimo` e `maximo` (inclusive), em ordem."""
+        for chaves, valores, _ in _mesclar(self._fontes(), minimo, maximo):
+            yield from zip(chaves.tolist(), valores.tolist())
+
+    def intervalo(self, minimo=None, maximo=None):
+        return list(self.itens(minimo, maximo))
+
+    def iterar(self):
+        for chave, valor in self.itens():
+            print(f"{chave}: {valor}")
+
+    def compactar(self, esperar=False):
+        """
+        Compacta todos os segmentos atuais em um só, em segundo plano. Segmentos gravados
+        durante a compactação não participam dela e continuam valendo sobre o resultado.
+        """
+        with self._trava:
+            if self._compactacao is None and len(self._segmentos) > 1:
+                self._compactacao = threading.Thread(target=self._compactar, args=(list(self._segmentos),),
+                                                     daemon=True)
+                self._compactacao.start()
+            compactacao = self._compactacao
+        if esperar and compactacao is not None:
+            compactacao.join()
+
+    def fechar(self):
+        self._gravar_memoria()
+        compactacao = self._compactacao
+        if compactacao is not None:
+            compactacao.join()
+        self._salvar_manifesto()
+        self._remover_arquivos([])
+
+    def _mapear(self, nome):
+        """Mapeia as colunas de um segmento, gravadas uma após a outra: chaves, valores e marcas."""
+        caminho = os.path.join(self.pasta, nome)
+        tamanho = os.path.getsize(caminho) // (self.tipo_chave.itemsize + self.tipo_valor.itemsize + 1)
+        colunas = []
+        deslocamento = 0
+        for tipo in (self.tipo_chave, self.tipo_valor, np.dtype("?")):
+            colunas.append(np.memmap(caminho, dtype=tipo, mode="r", offset=deslocamento, shape=tamanho))
+            deslocamento += tipo.itemsize * tamanho
+        return tuple(colunas)
+
+    def _novo_nome(self):
+        with self._trava:
+            self._proximo += 1
+            return f"segmento-{self._proximo:06d}.bin"
+
+    def _procurar(self, chave):
+        item = self._memoria.get(chave)
+        if item is not None:
+            return not item[1], item[0]
+        for _, (chaves, valores, apagados) in reversed(self._segmentos):
+            posicao = int(np.searchsorted(chaves, chave))
+            if posicao < len(chaves) and chaves[posicao] == chave:
+                return not apagados[posicao], valores[posicao].item()
+        return False, None
+
+    def _encontrar(self, chaves):
+        """Versão vetorizada de `_procurar`: retorna as máscaras de chaves encontradas e os valores."""
+        resolvidos = np.zeros(len(chaves), dtype=bool)
+        encontrados = np.zeros(len(chaves), dtype=bool)
+        valores = np.zeros(len(chaves), dtype=self.tipo_valor)
+        for fonte_chaves, fonte_valores, fonte_apagados in reversed(self._fontes()):
+            if not len(fonte_chaves):
+                continue
+            pendentes = np.flatnonzero(~resolvidos)
+            posicoes = np.minimum(np.searchsorted(fonte_chaves, chaves[pendentes]), len(fonte_chaves) - 1)
+            achados = fonte_chaves[posicoes] == chaves[pendentes]
+            indices, posicoes = pendentes[achados], posicoes[achados]
+            resolvidos[indices] = True
+            encontrados[indices] = ~fonte_apagados[posicoes]
+            valores[indices] = fonte_valores[posicoes]
+        return encontrados, valores
+
+    def _fontes(self):
+        """Colunas dos segmentos e da tabela em memória, da fonte mais antiga para a mais nova."""
+        if self._colunas_memoria is None:
+            itens = list(self._memoria.values())
+            self._colunas_memoria = (np.array(list(self._memoria.keys()), dtype=self.tipo_chave),
+                                     np.array([valor for valor, _ in itens], dtype=self.tipo_valor),
+                                     np.array([apagado for _, apagado in itens], dtype=bool))
+        return [segmento for _, segmento in self._segmentos] + [self._colunas_memoria]
+
+    def _extremo(self, maior):
+        if not self._tamanho:
+            raise KeyError("dicionário vazio")
+        # A tabela em memória é consultada direto no `SortedDict`, sem convertê-la em colunas.
+        segmentos = [segmento for _, segmento in self._segmentos]
+        memoria = self._memoria
+        limite = None
+        while True:
+            # A maior (ou menor) chave de alguma fonte, além do limite, e a sua versão mais nova.
+            candidatos = []
+            for idade, (chaves, _, _) in enumerate(segmentos):
+                if limite is None:
+                    posicao = len(chaves) - 1 if maior else 0
+                else:
+                    posicao = int(np.searchsorted(chaves, limite)) - 1 if maior else \
+                        int(np.searchsorted(chaves, limite, side="right"))
+                if 0 <= posicao < len(chaves):
+                    candidatos.append((chaves[posicao].item(), idade, posicao))
+            if limite is None:
+                posicao = len(memoria) - 1 if maior else 0
+            else:
+                posicao = memoria.bisect_left(limite) - 1 if maior else memoria.bisect_right(limite)
+            if 0 <= posicao < len(memoria):
+                candidatos.append((self.tipo_chave.type(memoria.peekitem(posicao)[0]).item(), len(segmentos), posicao))
+            chave = (max if maior else min)(candidato[0] for candidato in candidatos)
+            _, idade, posicao = max(candidato for candidato in candidatos if candidato[0] == chave)
+            if idade == len(segmentos):
+                valor, apagado = memoria.peekitem(posicao)[1]
+                valor = self.tipo_valor.type(valor).item()
+            else:
+                _, valores, apagados = segmentos[idade]
+                valor, apagado = valores[posicao].item(), apagados[posicao]
+            if not apagado:
+                return chave, valor
+            limite = chave
+
+    def _verificar_memoria(self):
+        if len(self._memoria) >= self.limite_memoria:
+            self._gravar_memoria()
+
+    def _gravar_memoria(self):
+        if not self._memoria:
+            return
+        nome = self._novo_nome()
+        with open(os.path.join(self.pasta, nome), "wb") as arquivo:
+            for coluna in self._fontes()[-1]:
+                arquivo.write(coluna.tobytes())
+        self._memoria = SortedDict()
+        self._colunas_memoria = None
+        with self._trava:
+            self._segmentos = self._segmentos + [(nome, self._mapear(nome))]
+        self._salvar_manifesto()
+        if len(self._segmentos) >= self.max_segmentos:
+            self.compactar()
+
+    def _compactar(self, segmentos):
+        nome = self._novo_nome()
+        caminho = os.path.join(self.pasta, nome)
+        # Os segmentos compactados são os mais antigos, então as marcas de remoção podem ser descartadas.
+        # As colunas são gravadas em arquivos separados e depois concatenadas, para manter a memória limitada.
+        partes = [caminho + sufixo for sufixo in (".chaves", ".valores")]
+        with open(partes[0], "wb") as chaves, open(partes[1], "wb") as valores:
+            total = 0
+            for bloco_chaves, bloco_valores, _ in _mesclar([segmento for _, segmento in segmentos]):
+                chaves.write(bloco_chaves.tobytes())
+                valores.write(bloco_valores.tobytes())
+                total += len(bloco_chaves)
+        with open(caminho, "wb") as arquivo:
+            for parte in partes:
+                with open(parte, "rb") as origem:
+                    shutil.copyfileobj(origem, arquivo)
+                os.remove(parte)
+            arquivo.write(bytes(total))
+        with self._trava:
+            novos = self._segmentos[len(segmentos):]
+            compactado = [(nome, self._mapear(nome))] if os.path.getsize(caminho) else []
+            self._segmentos = compactado + novos
+            self._compactacao = None
+        if not compactado:
+            os.remove(caminho)
+        self._salvar_manifesto()
+        # Os mapeamentos dos segmentos antigos são soltos antes de apagar os arquivos: no Windows,
+        # um arquivo mapeado não pode ser removido.
+        antigos = [antigo for antigo, _ in segmentos]
+        del segmentos[:]
+        self._remover_arquivos(antigos)
+
+    def _remover_arquivos(self, nomes):
+        """
+        Apaga segmentos que saíram do manifesto. Um segmento ainda mapeado por uma leitura
+        em andamento (por exemplo, um `itens()` não terminado) fica para a próxima tentativa,
+        na próxima compactação ou em `fechar()`.
+        """
+        with self._trava:
+            nomes, self._a_remover = self._a_remover + nomes, []
+        pendentes = []
+        for nome in nomes:
+            try:
+                os.remove(os.path.join(self.pasta, nome))
+            except FileNotFoundError:
+                pass
+            except PermissionError:
+                pendentes.append(nome)
+        with self._trava:
+            self._a_remover += pendentes
+
+    def _salvar_manifesto(self):
+        with self._trava:
+            manifesto = {"tipo_chave": self.tipo_chave.str, "tipo_valor": self.tipo_valor.str,
+                         "segmentos": [nome for nome, _ in self._segmentos], "tamanho": self._tamanho,
+                         "proximo": self._proximo}
+            temporario = os.path.join(self.pasta, MANIFESTO + ".tmp")
+            with open(temporario, "w") as arquivo:
+                json.dump(manifesto, arquivo)
+            os.replace(temporario, os.path.join(self.pasta, MANIFESTO))
+
+
+def _mesclar(fontes, minimo=None, maximo=None, manter_apagados=False, bloco=65536):
+    """
+    Mescla fontes ordenadas (da mais antiga para a mais nova), dadas como colunas
+    (chaves, valores, marcas de remoção), em blocos ordenados em que cada chave aparece
+    uma vez, com a versão da fonte mais nova.
+
+    A cada passo, o limite do bloco é a menor entre as chaves que ficam `bloco` linhas à
+    frente em cada fonte, então nenhuma fonte contribui com mais de `bloco` linhas: a
+    memória usada depende do tamanho do bloco e do número de fontes, não do tamanho delas.
+    """
+    faixas = []
+    for idade, fonte in enumerate(fontes):
+        chaves = fonte[0]
+        inicio = 0 if minimo is None else int(np.searchsorted(chaves, minimo))
+        fim = len(chaves) if maximo is None else int(np.searchsorted(chaves, maximo, side="right"))
+        if inicio < fim:
+            faixas.append([idade, fonte, inicio, fim])
+    while faixas:
+        limite = min(faixa[1][0][min(faixa[2] + bloco, faixa[3]) - 1] for faixa in faixas)
+        partes, idades = [], []
+        for faixa in faixas:
+            idade, fonte, inicio, fim = faixa
+            corte = inicio + int(np.searchsorted(fonte[0][inicio:min(inicio + bloco, fim)], limite, side="right"))
+            partes.append([np.asarray(coluna[inicio:corte]) for coluna in fonte])
+            idades.append(np.full(corte - inicio, -idade))
+            faixa[2] = corte
+        faixas = [faixa for faixa in faixas if faixa[2] < faixa[3]]
+        chaves, valores, apagados = (np.concatenate(coluna) for coluna in zip(*partes))
+        ordem = np.lexsort((np.concatenate(idades), chaves))
+        chaves, valores, apagados = chaves[ordem], valores[ordem], apagados[ordem]
+        manter = np.ones(len(chaves), dtype=bool)
+        manter[1:] = chaves[1:] != chaves[:-1]
+        if not manter_apagados:
+            manter &= ~apagados
+        if manter.any():
+            yield chaves[manter], valores[manter], apagados[manter]
+
+
+def verificar_contra_memoria(operacoes=20000, semente=0):
+    """
+    Teste de propriedade: aplica inserções e remoções aleatórias ao `DicionarioEmDisco`
+    (com uma tabela em memória pequena, para gravar e compactar segmentos com frequência)
+    e ao `DicionarioOrdenado`, comparando buscas, extremos e iteração.
+
+    Retorna:
+    int: Quantas verificações divergiram (0 se o dicionário em disco estiver correto).
+    """
+    gerador = random.Random(semente)
+    referencia = DicionarioOrdenado()
+    falhas = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        dicionario = DicionarioEmDisco(pasta, limite_memoria=64, max_segmentos=3)
+        for operacao in range(operacoes):
+            chave = float(gerador.randrange(2000))
+            if referencia.existe(chave) and gerador.random() < 0.4:
+                referencia.remover(chave)
+                dicionario.remover(chave)
+            else:
+                valor = gerador.randrange(10 ** 6)
+                referencia.inserir(chave, valor)
+                dicionario.inserir(chave, valor)
+            if dicionario.existe(chave) != referencia.existe(chave):
+                falhas += 1
+            if len(referencia) and (dicionario.menor_chave() != referencia.menor_chave()
+                                    or dicionario.maior_chave() != referencia.maior_chave()):
+                falhas += 1
+            if operacao % 1000 == 0:
+                dicionario.compactar(esperar=operacao % 2000 == 0)
+                falhas += dicionario.intervalo() != list(referencia.data.items())
+        dicionario.fechar()
+        reaberto = DicionarioEmDisco(pasta)
+        falhas += reaberto.intervalo() != list(referencia.data.items()) or len(reaberto) != len(referencia)
+    return int(falhas)
+
+
+def benchmark_disco(num_chaves=1000000, consultas=100000, semente=0):
+    """
+    Compara `DicionarioEmDisco` com o `DicionarioOrdenado` em memória: carga, buscas
+    pontuais (uma a uma e em lote) e iteração ordenada. O pico de memória alocada pelo
+    Python durante a carga é medido em uma segunda carga, com o `tracemalloc` ligado; as
+    páginas dos segmentos mapeados não entram nessa conta.
+
+    Retorna:
+    dict: Para "memoria" e "disco", os tempos (em segundos) e o pico de memória (em MB).
+    """
+    gerador = np.random.default_rng(semente)
+    chaves = gerador.permutation(num_chaves).astype(np.float64) / num_chaves
+    pares = list(zip(chaves.tolist(), range(num_chaves)))
+    amostra = gerador.choice(chaves, consultas).tolist()
+
+    def carregar(nome, pasta):
+        if nome == "memoria":
+            dicionario = DicionarioOrdenado()
+            dicionario.inserir_lote(pares)
+            return dicionario
+        dicionario = DicionarioEmDisco(pasta)
+        for inicio in range(0, num_chaves, 100000):
+            dicionario.inserir_lote(pares[inicio:inicio + 100000])
+        dicionario.fechar()
+        dicionario.compactar(esperar=True)
+        return dicionario
+
+    resultados = {}
+    for nome in ("memoria", "disco"):
+        with tempfile.TemporaryDirectory() as pasta:
+            inicio = time.perf_counter()
+            dicionario = carregar(nome, pasta)
+            carga = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            for chave in amostra:
+                dicionario.buscar(chave)
+            busca = (time.perf_counter() - inicio) / consultas
+            inicio = time.perf_counter()
+            if nome == "memoria":
+                [dicionario.buscar(chave) for chave in amostra]
+            else:
+                dicionario.buscar_lote(amostra)
+            busca_lote = (time.perf_counter() - inicio) / consultas
+
+            inicio = time.perf_counter()
+            contagem = sum(1 for _ in (dicionario.data.items() if nome == "memoria" else dicionario.itens()))
+            iteracao = time.perf_counter() - inicio
+            assert contagem == num_chaves
+            del dicionario
+
+        with tempfile.TemporaryDirectory() as pasta:
+            tracemalloc.start()
+            dicionario = carregar(nome, pasta)
+            pico = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+            del dicionario
+        resultados[nome] = {"carga": carga, "busca": busca, "busca_lote": busca_lote, "iteracao": iteracao,
+                            "pico_mb": pico}
+    return resultados
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as pasta:
+        with DicionarioEmDisco(pasta, limite_memoria=3, max_segmentos=2) as dicionario:
+            for chave, valor in [(0.9, 1), (0.5, 2), (0.7, 3), (0.3, 4), (0.8, 5)]:
+                dicionario.inserir(chave, valor)
+            dicionario.remover(0.5)
+            dicionario.compactar(esperar=True)
+            print("Itens:", dicionario.intervalo())
+            print("Menor chave:", dicionario.menor_chave(), "Maior chave:", dicionario.maior_chave())
+        with DicionarioEmDisco(pasta) as reaberto:
+            print(f"Reaberto: {len(reaberto)} itens, buscar(0.7) = {reaberto.buscar(0.7)}")
+
+    print(f"Verificações divergentes da referência em memória: {verificar_contra_memoria()}")
+    for nome, medidas in benchmark_disco().items():
+        print(f"{nome}: carga {medidas['carga']:.2f} s, busca {medidas['busca'] * 1e6:.1f} µs "
+              f"(em lote {medidas['busca_lote'] * 1e6:.2f} µs), iteração {medidas['iteracao']:.2f} s, "
+              f"pico de memória na carga {medidas['pico_mb']:.0f} MB")
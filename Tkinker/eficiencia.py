@@ -1,3 +1,6 @@
+import random
+import time
+
 from sortedcontainers import SortedDict
 
 class DicionarioOrdenado:
@@ -66,6 +69,129 @@ class DicionarioOrdenado:
         """
         del self.data[chave]
 
+    @classmethod
+    def de_ordenados(cls, pares):
+        """
+        Constrói o dicionário a partir de pares (chave, valor) já ordenados por chave.
+
+        Parâmetros:
+        pares (iterable): Pares (chave, valor) em ordem estritamente crescente de chave.
+
+        Retorna:
+        DicionarioOrdenado: O dicionário com os pares dados.
+
+        Levanta:
+        ValueError: Se as chaves não estiverem em ordem estritamente crescente.
+
+        Complexidade: O(N), pois a ordenação de uma sequência já ordenada é linear.
+        """
+        pares = list(pares)
+        for (anterior, _), (chave, _) in zip(pares, pares[1:]):
+            if not anterior < chave:
+                raise ValueError(f"chaves fora de ordem: {anterior!r} antes de {chave!r}")
+        dicionario = cls()
+        dicionario.data = SortedDict(pares)
+        return dicionario
+
+    def inserir_lote(self, pares):
+        """
+        Insere vários pares chave-valor, substituindo os valores de chaves já existentes.
+
+        Parâmetros:
+        pares (iterable): Pares (chave, valor) em qualquer ordem.
+
+        Complexidade: O(K log N) para lotes pequenos; para lotes grandes em relação ao
+        dicionário, O((N + K) log(N + K)) com uma única reconstrução do índice.
+        """
+        self.data.update(pares)
+
+    def remover_lote(self, chaves):
+        """
+        Remove vários itens de uma vez.
+
+        Parâmetros:
+        chaves (iterable): As chaves a serem removidas.
+
+        Levanta:
+        KeyError: Se alguma chave não existir; nesse caso nenhum item é removido.
+
+        Complexidade: O(K log N) para lotes pequenos; para lotes grandes em relação ao
+        dicionário, O(N) com uma única reconstrução do índice.
+        """
+        chaves = set(chaves)
+        for chave in chaves:
+            if chave not in self.data:
+                raise KeyError(chave)
+        if len(chaves) * 10 < len(self.data):
+            for chave in chaves:
+                del self.data[chave]
+        else:
+            self.data = SortedDict([(chave, valor) for chave, valor in self.data.items() if chave not in chaves])
+
+    def intervalo(self, minimo=None, maximo=None, inclusivo=(True, True)):
+        """
+        Retorna os pares com chave entre `minimo` e `maximo`, em ordem.
+
+        Parâmetros:
+        minimo: O menor valor de chave (None para não limitar).
+        maximo: O maior valor de chave (None para não limitar).
+        inclusivo (tuple): Se cada extremo faz parte do intervalo.
+
+        Retorna:
+        list: Os pares (chave, valor) do intervalo.
+
+        Complexidade: O(log N + K), sendo K o número de itens retornados.
+        """
+        return [(chave, self.data[chave]) for chave in self.data.irange(minimo, maximo, inclusivo)]
+
+    def posicao(self, chave):
+        """
+        Retorna quantas chaves do dicionário são menores que a chave fornecida.
+
+        Parâmetros:
+        chave: A chave consultada (não precisa existir no dicionário).
+
+        Retorna:
+        int: A posição em que a chave está, ou estaria, na ordem.
+
+        Complexidade: O(log N)
+        """
+        return self.data.bisect_left(chave)
+
+    def selecionar(self, k):
+        """
+        Retorna o k-ésimo par em ordem crescente de chave (a partir de 0). Índices
+        negativos contam a partir do maior: -1 é o maior item, -2 o segundo maior etc.
+
+        Parâmetros:
+        k (int): A posição do par.
+
+        Retorna:
+        tuple: O par (chave, valor) na posição k.
+
+        Complexidade: O(log N)
+        """
+        return self.data.peekitem(k)
+
+    def percentil(self, chave):
+        """
+        Retorna o percentil de uma chave: a porcentagem das chaves que são menores que ela.
+
+        Parâmetros:
+        chave: A chave consultada (não precisa existir no dicionário).
+
+        Retorna:
+        float: Um valor entre 0 e 100.
+
+        Complexidade: O(log N)
+        """
+        if not self.data:
+            raise ValueError("dicionário vazio")
+        return 100.0 * self.data.bisect_left(chave) / len(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
     def mostrar_dados(self):
         """
         Exibe todos os dados do dicionário ordenado.
@@ -123,49 +249,93 @@ class DicionarioOrdenado:
         self.data.popitem(-1)
 
 
-# Criando e manipulando o dicionário ordenado
-dicionario = DicionarioOrdenado()
+def benchmark_reindexacao(num_servidores=100000, repeticoes=3, semente=0):
+    """
+    Mede a reindexação de uma frota a cada tick: todos os servidores mudam de eficiência,
+    então as chaves antigas são removidas e as novas inseridas, item a item e em lote.
+
+    Retorna:
+    dict: Tempo médio (em segundos) de cada forma de reindexação.
+    """
+    gerador = random.Random(semente)
+
+    def chaves():
+        # Chave (eficiência, servidor), para que servidores com a mesma eficiência não colidam.
+        return [(round(gerador.uniform(0, 1), 6), servidor) for servidor in range(num_servidores)]
+
+    resultados = {"item a item": 0.0, "em lote": 0.0}
+    for _ in range(repeticoes):
+        antigas, novas = chaves(), chaves()
+        for forma in resultados:
+            dicionario = DicionarioOrdenado.de_ordenados((chave, chave[1]) for chave in sorted(antigas))
+            inicio = time.perf_counter()
+            if forma == "item a item":
+                for chave in antigas:
+                    dicionario.remover(chave)
+                for chave in novas:
+                    dicionario.inserir(chave, chave[1])
+            else:
+                dicionario.remover_lote(antigas)
+                dicionario.inserir_lote((chave, chave[1]) for chave in novas)
+            resultados[forma] += (time.perf_counter() - inicio) / repeticoes
+    return resultados
+
+
+if __name__ == "__main__":
+    # Criando e manipulando o dicionário ordenado
+    dicionario = DicionarioOrdenado()
+
+    # Inserindo elementos
+    dicionario.inserir("a", 1)
+    dicionario.inserir("b", 2)
+    dicionario.inserir("c", 3)
+
+    # Realizando buscas
+    print(dicionario.buscar("a"))  # Saída: 1
+    print(dicionario.existe("b"))  # Saída: True
 
-# Inserindo elementos
-dicionario.inserir("a", 1)
-dicionario.inserir("b", 2)
-dicionario.inserir("c", 3)
+    # Mostrando os dados em ordem
+    print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'b': 2, 'c': 3})
 
-# Realizando buscas
-print(dicionario.buscar("a"))  # Saída: 1
-print(dicionario.existe("b"))  # Saída: True
+    # Adicionando mais elementos
+    dicionario.inserir("d", 4)
+    dicionario.inserir("e", 5)
 
-# Mostrando os dados em ordem
-print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'b': 2, 'c': 3})
+    # Mostrando os dados após a adição
+    print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5})
 
-# Adicionando mais elementos
-dicionario.inserir("d", 4)
-dicionario.inserir("e", 5)
+    # Removendo um item
+    dicionario.remover("b")
 
-# Mostrando os dados após a adição
-print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5})
+    # Mostrando os dados após a remoção
+    print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'c': 3, 'd': 4, 'e': 5})
 
-# Removendo um item
-dicionario.remover("b")
+    # Iterando sobre o dicionário ordenado
+    dicionario.iterar()
+    # Saída:
+    # a: 1
+    # c: 3
+    # d: 4
+    # e: 5
 
-# Mostrando os dados após a remoção
-print(dicionario.mostrar_dados())  # Saída: SortedDict({'a': 1, 'c': 3, 'd': 4, 'e': 5})
+    # Buscando o menor e maior valor
+    print("Menor chave:", dicionario.menor_chave())  # Saída: ('a', 1)
+    print("Maior chave:", dicionario.maior_chave())  # Saída: ('e', 5)
 
-# Iterando sobre o dicionário ordenado
-dicionario.iterar()
-# Saída:
-# a: 1
-# c: 3
-# d: 4
-# e: 5
+    # Removendo o menor e maior valor
+    dicionario.remover_menor()  # Remove o menor item
+    dicionario.remover_maior()  # Remove o maior item
 
-# Buscando o menor e maior valor
-print("Menor chave:", dicionario.menor_chave())  # Saída: ('a', 1)
-print("Maior chave:", dicionario.maior_chave())  # Saída: ('e', 5)
+    # Mostrando os dados após a remoção dos itens extremos
+    print(dicionario.mostrar_dados())  # Saída: SortedDict({'c': 3, 'd': 4})
 
-# Removendo o menor e maior valor
-dicionario.remover_menor()  # Remove o menor item
-dicionario.remover_maior()  # Remove o maior item
+    # Consultas por faixa e por posição sobre um índice de servidores por eficiência
+    eficiencias = DicionarioOrdenado.de_ordenados((eficiencia / 100, servidor)
+                                                  for servidor, eficiencia in enumerate(range(50, 100)))
+    print("Eficiência entre 0.7 e 0.72:", eficiencias.intervalo(0.7, 0.72))
+    print("Servidor mais eficiente:", eficiencias.selecionar(-1))
+    print("Terceiro mais eficiente:", eficiencias.selecionar(-3))
+    print("Percentil da eficiência 0.9:", eficiencias.percentil(0.9))
 
-# Mostrando os dados após a remoção dos itens extremos
-print(dicionario.mostrar_dados())  # Saída: SortedDict({'c': 3, 'd': 4})
+    for forma, segundos in benchmark_reindexacao().items():
+        print(f"Reindexação de 100000 servidores ({forma}): {segundos * 1000:.0f} ms")
@@ -0,0 +1,339 @@
+"""
+Registro estruturado de eventos da simulação, com níveis, amostragem por tipo de evento
+e escrita em lote por uma linha de execução em segundo plano.
+
+Os módulos registram eventos no registrador global `log`, sempre protegidos pelo nível,
+para que o caminho crítico custe só uma comparação quando o registro está desligado:
+
+    if log.level <= INFO:
+        log.emit("servidor_ativado", INFO, servidor=server_id)
+
+Por padrão, os eventos de nível INFO ou acima são escritos na hora, como texto, na saída
+padrão (com as mesmas mensagens dos antigos `print`). Para cargas grandes, `configure`
+troca o destino por JSON Lines ou por um arquivo binário, com escrita em lote em segundo plano, e
+define a amostragem de cada tipo de evento; `disabled()` desliga o registro em um trecho.
+"""
+import atexit
+import contextlib
+import json
+import os
+import pickle
+import queue
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+DEBUG, INFO, WARNING, ERROR, OFF = 10, 20, 30, 40, 100
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+FRAME = struct.Struct("<I")
+
+# Mensagem legível de cada tipo de evento, usada por `TextSink`.
+MESSAGES = {}
+
+
+def register(event, message):
+    """Registra a mensagem legível de um tipo de evento, formatada com os campos do evento."""
+    MESSAGES[event] = message
+
+
+class TextSink:
+    """
+    Escreve cada evento como uma linha de texto legível, com a mensagem registrada para o
+    seu tipo (ou o nome do evento seguido dos campos). Sem `stream`, usa o `sys.stdout` do
+    momento da escrita, então continua respeitando `contextlib.redirect_stdout`.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def write(self, records):
+        lines = []
+        for _, _, event, fields in records:
+            message = MESSAGES.get(event)
+            if message is None:
+                lines.append(" ".join([event] + [f"{name}={value}" for name, value in fields.items()]))
+            else:
+                lines.append(message.format(**fields))
+        (self.stream or sys.stdout).write("\n".join(lines) + "\n")
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Escreve cada evento como um objeto JSON por linha: instante, nível, evento e campos."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=_to_json)
+
+    def write(self, records):
+        encode = self._encoder.encode
+        self._file.write("".join(encode({"t": at, "nivel": LEVEL_NAMES.get(level, level), "evento": event, **fields})
+                                 + "\n" for at, level, event, fields in records))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class BinarySink:
+    """
+    Escreve cada lote de eventos como um quadro binário: o tamanho (4 bytes) seguido da
+    lista de registros (instante, nível, evento, campos) serializada com `pickle`. É mais
+    compacto e muito mais barato de gravar que JSON; `read_binary` lê os eventos de volta.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "ab")
+
+    def write(self, records):
+        frame = pickle.dumps(list(records), protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(FRAME.pack(len(frame)) + frame)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_binary(path):
+    """Gera os registros (instante, nível, evento, campos) gravados por `BinarySink`, em ordem."""
+    with open(path, "rb") as file:
+        while True:
+            header = file.read(FRAME.size)
+            if len(header) < FRAME.size:
+                return
+            yield from pickle.loads(file.read(FRAME.unpack(header)[0]))
+
+
+def _to_json(value):
+    # Escalares do NumPy e outros objetos que o json não conhece.
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+class EventLogger:
+    """
+    Registrador de eventos estruturados.
+
+    Os eventos abaixo de `level` são descartados. Um tipo de evento pode ter uma taxa de
+    amostragem: com taxa 0.01, um em cada cem eventos daquele tipo é mantido (de forma
+    determinística, por um acumulador, sem sorteio). Os eventos mantidos vão para um
+    buffer; com `background=True`, cada lote de `batch_size` eventos (ou o buffer de mais
+    de `flush_interval` segundos) é entregue a uma linha de execução que o escreve no
+    destino, e com `background=False` cada evento é escrito na hora.
+
+    Atributos:
+        level (int): Nível mínimo dos eventos registrados (OFF desliga o registro).
+        sink: Destino dos eventos (`TextSink`, `JsonLinesSink`, `BinarySink` ou qualquer objeto com `write(records)`).
+        emitted (int): Eventos mantidos.
+        sampled_out (int): Eventos descartados pela amostragem.
+
+    Métodos:
+        emit(event, level, **fields): Registra um evento.
+        sample(event, rate): Define a taxa de amostragem de um tipo de evento (None remove).
+        configure(...): Altera nível, destino, amostragem e modo de escrita.
+        flush(): Escreve tudo o que está no buffer e espera a escrita terminar.
+        close(): Esvazia o buffer, encerra a escrita em segundo plano e fecha o destino.
+    """
+
+    def __init__(self, level=INFO, sink=None, background=False, batch_size=4096, flush_interval=0.5):
+        self.level = OFF
+        self.sink = None
+        self.background = False
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.emitted = 0
+        self.sampled_out = 0
+        self._rates = {}
+        self._credits = {}
+        self._buffer = []
+        self._last_handoff = time.time()
+        self._lock = threading.Lock()
+        self._queue = None
+        self._writer = None
+        self.configure(level=level, sink=sink or TextSink(), background=background)
+
+    def configure(self, level=None, sink=None, background=None, batch_size=None, flush_interval=None, sample=None):
+        """
+        Altera a configuração; os parâmetros omitidos ficam como estão. Um novo destino
+        substitui o anterior, que é fechado depois que o buffer é escrito nele.
+
+        Args:
+            level (int): Nível mínimo.
+            sink: Novo destino.
+            background (bool): Se a escrita é feita em lote, em segundo plano.
+            batch_size (int): Eventos por lote.
+            flush_interval (float): Idade máxima do buffer, em segundos, antes da entrega do lote.
+            sample (dict): Taxas de amostragem por tipo de evento.
+        """
+        self.flush()
+        if sink is not None and sink is not self.sink:
+            self._stop_writer()
+            if self.sink is not None:
+                self.sink.close()
+            self.sink = sink
+        if background is not None:
+            self.background = background
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if flush_interval is not None:
+            self.flush_interval = flush_interval
+        for event, rate in (sample or {}).items():
+            self.sample(event, rate)
+        if not self.background:
+            self._stop_writer()
+        if level is not None:
+            self.level = level
+
+    def sample(self, event, rate):
+        with self._lock:
+            if rate is None:
+                self._rates.pop(event, None)
+                self._credits.pop(event, None)
+            else:
+                self._rates[event] = float(rate)
+                self._credits[event] = 0.0
+
+    def emit(self, event, level, **fields):
+        if level < self.level:
+            return
+        at = time.time()
+        # A amostragem, os contadores e o buffer são compartilhados entre as linhas de execução.
+        with self._lock:
+            rate = self._rates.get(event)
+            if rate is not None:
+                credit = self._credits[event] + rate
+                if credit < 1.0:
+                    self._credits[event] = credit
+                    self.sampled_out += 1
+                    return
+                self._credits[event] = credit - 1.0
+            self.emitted += 1
+            if self.background:
+                self._buffer.append((at, level, event, fields))
+                if len(self._buffer) < self.batch_size and at - self._last_handoff < self.flush_interval:
+                    return
+                batch, self._buffer = self._buffer, []
+                self._last_handoff = at
+                self._hand_off(batch)
+                return
+        self.sink.write(((at, level, event, fields),))
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            if batch:
+                self._hand_off(batch)
+            batches = self._queue
+        if batches is not None:
+            batches.join()
+
+    def close(self):
+        self.flush()
+        self._stop_writer()
+        self.sink.close()
+
+    def _hand_off(self, batch):
+        # Chamado com `_lock`: uma única linha de execução cria o escritor, e os lotes entram na fila em ordem.
+        if not self.background:
+            self.sink.write(batch)
+            return
+        if self._writer is None:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_batches, args=(self._queue, self.sink), daemon=True)
+            self._writer.start()
+        self._queue.put(batch)
+
+    @staticmethod
+    def _write_batches(batches, sink):
+        while True:
+            batch = batches.get()
+            try:
+                if batch is None:
+                    return
+                sink.write(batch)
+            finally:
+                batches.task_done()
+
+    def _stop_writer(self):
+        with self._lock:
+            writer, batches = self._writer, self._queue
+            self._queue = self._writer = None
+        if writer is not None:
+            batches.put(None)
+            writer.join()
+
+
+log = EventLogger()
+atexit.register(log.flush)
+
+
+def configure(**options):
+    """Configura o registrador global `log` (ver `EventLogger.configure`)."""
+    log.configure(**options)
+
+
+@contextlib.contextmanager
+def disabled():
+    """Desliga o registro global dentro do bloco `with`, restaurando o nível anterior no fim."""
+    previous = log.level
+    log.level = OFF
+    try:
+        yield log
+    finally:
+        log.level = previous
+
+
+def benchmark_logging(num_tasks=100000):
+    """
+    Mede a ativação e a desativação de `num_tasks` servidores de um `priorizacao.DataCenter`
+    com o registro escrito como texto a cada evento (o comportamento dos antigos `print`,
+    aqui em `os.devnull`, sem o custo de um terminal), em JSON Lines e em binário, em lote
+    e em segundo plano, com amostragem de 1% e desligado. No fim, o registro global volta a ser texto na saída padrão.
+
+    Returns:
+        dict: Tempo (s) e eventos registrados de cada modo.
+    """
+    from .priorizacao import DataCenter
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder, open(os.devnull, "w") as null:
+        modes = {
+            "texto a cada evento": dict(level=INFO, sink=TextSink(null), background=False),
+            "JSON Lines em lote": dict(level=INFO, sink=JsonLinesSink(os.path.join(folder, "a.jsonl")),
+                                       background=True),
+            "binário em lote": dict(level=INFO, sink=BinarySink(os.path.join(folder, "b.bin")), background=True),
+            "amostragem de 1%": dict(level=INFO, sink=JsonLinesSink(os.path.join(folder, "c.jsonl")),
+                                     background=True, sample={event: 0.01 for event in MESSAGES}),
+            "desligado": dict(level=OFF),
+        }
+        for name, options in modes.items():
+            log.configure(**options)
+            emitted = log.emitted
+            # Metade da frota cabe na energia renovável, a outra metade usa energia mista.
+            data_center = DataCenter(renewable_capacity_kW=num_tasks * 25, regular_capacity_kW=num_tasks * 50,
+                                     server_energy_consumption_kW=50, num_servers=num_tasks)
+            start = time.perf_counter()
+            for server_id in range(num_tasks):
+                data_center.assign_task(server_id)
+            for server_id in range(num_tasks):
+                data_center.deactivate_server(server_id)
+            log.flush()
+            results[name] = {"segundos": time.perf_counter() - start, "eventos": log.emitted - emitted}
+            for event in MESSAGES:
+                log.sample(event, None)
+        log.configure(level=INFO, sink=TextSink(), background=False)
+    return results
+
+
+if __name__ == "__main__":
+    # Executado como script, este módulo é `__main__`; os demais módulos usam o registrador de `eventos`.
+    from . import eventos
+
+    for name, result in eventos.benchmark_logging().items():
+        print(f"100000 tarefas, {name}: {result['segundos']:.2f} s ({result['eventos']} eventos registrados)")
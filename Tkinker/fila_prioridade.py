@@ -0,0 +1,209 @@
+import gc
+import heapq
+import random
+import time
+
+
+class IndexedMinHeap:
+    """
+    Heap mínimo indexado: além de inserir e consultar o menor item, permite
+    atualizar a chave de um item já presente (aumentar ou diminuir) em O(log N).
+
+    A chave de cada item é calculada pela função `key` no momento da inserção
+    ou da atualização. Sempre que um campo usado na chave mudar, quem mudou deve
+    chamar `update(item)` para reposicioná-lo.
+
+    Atributos:
+        key (callable): Função que calcula a chave de prioridade de um item.
+
+    Métodos:
+        push(item): Insere um item. O(log N)
+        peek(): Retorna o item de menor chave, sem removê-lo. O(1)
+        pop(): Remove e retorna o item de menor chave. O(log N)
+        update(item): Recalcula a chave do item e o reposiciona. O(log N)
+        remove(item): Remove um item qualquer. O(log N)
+        replace_sorted(items, keys): Substitui todo o conteúdo por itens já ordenados pela chave. O(N)
+        smallest(): Percorre os itens em ordem crescente de chave, sem alterar o heap. O(k log k) para os k primeiros
+    """
+
+    def __init__(self, items=(), key=lambda item: item):
+        self.key = key
+        self._items = list(items)
+        self._keys = [key(item) for item in self._items]
+        self._positions = {item: i for i, item in enumerate(self._items)}
+        for i in reversed(range(len(self._items) // 2)):
+            self._sift_down(i)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __iter__(self):
+        """Itera sobre os itens em ordem arbitrária (a ordem interna do heap)."""
+        return iter(self._items)
+
+    def push(self, item):
+        self._items.append(item)
+        self._keys.append(self.key(item))
+        self._positions[item] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def peek(self):
+        return self._items[0]
+
+    def pop(self):
+        item = self._items[0]
+        self.remove(item)
+        return item
+
+    def update(self, item):
+        i = self._positions[item]
+        old_key = self._keys[i]
+        self._keys[i] = self.key(item)
+        if self._keys[i] < old_key:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def remove(self, item):
+        i = self._positions.pop(item)
+        last_item = self._items.pop()
+        last_key = self._keys.pop()
+        if i == len(self._items):
+            return
+        old_key = self._keys[i]
+        self._items[i] = last_item
+        self._keys[i] = last_key
+        self._positions[last_item] = i
+        if last_key < old_key:
+            self._sift_up(i)
+        else:
+            self._sift_down(i)
+
+    def replace_sorted(self, items, keys):
+        """
+        Substitui todo o conteúdo do heap por `items`, já em ordem crescente das `keys`
+        (que devem ser as chaves dadas por `key`). Uma sequência ordenada já é um heap
+        válido, então nada é reposicionado: serve para reindexar todos os itens de uma
+        vez depois de uma ordenação vetorizada, em vez de chamar `update` item a item.
+
+        O coletor de lixo fica pausado durante a reconstrução: as chaves novas são centenas
+        de milhares de tuplas criadas de uma vez, e cada coleta disparada no meio delas
+        percorreria todos os itens do heap.
+        """
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._items = list(items)
+            self._keys = list(keys)
+            self._positions = dict(zip(self._items, range(len(self._items))))
+        finally:
+            if enabled:
+                gc.enable()
+
+    def smallest(self):
+        """
+        Gera os itens em ordem crescente de chave sem modificar o heap.
+
+        Usa um heap auxiliar de candidatos (os filhos dos nós já visitados),
+        então consumir os k primeiros itens custa O(k log k), independente de N.
+        """
+        if not self._items:
+            return
+        frontier = [(self._keys[0], 0)]
+        while frontier:
+            _, i = heapq.heappop(frontier)
+            yield self._items[i]
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self._items):
+                    heapq.heappush(frontier, (self._keys[child], child))
+
+    def _sift_up(self, i):
+        keys, items, positions = self._keys, self._items, self._positions
+        key, item = keys[i], items[i]
+        while i > 0:
+            parent = (i - 1) // 2
+            if not key < keys[parent]:
+                break
+            keys[i], items[i] = keys[parent], items[parent]
+            positions[items[i]] = i
+            i = parent
+        keys[i], items[i] = key, item
+        positions[item] = i
+
+    def _sift_down(self, i):
+        keys, items, positions = self._keys, self._items, self._positions
+        size = len(items)
+        key, item = keys[i], items[i]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and keys[child + 1] < keys[child]:
+                child += 1
+            if not keys[child] < key:
+                break
+            keys[i], items[i] = keys[child], items[child]
+            positions[items[i]] = i
+            i = child
+        keys[i], items[i] = key, item
+        positions[item] = i
+
+
+def check_against_argmin(num_tasks=100000, num_servers=10, seed=0):
+    """
+    Confere a escolha de servidor de `carga.DataCenter.add_task` contra um argmin
+    por força bruta sobre todos os servidores, antes de cada tarefa.
+
+    Args:
+        num_tasks (int): Número de tarefas alocadas.
+        num_servers (int): Número de servidores do data center.
+        seed (int): Semente do gerador de cargas.
+
+    Returns:
+        int: Quantas escolhas divergiram do argmin (0 se o índice estiver correto).
+    """
+    from .carga import DataCenter
+    from .eventos import disabled
+
+    rng = random.Random(seed)
+    data_center = DataCenter(num_servers=num_servers)
+    key = data_center.queue.key
+    mismatches = 0
+    with disabled():
+        for _ in range(num_tasks):
+            expected = min(key(server) for server in data_center.servers)
+            if key(data_center.coolest_server()) != expected:
+                mismatches += 1
+            data_center.add_task(rng.randint(5, 50))
+    return mismatches
+
+
+def benchmark_queue(num_servers, num_updates=100000, seed=0):
+    """
+    Mede o custo de escolher o servidor mais frio e reposicioná-lo após
+    receber carga, que é o trabalho do índice em cada `add_task`.
+
+    Returns:
+        float: Tempo médio por operação, em microssegundos.
+    """
+    from .carga import Server
+
+    rng = random.Random(seed)
+    servers = [Server(i) for i in range(num_servers)]
+    queue = IndexedMinHeap(servers, key=lambda s: (s.temperature, s.current_load, s.server_id))
+    start = time.perf_counter()
+    for _ in range(num_updates):
+        server = queue.peek()
+        server.add_task(rng.randint(5, 50))
+        queue.update(server)
+    return (time.perf_counter() - start) / num_updates * 1e6
+
+
+if __name__ == "__main__":
+    mismatches = check_against_argmin()
+    print(f"Escolhas divergentes do argmin em 100000 tarefas: {mismatches}")
+    for num_servers in [1000, 10000, 100000, 1000000]:
+        print(f"{num_servers} servidores: {benchmark_queue(num_servers):.2f} µs por tarefa")
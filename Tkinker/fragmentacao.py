@@ -0,0 +1,356 @@
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .alocacao import allocate_candidates
+from .frota import FleetDataCenter
+from .registro_energia import EnergyLedger
+
+# Vetores da frota na memória compartilhada, na ordem do bloco (os de 8 bytes primeiro, para o alinhamento).
+_FIELDS = (
+    ("energy_consumption", np.float64),
+    ("renewable_used", np.float64),
+    ("regular_used", np.float64),
+    ("loads", np.int64),
+    ("is_active", np.bool_),
+)
+
+
+def _block_size(num_servers):
+    return sum(np.dtype(dtype).itemsize for _, dtype in _FIELDS) * num_servers
+
+
+def _views(buffer, num_servers):
+    """Cria, sem cópia, os vetores da frota sobre um bloco de memória compartilhada."""
+    arrays = {}
+    offset = 0
+    for field, dtype in _FIELDS:
+        arrays[field] = np.ndarray(num_servers, dtype=dtype, buffer=buffer, offset=offset)
+        offset += np.dtype(dtype).itemsize * num_servers
+    return arrays
+
+
+def _shard_summary(demands, num_servers):
+    """
+    Resume as demandas dos candidatos de uma fatia para o coordenador encadear as fatias.
+
+    Returns:
+        tuple: Número de candidatos, soma das demandas e três limites para a energia
+        renovável de entrada: a partir do primeiro, todas as demandas cabem na cota
+        renovável; entre o segundo (inclusive) e o terceiro, nenhuma cabe e todas são aceitas.
+    """
+    count = demands.size
+    if not count:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    before = np.cumsum(demands) - demands
+    linear_bound = float((demands * num_servers + before).max())
+    keep = 1.0 - 1.0 / num_servers
+    if keep == 0.0:
+        return count, float(demands.sum()), linear_bound, np.inf, -np.inf
+    # 1/keep**k: a k-ésima demanda da fatia encontra o total de entrada multiplicado por keep**k.
+    with np.errstate(over="ignore"):
+        growth = np.exp(-np.arange(count) * np.log(keep))
+    return (count, float(demands.sum()), linear_bound, float((demands * growth).max()),
+            float((demands * num_servers * growth).min()))
+
+
+def _shard_worker(memory_name, num_servers, start, stop, max_load, connection):
+    """
+    Laço de um processo trabalhador. Cada tick tem duas mensagens do coordenador:
+    "plan" escolhe os candidatos à ativação da fatia [start, stop) e responde com o
+    resumo das suas demandas; "tick" recebe a energia restante na entrada da fatia,
+    aloca a energia dos candidatos, ativa os aceitos, desativa os que ficaram sem tarefa
+    e atualiza as cargas, direto na memória compartilhada, e responde com a energia
+    liberada e os totais da fatia.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    arrays = {field: array[start:stop] for field, array in _views(memory.buf, num_servers).items()}
+    is_active, loads, consumption = arrays["is_active"], arrays["loads"], arrays["energy_consumption"]
+    ledger = EnergyLedger(stop - start, arrays["renewable_used"], arrays["regular_used"])
+    local_tasks, candidates = 0, None
+    try:
+        while True:
+            message = connection.recv()
+            if message[0] == "plan":
+                local_tasks = message[1]
+                candidates = np.flatnonzero(~is_active[:local_tasks])
+                connection.send(_shard_summary(consumption[candidates], num_servers))
+                continue
+            if message[0] != "tick":
+                break
+            _, renewable_capacity, regular_capacity = message
+            accepted, renewable, regular, _, _ = allocate_candidates(renewable_capacity, regular_capacity,
+                                                                     num_servers, consumption[candidates])
+            server_ids = candidates[accepted]
+            # Os vetores podem ter sido alterados pelo coordenador fora dos ticks.
+            ledger.resync()
+            ledger.record_batch(server_ids, renewable, regular)
+            is_active[server_ids] = True
+            released = local_tasks + np.flatnonzero(is_active[local_tasks:])
+            renewable_released, regular_released = ledger.release_batch(released)
+            is_active[released] = False
+            np.minimum(loads[:local_tasks] + 1, max_load, out=loads[:local_tasks])
+            np.maximum(loads[local_tasks:] - 1, 0, out=loads[local_tasks:])
+            connection.send((renewable_released, regular_released, int(np.count_nonzero(is_active)))
+                            + ledger.totals())
+    finally:
+        # As visões precisam ser liberadas antes de fechar o bloco.
+        del arrays, is_active, loads, consumption, ledger, candidates
+        memory.close()
+        connection.close()
+
+
+class ShardedDataCenter(FleetDataCenter):
+    """
+    Variante de `FleetDataCenter` cujos ticks rodam em vários processos.
+
+    Os vetores da frota ficam em um bloco de `multiprocessing.shared_memory` e cada
+    processo trabalhador executa o tick de uma fatia contígua de servidores, sem copiar
+    dados, inclusive a alocação de energia, que segue a mesma regra de
+    `FleetDataCenter.simulate_tick` aplicada à frota inteira, em ordem de servidor.
+
+    A alocação é sequencial (cada servidor recebe uma cota do que sobrou para ele), então
+    cada fatia precisa da energia restante na sua entrada. Os trabalhadores resumem as
+    demandas dos seus candidatos (soma e limites de regime, veja `_shard_summary`) e o
+    coordenador (este objeto) encadeia as fatias: se todas as demandas de uma fatia cabem
+    na cota renovável, o total cai pela soma delas; se nenhuma cabe, cada uma leva 1/N
+    do total, que decai geometricamente, e o resto vem da energia comum. Só a fatia em que
+    o regime muda (ou em que há recusas) é alocada também pelo coordenador. Depois, cada
+    trabalhador aloca, ativa e desativa os seus servidores e atualiza as cargas em
+    paralelo; no fim, o coordenador devolve à fonte a energia liberada e soma os totais de
+    `get_status` e `energy_used`. O resultado é o de um único processo, a menos de
+    arredondamento (veja `check_equivalence`).
+
+    Fora dos ticks, os trabalhadores ficam parados, e os métodos herdados
+    (`assign_task`, `deactivate_server` etc.) atuam diretamente na memória compartilhada.
+
+    Atributos:
+        num_workers (int): Número de processos trabalhadores.
+        shards (list): Intervalos [início, fim) de servidores de cada trabalhador.
+
+    Métodos:
+        simulate_tick(new_tasks): Executa um tick em paralelo nos trabalhadores.
+        close(): Encerra os trabalhadores e libera a memória compartilhada.
+    """
+
+    def __init__(self, renewable_capacity_kW, regular_capacity_kW, server_energy_consumption_kW, num_servers,
+                 num_workers=None, max_load=200000, context=None):
+        super().__init__(renewable_capacity_kW, regular_capacity_kW, server_energy_consumption_kW, num_servers,
+                         max_load=max_load)
+        self.num_workers = max(1, min(num_workers or os.cpu_count() or 1, num_servers))
+        self._memory = shared_memory.SharedMemory(create=True, size=_block_size(num_servers))
+        for field, array in _views(self._memory.buf, num_servers).items():
+            array[:] = getattr(self, field)
+            setattr(self, field, array)
+        self._bind_ledger()
+
+        bounds = np.linspace(0, num_servers, self.num_workers + 1).astype(int)
+        self.shards = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        self._totals = None
+        self._connections = []
+        self._workers = []
+        context = context or multiprocessing.get_context()
+        for start, stop in self.shards:
+            parent, child = context.Pipe()
+            worker = context.Process(target=_shard_worker, daemon=True,
+                                     args=(self._memory.name, num_servers, start, stop, max_load, child))
+            worker.start()
+            child.close()
+            self._connections.append(parent)
+            self._workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def assign_tasks(self, server_ids):
+        self._sync_ledger()
+        super().assign_tasks(server_ids)
+
+    def deactivate_servers(self, server_ids):
+        self._sync_ledger()
+        super().deactivate_servers(server_ids)
+
+    def _sync_ledger(self):
+        # Os trabalhadores alteram os vetores de energia por fora do livro-razão do coordenador.
+        if self._totals is not None:
+            self.energy_source.ledger.resync()
+            self._totals = None
+
+    def simulate_tick(self, new_tasks):
+        """
+        Executa um tick do Dashboard em paralelo, com o mesmo efeito de
+        `FleetDataCenter.simulate_tick`.
+
+        Args:
+            new_tasks (int): Número de servidores que devem estar com tarefa neste tick.
+        """
+        new_tasks = max(0, min(int(new_tasks), self.num_servers))
+        tasks = [min(max(new_tasks - start, 0), stop - start) for start, stop in self.shards]
+        for connection, local_tasks in zip(self._connections, tasks):
+            connection.send(("plan", local_tasks))
+        summaries = [connection.recv() for connection in self._connections]
+
+        source = self.energy_source
+        # As entradas são todas calculadas antes de liberar os trabalhadores, que alteram `is_active`.
+        entries = [(source.total_renewable_capacity, source.regular_capacity)]
+        for (start, _), local_tasks, summary in zip(self.shards, tasks, summaries):
+            entries.append(self._shard_exit(start, local_tasks, summary, *entries[-1]))
+        for connection, (renewable, regular) in zip(self._connections, entries):
+            connection.send(("tick", renewable, regular))
+        renewable, regular = entries[-1]
+        results = [connection.recv() for connection in self._connections]
+
+        source.total_renewable_capacity, source.regular_capacity = renewable, regular
+        source._give_back(sum(result[0] for result in results), sum(result[1] for result in results))
+        self._totals = (sum(result[2] for result in results),
+                        sum(result[3] for result in results),
+                        sum(result[4] for result in results))
+
+    def _shard_exit(self, start, local_tasks, summary, renewable, regular):
+        """Energia renovável e comum restante depois da alocação de uma fatia, dada a de entrada."""
+        count, total, linear_bound, decay_low, decay_high = summary
+        if not count:
+            return renewable, regular
+        if renewable >= linear_bound:
+            return renewable - total, regular
+        if decay_low <= renewable < decay_high:
+            remaining = renewable * (1.0 - 1.0 / self.num_servers) ** count
+            return remaining, max(regular - (total - (renewable - remaining)), 0.0)
+        # O regime muda dentro da fatia, ou há recusas: a alocação da fatia é refeita aqui.
+        candidates = start + np.flatnonzero(~self.is_active[start:start + local_tasks])
+        _, _, _, renewable, regular = allocate_candidates(renewable, regular, self.num_servers,
+                                                          self.energy_consumption[candidates])
+        return renewable, regular
+
+    def energy_used(self):
+        if self._totals is None:
+            return super().energy_used()
+        return self._totals[1], self._totals[2]
+
+    def get_status(self):
+        if self._totals is None:
+            return super().get_status()
+        active = self._totals[0]
+        return (active, self.num_servers - active,
+                self.energy_source.renewable_status(), self.energy_source.regular_status())
+
+    def close(self):
+        if self._memory is None:
+            return
+        for connection in self._connections:
+            try:
+                connection.send(("stop",))
+            except OSError:
+                pass
+        for worker in self._workers:
+            worker.join()
+        for connection in self._connections:
+            connection.close()
+        # Copia o estado final para fora do bloco, que pode então ser liberado.
+        for field, _ in _FIELDS:
+            setattr(self, field, np.array(getattr(self, field)))
+        self._bind_ledger()
+        self._memory.close()
+        self._memory.unlink()
+        self._memory = None
+
+
+def check_equivalence(num_servers=100000, num_workers=4, num_ticks=10, seed=0):
+    """
+    Compara, tick a tick, `ShardedDataCenter` com `FleetDataCenter` em frotas idênticas,
+    com capacidades que cobrem e que não cobrem toda a demanda.
+
+    Returns:
+        float: Maior diferença encontrada na energia em uso ou restante (kW); os
+        servidores ativos e as cargas precisam coincidir exatamente.
+    """
+    scenarios = [(num_servers * 10, 0), (num_servers * 3, num_servers * 2), (num_servers, num_servers // 2)]
+    worst = 0.0
+    for renewable, regular in scenarios:
+        rng = np.random.default_rng(seed)
+        arguments = dict(renewable_capacity_kW=renewable, regular_capacity_kW=regular,
+                         server_energy_consumption_kW=5, num_servers=num_servers)
+        reference = FleetDataCenter(**arguments)
+        with ShardedDataCenter(num_workers=num_workers, **arguments) as data_center:
+            for _ in range(num_ticks):
+                new_tasks = int(rng.integers(0, num_servers + 1))
+                reference.simulate_tick(new_tasks)
+                data_center.simulate_tick(new_tasks)
+                if not (np.array_equal(reference.is_active, data_center.is_active)
+                        and np.array_equal(reference.loads, data_center.loads)
+                        and reference.get_status()[:2] == data_center.get_status()[:2]):
+                    raise AssertionError(f"frotas divergiram com {new_tasks} tarefas")
+                values = reference.get_status()[2:] + reference.energy_used()
+                sharded = data_center.get_status()[2:] + data_center.energy_used()
+                worst = max(worst, max(abs(a - b) for a, b in zip(values, sharded)))
+    return worst
+
+
+def benchmark_scaling(num_servers=1000000, workers=(1, 2, 4), num_ticks=20, seed=0):
+    """
+    Mede a vazão de ticks da frota em um único processo e em modo fragmentado com
+    diferentes números de trabalhadores.
+
+    Como em `frota.benchmark_tick`, a energia é reabastecida e o número de tarefas
+    oscila a cada tick. O ganho só aparece com pelo menos tantos núcleos quanto
+    trabalhadores. A fração serial é o tempo do encadeamento das fatias no coordenador
+    (`_shard_exit`) dividido pelo tempo do tick em um único processo: ela limita o ganho
+    possível com qualquer número de núcleos.
+
+    Returns:
+        dict: Ticks por segundo e fração serial de cada configuração ("1 processo" e
+        "N trabalhadores").
+    """
+    def run(data_center):
+        rng = np.random.default_rng(seed)
+        elapsed = 0.0
+        for _ in range(num_ticks):
+            data_center.energy_source.total_renewable_capacity = num_servers * 3
+            data_center.energy_source.regular_capacity = num_servers * 2
+            new_tasks = int(rng.integers(num_servers // 4, num_servers))
+            start = time.perf_counter()
+            data_center.simulate_tick(new_tasks)
+            elapsed += time.perf_counter() - start
+        return elapsed
+
+    arguments = dict(renewable_capacity_kW=num_servers * 3, regular_capacity_kW=num_servers * 2,
+                     server_energy_consumption_kW=5, num_servers=num_servers)
+    single = run(FleetDataCenter(**arguments))
+    results = {"1 processo": (num_ticks / single, 1.0)}
+    for num_workers in workers:
+        with ShardedDataCenter(num_workers=num_workers, **arguments) as data_center:
+            serial = [0.0]
+            shard_exit = data_center._shard_exit
+
+            def timed_exit(*args):
+                start = time.perf_counter()
+                try:
+                    return shard_exit(*args)
+                finally:
+                    serial[0] += time.perf_counter() - start
+
+            data_center._shard_exit = timed_exit
+            results[f"{num_workers} trabalhadores"] = (num_ticks / run(data_center), serial[0] / single)
+    return results
+
+
+if __name__ == "__main__":
+    with ShardedDataCenter(renewable_capacity_kW=300000, regular_capacity_kW=200000,
+                           server_energy_consumption_kW=5, num_servers=100000, num_workers=4) as data_center:
+        for new_tasks in [50000, 80000, 30000]:
+            data_center.simulate_tick(new_tasks)
+            active, idle, renewable, regular = data_center.get_status()
+            consistent = active == np.count_nonzero(data_center.is_active)
+            print(f"{new_tasks} tarefas: {active} ativos, {idle} ociosos, {renewable:.0f} kW renováveis, "
+                  f"{regular:.0f} kW comuns (totais consistentes com a memória compartilhada: {consistent})")
+
+    print(f"Maior diferença em relação a FleetDataCenter: {check_equivalence():.2e} kW")
+    print(f"Núcleos disponíveis: {os.cpu_count()}")
+    for name, (ticks_per_second, serial) in benchmark_scaling().items():
+        print(f"1000000 servidores, {name}: {ticks_per_second:.1f} ticks/s (fração serial {serial:.2%})")
@@ -0,0 +1,200 @@
+import time
+
+import numpy as np
+
+from .alocacao import allocate_candidates
+from .main import DataCenter, EnergySource
+from .registro_energia import EnergyLedger
+
+
+class FleetDataCenter:
+    """
+    Variante vetorizada do DataCenter, para frotas com milhares a milhões de servidores.
+
+    Em vez de uma lista de objetos Server, o estado da frota fica em vetores NumPy
+    e um tick inteiro (ativação, desativação e alocação de energia) é resolvido
+    com operações em lote. A interface pública acompanha a de `main.DataCenter`.
+
+    Atributos:
+        energy_source (EnergySource): A fonte de energia compartilhada pela frota.
+        num_servers (int): O número de servidores.
+        max_load (int): A carga máxima de cada servidor.
+        is_active (np.ndarray): Estado de cada servidor (ativo ou não).
+        energy_consumption (np.ndarray): Consumo de energia de cada servidor (em kW).
+        renewable_used (np.ndarray): Energia renovável usada por servidor (em kW).
+        regular_used (np.ndarray): Energia comum usada por servidor (em kW).
+        loads (np.ndarray): Carga atual de cada servidor.
+
+    Métodos:
+        assign_task(server_id):
+            Atribui uma tarefa a um servidor, como em `main.DataCenter`.
+
+        assign_tasks(server_ids):
+            Atribui tarefas a vários servidores, na ordem dada, em uma única alocação em lote.
+
+        deactivate_server(server_id) / deactivate_servers(server_ids):
+            Desativa um ou vários servidores, devolvendo à fonte a energia que usavam.
+
+        simulate_tick(new_tasks):
+            Executa um tick do Dashboard: os `new_tasks` primeiros servidores recebem tarefas
+            e os demais são desativados.
+
+        energy_used():
+            Retorna o total de energia renovável e comum em uso pela frota (O(1), pelo livro-razão da fonte).
+
+        get_status():
+            Retorna servidores ativos e ociosos e a energia renovável e comum restante.
+    """
+
+    def __init__(self, renewable_capacity_kW, regular_capacity_kW, server_energy_consumption_kW, num_servers,
+                 max_load=200000):
+        self.energy_source = EnergySource(renewable_capacity_kW, regular_capacity_kW, num_servers)
+        self.num_servers = num_servers
+        self.max_load = max_load
+        self.is_active = np.zeros(num_servers, dtype=bool)
+        self.energy_consumption = np.full(num_servers, server_energy_consumption_kW, dtype=np.float64)
+        self.renewable_used = np.zeros(num_servers)
+        self.regular_used = np.zeros(num_servers)
+        self.loads = np.zeros(num_servers, dtype=np.int64)
+        self._bind_ledger()
+
+    def assign_task(self, server_id):
+        self.assign_tasks([server_id])
+
+    def assign_tasks(self, server_ids):
+        server_ids = np.asarray(server_ids, dtype=np.int64)
+        # Servidores repetidos ou já ativos não recebem nova alocação.
+        _, first = np.unique(server_ids, return_index=True)
+        server_ids = server_ids[np.sort(first)]
+        server_ids = server_ids[~self.is_active[server_ids]]
+        if server_ids.size:
+            self._activate(server_ids)
+
+    def deactivate_server(self, server_id):
+        self.deactivate_servers([server_id])
+
+    def deactivate_servers(self, server_ids):
+        server_ids = np.unique(np.asarray(server_ids, dtype=np.int64))
+        self._deactivate(server_ids[self.is_active[server_ids]])
+
+    def simulate_tick(self, new_tasks):
+        """
+        Versão em lote do laço de `Dashboard.simulate_tasks`.
+
+        Um servidor inativo entre os `new_tasks` primeiros só é ativado se a energia
+        renovável total restante cobrir seu consumo no momento da ativação, como
+        na versão sequencial.
+
+        Args:
+            new_tasks (int): Número de servidores que devem estar com tarefa neste tick.
+        """
+        new_tasks = max(0, min(int(new_tasks), self.num_servers))
+        server_ids, renewable, regular = self._plan_activation(new_tasks)
+        self.energy_source.ledger.record_batch(server_ids, renewable, regular)
+        self.is_active[server_ids] = True
+
+        released = new_tasks + np.flatnonzero(self.is_active[new_tasks:])
+        if released.size:
+            self._deactivate(released)
+        np.minimum(self.loads[:new_tasks] + 1, self.max_load, out=self.loads[:new_tasks])
+        np.maximum(self.loads[new_tasks:] - 1, 0, out=self.loads[new_tasks:])
+        # As cargas são limitadas a max_load acima, então não há excesso a redistribuir.
+
+    def energy_used(self):
+        return self.energy_source.ledger.totals()
+
+    def get_status(self):
+        active = int(np.count_nonzero(self.is_active))
+        idle = self.num_servers - active
+        renewable = self.energy_source.renewable_status()
+        regular = self.energy_source.regular_status()
+        return active, idle, renewable, regular
+
+    def _plan_activation(self, new_tasks):
+        """
+        Aloca, na fonte, a energia dos servidores inativos entre os `new_tasks` primeiros
+        que serão ativados neste tick, sem ativá-los.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Servidores a ativar, na ordem, e a
+            energia renovável e comum alocada a cada um.
+        """
+        source = self.energy_source
+        pending = np.flatnonzero(~self.is_active[:new_tasks])
+        accepted, renewable, regular, source.total_renewable_capacity, source.regular_capacity = allocate_candidates(
+            source.total_renewable_capacity, source.regular_capacity, source.num_servers,
+            self.energy_consumption[pending])
+        return pending[accepted], renewable, regular
+
+    def _activate(self, server_ids):
+        """Aloca energia em lote para os servidores dados, na ordem, e os ativa."""
+        self.energy_source.allocate_batch(self.energy_consumption[server_ids], server_ids)
+        self.is_active[server_ids] = True
+
+    def _deactivate(self, server_ids):
+        """Desativa servidores ativos e distintos, devolvendo a sua energia à fonte."""
+        self.energy_source.release_batch(server_ids)
+        self.is_active[server_ids] = False
+
+    def _bind_ledger(self):
+        """Faz o livro-razão da fonte manter os vetores de energia usada desta frota."""
+        self.energy_source.ledger = EnergyLedger(self.num_servers, self.renewable_used, self.regular_used)
+
+
+def benchmark_tick(num_servers, num_ticks=10, seed=0):
+    """
+    Mede o tempo médio de um tick de `FleetDataCenter.simulate_tick`.
+
+    A energia é reabastecida e o número de tarefas oscila a cada tick, de modo
+    que cada tick ativa e desativa uma fração da frota.
+
+    Args:
+        num_servers (int): Tamanho da frota.
+        num_ticks (int): Número de ticks medidos.
+        seed (int): Semente do gerador de tarefas.
+
+    Returns:
+        float: Tempo médio por tick, em segundos.
+    """
+    rng = np.random.default_rng(seed)
+    data_center = FleetDataCenter(renewable_capacity_kW=num_servers * 3, regular_capacity_kW=num_servers * 2,
+                                  server_energy_consumption_kW=5, num_servers=num_servers)
+    elapsed = 0.0
+    for _ in range(num_ticks):
+        data_center.energy_source.total_renewable_capacity = num_servers * 3
+        data_center.energy_source.regular_capacity = num_servers * 2
+        new_tasks = int(rng.integers(num_servers // 4, num_servers))
+        start = time.perf_counter()
+        data_center.simulate_tick(new_tasks)
+        elapsed += time.perf_counter() - start
+    return elapsed / num_ticks
+
+
+def benchmark_reference_tick(num_servers, num_ticks=3, seed=0):
+    """Mede o mesmo tick usando o `main.DataCenter` baseado em lista, para comparação."""
+    rng = np.random.default_rng(seed)
+    data_center = DataCenter(renewable_capacity_kW=num_servers * 3, regular_capacity_kW=num_servers * 2,
+                             server_energy_consumption_kW=5, num_servers=num_servers)
+    elapsed = 0.0
+    for _ in range(num_ticks):
+        data_center.energy_source.total_renewable_capacity = num_servers * 3
+        data_center.energy_source.regular_capacity = num_servers * 2
+        new_tasks = int(rng.integers(num_servers // 4, num_servers))
+        start = time.perf_counter()
+        for i, server in enumerate(data_center.servers):
+            if i < new_tasks:
+                if not server.is_active and data_center.energy_source.total_renewable_capacity >= server.energy_consumption:
+                    data_center.assign_task(i)
+            elif server.is_active:
+                data_center.deactivate_server(i)
+        elapsed += time.perf_counter() - start
+    return elapsed / num_ticks
+
+
+if __name__ == "__main__":
+    for num_servers in [10000, 100000, 1000000]:
+        tick = benchmark_tick(num_servers)
+        print(f"{num_servers} servidores: {tick * 1000:.2f} ms por tick (vetorizado)")
+        if num_servers <= 100000:
+            reference = benchmark_reference_tick(num_servers)
+            print(f"{num_servers} servidores: {reference * 1000:.2f} ms por tick (lista de Server)")
@@ -0,0 +1,362 @@
+"""
+Instrumentação opcional das operações críticas do data center.
+
+`install()` envolve os métodos listados em `DEFAULT_TARGETS` com um cronômetro que
+registra a latência de cada chamada em um histograma logarítmico (no estilo HDR), e
+`uninstall()` devolve os métodos originais: com a instrumentação desligada, nada fica
+no caminho das chamadas. Cada linha de execução grava no seu próprio histograma, sem
+travas; os histogramas são somados só na leitura.
+
+`SamplingProfiler` é um perfilador por amostragem que pode ser ligado sob demanda (por
+exemplo, com `on_demand()`, ao receber SIGUSR1), sem instrumentar o código.
+"""
+import collections
+import importlib
+import os
+import signal
+import sys
+import threading
+import time
+from functools import wraps
+
+# Operações medidas por padrão: (módulo, classe, método).
+DEFAULT_TARGETS = (
+    ("main", "DataCenter", "assign_task"),
+    ("main", "EnergySource", "allocate_energy"),
+    ("painel", "Dashboard", "render"),
+    ("simulacao", "Simulation", "tick"),
+    ("priorizacao", "DataCenter", "assign_task"),
+    ("priorizacao", "EnergySource", "allocate_energy"),
+    ("carga", "DataCenter", "add_task"),
+    ("carga", "DataCenter", "check_and_cool"),
+    ("carga", "DataCenter", "redistribute_load"),
+    ("resfriamento", "DataCenter", "add_task"),
+    ("resfriamento", "DataCenter", "check_and_cool"),
+    ("resfriamento", "DataCenter", "redistribute_load"),
+)
+
+# Histograma: valores abaixo de 2^SUB_BITS ns são exatos; acima, cada potência de 2 é
+# dividida em 2^SUB_BITS faixas iguais (erro relativo de até ~3%).
+SUB_BITS = 5
+SUB_BUCKETS = 1 << SUB_BITS
+MAX_BITS = 40  # cerca de 18 minutos em nanossegundos
+NUM_BUCKETS = (MAX_BITS - SUB_BITS + 1) * SUB_BUCKETS
+
+
+def bucket_index(value):
+    """Faixa do histograma de um valor em nanossegundos. O(1)"""
+    if value < SUB_BUCKETS:
+        return max(value, 0)
+    if value >= 1 << MAX_BITS:
+        return NUM_BUCKETS - 1
+    shift = value.bit_length() - SUB_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_value(index):
+    """Valor representativo (o meio) de uma faixa do histograma, em nanossegundos."""
+    if index < SUB_BUCKETS:
+        return float(index)
+    shift = index // SUB_BUCKETS - 1
+    low = (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+    return low + ((1 << shift) - 1) / 2
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências de uma operação, com uma tabela de contagens por linha de
+    execução: `record` só toca a tabela da linha que chama, então dispensa travas.
+
+    Métodos:
+        record(nanoseconds): Registra uma latência. O(1)
+        counts(): Soma as tabelas de todas as linhas de execução.
+        percentile(q): Latência (ns) do percentil q (0 a 100).
+        reset(): Zera o histograma.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()
+        self._tables = []
+        self._lock = threading.Lock()
+
+    def record(self, nanoseconds):
+        table = getattr(self._local, "table", None)
+        if table is None:
+            table = self._local.table = [0] * NUM_BUCKETS
+            # Só a criação da tabela de uma nova linha de execução precisa da trava.
+            with self._lock:
+                self._tables.append(table)
+        table[bucket_index(nanoseconds)] += 1
+
+    def counts(self):
+        with self._lock:
+            tables = list(self._tables)
+        return [sum(column) for column in zip(*tables)] if tables else [0] * NUM_BUCKETS
+
+    def count(self):
+        return sum(self.counts())
+
+    def percentile(self, q, counts=None):
+        counts = self.counts() if counts is None else counts
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = max(1, -(-total * q // 100))
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                return bucket_value(index)
+        return bucket_value(NUM_BUCKETS - 1)
+
+    def summary(self):
+        """Retorna (chamadas, p50, p99, máximo), com as latências em microssegundos."""
+        counts = self.counts()
+        total = sum(counts)
+        if not total:
+            return 0, 0.0, 0.0, 0.0
+        highest = max(index for index, count in enumerate(counts) if count)
+        return (total, self.percentile(50, counts) / 1e3, self.percentile(99, counts) / 1e3,
+                bucket_value(highest) / 1e3)
+
+    def reset(self):
+        with self._lock:
+            for table in self._tables:
+                table[:] = [0] * NUM_BUCKETS
+
+
+HISTOGRAMS = {}
+_installed = {}
+
+
+def histogram(name):
+    """Retorna o histograma de uma operação, criando-o na primeira vez."""
+    if name not in HISTOGRAMS:
+        HISTOGRAMS[name] = LatencyHistogram(name)
+    return HISTOGRAMS[name]
+
+
+def timed(function, name):
+    """Envolve `function` com um cronômetro que registra cada chamada no histograma `name`."""
+    record = histogram(name).record
+    clock = time.perf_counter_ns
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            record(clock() - start)
+
+    return wrapper
+
+
+def _module(name):
+    # Um módulo executado como script é `__main__`, e é nele que estão as classes em uso.
+    main = sys.modules.get("__main__")
+    main_file = getattr(main, "__file__", None) or ""
+    if os.path.splitext(os.path.basename(main_file))[0] == name:
+        return main
+    return importlib.import_module(f".{name}", __package__)
+
+
+def install(targets=DEFAULT_TARGETS):
+    """
+    Liga a instrumentação dos métodos dados. Cada histograma leva o nome "módulo.Classe.método".
+
+    Returns:
+        list: Os nomes das operações instrumentadas nesta chamada.
+    """
+    installed = []
+    for module_name, class_name, method_name in targets:
+        name = f"{module_name}.{class_name}.{method_name}"
+        if name in _installed:
+            continue
+        owner = getattr(_module(module_name), class_name)
+        original = owner.__dict__[method_name]
+        setattr(owner, method_name, timed(original, name))
+        _installed[name] = (owner, method_name, original)
+        installed.append(name)
+    return installed
+
+
+def uninstall():
+    """Desliga a instrumentação, devolvendo os métodos originais. Os histogramas são mantidos."""
+    while _installed:
+        _, (owner, method_name, original) = _installed.popitem()
+        setattr(owner, method_name, original)
+
+
+def enabled():
+    return bool(_installed)
+
+
+def reset():
+    for latency in HISTOGRAMS.values():
+        latency.reset()
+
+
+def summary_text(min_calls=1):
+    """Uma linha por operação medida: chamadas, p50 e p99 (em µs). Usada pelo painel do Dashboard."""
+    lines = []
+    for name, latency in sorted(HISTOGRAMS.items()):
+        calls, p50, p99, _ = latency.summary()
+        if calls >= min_calls:
+            lines.append(f"{name}: p50 {p50:.1f} µs, p99 {p99:.1f} µs ({calls} chamadas)")
+    return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """
+    Perfilador por amostragem: uma linha de execução auxiliar lê, a cada `interval`
+    segundos, a pilha das outras linhas de execução (`sys._current_frames`) e conta
+    em que função cada uma estava (própria) e quais funções estavam na pilha (acumulada).
+    O custo não depende de quantas chamadas são feitas, só da frequência de amostragem.
+
+    Métodos:
+        start() / stop(): Liga e desliga a amostragem (também como gerenciador de contexto).
+        report(top): As funções mais amostradas.
+    """
+
+    def __init__(self, interval=0.005, thread_ids=None):
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.samples = 0
+        self.own = collections.Counter()
+        self.cumulative = collections.Counter()
+        self._running = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running.set()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._running.clear()
+        self._thread.join()
+        self._thread = None
+
+    def _sample(self):
+        own_id = threading.get_ident()
+        while self._running.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.samples += 1
+                self.own[_location(frame)] += 1
+                seen = set()
+                while frame is not None:
+                    location = _location(frame)
+                    if location not in seen:
+                        seen.add(location)
+                        self.cumulative[location] += 1
+                    frame = frame.f_back
+            time.sleep(self.interval)
+
+    def report(self, top=10):
+        """
+        Returns:
+            list: Tuplas (função, fração própria, fração acumulada) das `top` funções com
+            mais amostras próprias.
+        """
+        if not self.samples:
+            return []
+        return [(location, count / self.samples, self.cumulative[location] / self.samples)
+                for location, count in self.own.most_common(top)]
+
+
+def _location(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno} {code.co_name}"
+
+
+def on_demand(signum=getattr(signal, "SIGUSR1", None), seconds=5.0, stream=None):
+    """
+    Liga um gancho de perfil sob demanda: ao receber o sinal, o processo é amostrado por
+    `seconds` segundos e o relatório é escrito em `stream` (por padrão, a saída de erro).
+    Só pode ser chamado na linha de execução principal.
+    """
+    def report_later(profiler):
+        time.sleep(seconds)
+        profiler.stop()
+        output = stream or sys.stderr
+        output.write(f"Perfil por amostragem ({profiler.samples} amostras em {seconds:.1f} s):\n")
+        for location, own, cumulative in profiler.report():
+            output.write(f"  {own:6.1%} própria {cumulative:6.1%} acumulada  {location}\n")
+        output.flush()
+
+    def handler(*_):
+        profiler = SamplingProfiler()
+        profiler.start()
+        threading.Thread(target=report_later, args=(profiler,), daemon=True).start()
+
+    signal.signal(signum, handler)
+
+
+def benchmark_overhead(num_tasks=100000, repeats=3):
+    """
+    Mede o custo da instrumentação em `main.DataCenter.assign_task` (que chama
+    `allocate_energy`), ativando e desativando `num_tasks` servidores, com a
+    instrumentação desligada, ligada e desligada de novo.
+
+    Returns:
+        dict: Tempo médio por tarefa (µs) em cada estado e o resumo das latências medidas.
+    """
+    from .main import DataCenter
+
+    def run():
+        best = float("inf")
+        for _ in range(repeats):
+            data_center = DataCenter(renewable_capacity_kW=num_tasks * 5, regular_capacity_kW=num_tasks * 5,
+                                     server_energy_consumption_kW=5, num_servers=num_tasks)
+            start = time.perf_counter()
+            for server_id in range(num_tasks):
+                data_center.assign_task(server_id)
+            best = min(best, time.perf_counter() - start)
+        return best / num_tasks * 1e6
+
+    run()  # aquecimento
+    results = {"desligada": run()}
+    reset()
+    install([("main", "DataCenter", "assign_task"), ("main", "EnergySource", "allocate_energy")])
+    try:
+        results["ligada"] = run()
+        results["resumo"] = summary_text()
+    finally:
+        uninstall()
+    results["desligada de novo"] = run()
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark_overhead()
+    for state in ("desligada", "ligada", "desligada de novo"):
+        print(f"assign_task com a instrumentação {state}: {results[state]:.2f} µs por tarefa")
+    print(results["resumo"])
+
+    from .main import DataCenter
+
+    data_center = DataCenter(renewable_capacity_kW=10 ** 6, regular_capacity_kW=10 ** 6,
+                             server_energy_consumption_kW=5, num_servers=200000)
+    with SamplingProfiler(interval=0.001) as profiler:
+        for server_id in range(200000):
+            data_center.assign_task(server_id)
+        for server_id in range(200000):
+            data_center.deactivate_server(server_id)
+    print(f"Perfil por amostragem ({profiler.samples} amostras):")
+    for location, own, cumulative in profiler.report(5):
+        print(f"  {own:6.1%} própria {cumulative:6.1%} acumulada  {location}")
@@ -0,0 +1,187 @@
+"""
+Modelo único de servidor, usado por todos os subsistemas do data center.
+
+O mesmo objeto guarda o estado de energia (usado por `main` e `priorizacao`) e o estado
+térmico e de carga (usado por `carga` e `resfriamento`), então as lógicas de energia, de
+carga e de resfriamento podem operar sobre a mesma frota, sem cópias. A classe usa
+`__slots__`: cada servidor ocupa um bloco fixo de memória, sem o dicionário de atributos
+de um objeto comum.
+"""
+import time
+
+# Modelo térmico: temperatura ambiente (°C), aquecimento por unidade de carga (°C) e
+# redução de temperatura de cada resfriamento (°C).
+AMBIENT_TEMPERATURE = 25
+HEAT_PER_LOAD = 0.5
+COOLING_STEP = 5
+
+
+class Server:
+    """
+    Representa um servidor no data center, com o estado de energia e o térmico.
+
+    Os servidores são comparados e indexados por identidade (por exemplo, nos heaps e
+    conjuntos de `carga` e `resfriamento`). Subclasses que só mudam comportamento devem
+    declarar `__slots__ = ()` para continuar sem dicionário de atributos.
+
+    Atributos:
+        server_id (int): Identificador único do servidor.
+        energy_consumption (float): Consumo de energia do servidor (em kW).
+        is_active (bool): Se o servidor está ativo.
+        renewable_used (float): Energia renovável usada pelo servidor (em kW).
+        regular_used (float): Energia comum usada pelo servidor (em kW).
+        current_load (int): Carga atual do servidor.
+        temperature (float): Temperatura atual do servidor (em °C).
+        max_temp (float): Temperatura máxima antes de precisar resfriar (em °C).
+        tasks_transferred (int): Carga transferida para outros servidores por superaquecimento.
+
+    Métodos:
+        activate(renewable_used, regular_used): Ativa o servidor com a energia alocada.
+        deactivate(): Desativa o servidor, mantendo a última alocação de energia.
+        add_task(load): Adiciona carga ao servidor e atualiza a temperatura.
+        release_task(load): Libera carga do servidor e atualiza a temperatura.
+        update_temperature(): Atualiza a temperatura com base na carga.
+        cool_down(): Resfria o servidor, sem ficar abaixo da temperatura ambiente.
+    """
+
+    __slots__ = ("server_id", "energy_consumption", "is_active", "renewable_used", "regular_used",
+                 "current_load", "temperature", "max_temp", "tasks_transferred")
+
+    def __init__(self, server_id, energy_consumption_kW=0, max_temp=75):
+        self.server_id = server_id
+        self.energy_consumption = energy_consumption_kW
+        self.is_active = False
+        self.renewable_used = 0
+        self.regular_used = 0
+        self.current_load = 0
+        self.temperature = AMBIENT_TEMPERATURE
+        self.max_temp = max_temp
+        self.tasks_transferred = 0
+
+    def activate(self, renewable_used, regular_used):
+        self.is_active = True
+        self.renewable_used = renewable_used
+        self.regular_used = regular_used
+
+    def deactivate(self):
+        # Como no `main.Server` original, só o estado muda: `renewable_used` e `regular_used`
+        # guardam a última alocação. A energia em uso fica no livro-razão da fonte.
+        self.is_active = False
+
+    def add_task(self, load):
+        self.current_load += load
+        self.update_temperature()
+
+    def release_task(self, load):
+        self.current_load -= load
+        self.current_load = max(0, self.current_load)
+        self.update_temperature()
+
+    def update_temperature(self):
+        self.temperature = AMBIENT_TEMPERATURE + (self.current_load * HEAT_PER_LOAD)
+
+    def cool_down(self):
+        self.temperature -= COOLING_STEP
+        self.temperature = max(AMBIENT_TEMPERATURE, self.temperature)
+
+    def __repr__(self):
+        return (f"Server(id={self.server_id}, active={self.is_active}, load={self.current_load}, "
+                f"temp={self.temperature:.2f}°C, renewable_used={self.renewable_used}, "
+                f"regular_used={self.regular_used})")
+
+
+class _EnergyServer:
+    # Servidor de energia anterior ao modelo único (antes em `main` e `priorizacao`), para o benchmark.
+    def __init__(self, server_id, energy_consumption_kW):
+        self.server_id = server_id
+        self.energy_consumption = energy_consumption_kW
+        self.is_active = False
+        self.renewable_used = 0
+        self.regular_used = 0
+
+    def activate(self, renewable_used, regular_used):
+        self.is_active = True
+        self.renewable_used = renewable_used
+        self.regular_used = regular_used
+
+
+class _ThermalServer:
+    # Servidor térmico anterior ao modelo único (antes em `carga` e `resfriamento`), para o benchmark.
+    def __init__(self, server_id, max_temp=75):
+        self.server_id = server_id
+        self.current_load = 0
+        self.temperature = 25
+        self.max_temp = max_temp
+        self.tasks_transferred = 0
+
+    def add_task(self, load):
+        self.current_load += load
+        self.temperature = 25 + (self.current_load * 0.5)
+
+
+def benchmark_memoria(num_servers=1000000):
+    """
+    Mede a memória de uma frota de `num_servers` servidores ativos e com carga, com os
+    servidores de antes do modelo único (objetos comuns, um de energia e outro térmico
+    por servidor, como era preciso para combinar os subsistemas) e com `Server`.
+
+    Returns:
+        dict: Bytes por servidor e tempo de construção (s) de cada forma de guardar a frota.
+    """
+    import tracemalloc
+
+    def energy(server_id):
+        server = _EnergyServer(server_id, 5.0)
+        server.activate(server_id % 7 * 0.5, 5.0 - server_id % 7 * 0.5)
+        return server
+
+    def thermal(server_id):
+        server = _ThermalServer(server_id)
+        server.add_task(server_id % 50 + 1)
+        return server
+
+    def unified(server_id):
+        server = Server(server_id, 5.0)
+        server.activate(server_id % 7 * 0.5, 5.0 - server_id % 7 * 0.5)
+        server.add_task(server_id % 50 + 1)
+        return server
+
+    layouts = {
+        "objetos comuns, só energia": (energy,),
+        "objetos comuns, só térmico": (thermal,),
+        "objetos comuns, energia e térmico": (energy, thermal),
+        "modelo único com __slots__": (unified,),
+    }
+    results = {}
+    for name, builders in layouts.items():
+        tracemalloc.start()
+        start = time.perf_counter()
+        fleets = [[build(server_id) for server_id in range(num_servers)] for build in builders]
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del fleets
+        results[name] = {"bytes_por_servidor": size / num_servers, "segundos": elapsed}
+    return results
+
+
+if __name__ == "__main__":
+    from .carga import DataCenter as LoadDataCenter
+    from .eventos import disabled
+    from .main import DataCenter
+
+    # A mesma frota: a energia é alocada por `main` e a carga distribuída por `carga`.
+    data_center = DataCenter(renewable_capacity_kW=20, regular_capacity_kW=10, server_energy_consumption_kW=5,
+                             num_servers=5)
+    load_balancer = LoadDataCenter(servers=data_center.servers)
+    for server_id in range(5):
+        data_center.assign_task(server_id)
+    with disabled():
+        for load in (40, 30, 60, 20, 50, 70):
+            load_balancer.add_task(load)
+    for server in data_center.servers:
+        print(server)
+
+    for name, result in benchmark_memoria().items():
+        print(f"1000000 servidores, {name}: {result['bytes_por_servidor']:.0f} bytes por servidor "
+              f"(construção em {result['segundos']:.2f} s sob tracemalloc)")
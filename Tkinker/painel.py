@@ -0,0 +1,424 @@
+"""
+Interface gráfica do Green Data Center Manager: a tela de login (`Application`) e o painel
+de controle (`Dashboard`).
+
+Fica separada dos modelos de `main` para que importar o backend não carregue o Tkinter
+nem o Matplotlib; `main.Application` e `main.Dashboard` continuam disponíveis, importando
+este módulo só quando são usados.
+"""
+from tkinter import *
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from . import instrumentacao
+from .api_estado import StateServer
+from .main import DataCenter
+from .redistribuicao import spill_overflow
+from .renderizacao import BlitRenderer
+from .serie_temporal import TimeSeriesStore
+from .simulacao import Simulation, SimulationRunner
+from .telemetria import TelemetryLog, TelemetryReplay, TelemetryWriter
+
+# ===================== Interface Gráfica ======================
+
+class Application:
+    """
+    Representa a interface gráfica de um aplicativo de login utilizando Tkinter.
+
+    A classe cria a janela de login, com campos para usuário e senha, e botões para "Entrar" e "Sair".
+    Após o login bem-sucedido, a classe redireciona para um painel de controle (Dashboard).
+
+    Atributos:
+        master (Tk): A instância da janela principal do Tkinter.
+        dashboard_options (dict): Opções repassadas ao `Dashboard` aberto após o login.
+    
+    Métodos:
+        __init__(master=None, **dashboard_options):
+            Inicializa a interface gráfica, define o layout, campos de entrada e botões.
+
+        centralizar_janela(largura, altura):
+            Centraliza a janela na tela do computador.
+
+        abrir_dashboard():
+            Fecha a janela de login e abre o painel de controle (Dashboard).
+
+        login():
+            Realiza a validação de login. Se o login for bem-sucedido, exibe uma mensagem de sucesso e 
+            redireciona para o painel de controle. Caso contrário, exibe uma mensagem de erro.
+
+    """
+
+    def __init__(self, master=None, **dashboard_options):
+        self.master = master
+        self.dashboard_options = dashboard_options
+        self.master.configure(bg="white")  # Fundo branco
+        self.master.geometry("400x400")
+        self.centralizar_janela(400, 400)
+
+        # Título estilizado
+        self.containerTitulo = Frame(master, bg="white")
+        self.containerTitulo.pack(pady=20)
+        self.msg = Label(self.containerTitulo, text="Login", font=("Calibri", 18, "bold"), bg="white", fg="#4CAF50")
+        self.msg.pack()
+
+        # Campo de usuário
+        self.containerUsuario = Frame(master, bg="white")
+        self.containerUsuario.pack(pady=10)
+        self.inputLogin = Entry(self.containerUsuario, width=30, font=("Calibri", 12), bd=2, relief="solid")
+        self.inputLogin.pack(ipady=8, padx=20)
+
+        # Campo de senha
+        self.containerSenha = Frame(master, bg="white")
+        self.containerSenha.pack(pady=10)
+        self.inputPassword = Entry(self.containerSenha, width=30, font=("Calibri", 12), bd=2, relief="solid", show="*")
+        self.inputPassword.pack(ipady=8, padx=20)
+
+        # Botões estilizados
+        self.containerBotoes = Frame(master, bg="white")
+        self.containerBotoes.pack(pady=20)
+        self.botaoEntrar = Button(
+            self.containerBotoes, text="Entrar", font=("Calibri", 12, "bold"), bg="#4CAF50", fg="white", 
+            width=12, relief="flat", command=self.login
+        )
+        self.botaoEntrar.pack(side=LEFT, padx=10)
+
+        self.botaoSair = Button(
+            self.containerBotoes, text="Sair", font=("Calibri", 12, "bold"), bg="#f44336", fg="white", 
+            width=12, relief="flat", command=quit
+        )
+        self.botaoSair.pack(side=LEFT, padx=10)
+
+        # Mensagem de feedback
+        self.containerMensagemLogin = Frame(master, bg="white")
+        self.containerMensagemLogin.pack(pady=10)
+        self.mensagemDoLogin = Label(self.containerMensagemLogin, text="", font=("Calibri", 12), bg="white")
+        self.mensagemDoLogin.pack()
+
+    def centralizar_janela(self, largura, altura):
+        largura_tela = self.master.winfo_screenwidth()
+        altura_tela = self.master.winfo_screenheight()
+        pos_x = (largura_tela // 2) - (largura // 2)
+        pos_y = (altura_tela // 2) - (altura // 2)
+        self.master.geometry(f"{largura}x{altura}+{pos_x}+{pos_y}")
+
+    def abrir_dashboard(self):
+        self.master.destroy()
+        dashboard = Tk()
+        Dashboard(dashboard, **self.dashboard_options)
+        dashboard.mainloop()
+
+    def login(self):
+        usuario = self.inputLogin.get()
+        senha = self.inputPassword.get()
+        if usuario == "administrador" and senha == "admin":
+            self.mensagemDoLogin["text"] = "Login realizado com sucesso!"
+            self.mensagemDoLogin["foreground"] = "green"
+            self.master.after(1000, self.abrir_dashboard)
+        else:
+            self.mensagemDoLogin["text"] = "O login falhou!"
+            self.mensagemDoLogin["foreground"] = "red"
+
+
+class Dashboard:
+    """
+    Representa o painel de controle do Gerenciador de Data Center.
+
+    A classe cria uma interface gráfica para monitorar o consumo de energia, status dos servidores 
+    e a distribuição de carga no data center. Inclui gráficos interativos e indicadores de status.
+
+    Atributos:
+        master (Tk): Instância da janela principal do Tkinter.
+        data_center (DataCenter): Instância do DataCenter que contém servidores e fontes de energia.
+        simulation (Simulation): Simulação de eventos discretos que conduz o DataCenter.
+        running (bool): Controle de execução do painel de controle.
+        container (Frame): Frame principal que contém todos os elementos da interface.
+        frame_indicators (Frame): Frame que contém os indicadores de status.
+        frame_graphs (Frame): Frame que contém os gráficos de consumo de energia e cargas de servidores.
+        history (TimeSeriesStore): Histórico de energia usada e servidores ativos, com agregados por minuto e hora.
+        history_window (int): Quantos segundos de histórico os gráficos exibem.
+        renewable_data (np.ndarray): Consumo de energia renovável exibido no gráfico.
+        regular_data (np.ndarray): Consumo de energia comum exibido no gráfico.
+        server_loads (list): Lista que contém a carga de cada servidor.
+        runner (SimulationRunner | TelemetryReplay): Thread que publica snapshots em uma fila limitada.
+        telemetry (TelemetryWriter): Registro de telemetria da execução, se pedido.
+        render_interval_ms (int): Intervalo entre redesenhos do painel, em milissegundos.
+        lbl_latency (Label): Painel de latências por operação, se a instrumentação estiver ligada.
+        api (StateServer): API de estado em HTTP e WebSocket, se `api_port` foi dado.
+    
+    Métodos:
+        __init__(master=None, simulation_speed=1.0, render_interval_ms=1000, telemetry_path=None, replay_path=None,
+                 instrumented=False, api_port=None):
+            Inicializa o painel de controle com gráficos, indicadores e a thread de simulação.
+            A taxa de simulação (segundos virtuais por segundo real) e a de renderização são independentes.
+            Com `telemetry_path`, cada tick é gravado no registro de telemetria; com `replay_path`,
+            o painel reproduz um registro gravado em vez de simular. Com `instrumented=True`, as
+            operações críticas são instrumentadas (ver `instrumentacao`) e um painel mostra o p50 e
+            o p99 de cada uma. Com `api_port`, a simulação ao vivo também é servida em HTTP e
+            WebSocket nessa porta (ver `api_estado`).
+
+        centralizar_janela(largura, altura):
+            Centraliza a janela do dashboard na tela.
+
+        create_indicator(parent, title, value, color):
+            Cria um indicador com título e valor estilizados.
+
+        drain_snapshots():
+            Consome, na thread do Tkinter, os snapshots publicados pela simulação e redesenha o painel.
+
+        record(snapshot):
+            Acrescenta um snapshot ao histórico dos gráficos.
+
+        render(snapshot):
+            Atualiza os indicadores e gráficos com o snapshot mais recente.
+
+        simulate_tasks():
+            Simula a oscilação no número de tarefas ativas e ajusta os servidores com base na energia disponível.
+
+        redistribute_load(server_loads, max_capacity=200000):
+            Redistribui a carga entre os servidores para garantir que nenhum ultrapasse a capacidade máxima.
+
+        exit_dashboard():
+            Encerra o painel de controle e interrompe a thread de atualização.
+
+    """
+    
+    def __init__(self, master=None, simulation_speed=1.0, render_interval_ms=1000, telemetry_path=None,
+                 replay_path=None, instrumented=False, api_port=None):
+        self.master = master
+        self.master.geometry("900x700")
+        self.centralizar_janela(900, 700)
+        self.master.title("Green Data Center Manager - Dashboard")
+        
+        # Variáveis de controle
+        self.data_center = DataCenter(renewable_capacity_kW=100, regular_capacity_kW=50, 
+                                      server_energy_consumption_kW=5, num_servers=20)
+        self.running = True
+
+        # Simulação de eventos discretos; o painel apenas assina os snapshots de cada tick
+        self.simulation = Simulation(self.data_center)
+        self.simulation.schedule_ticks(max_tasks=50, max_load=200000)
+        num_servers = self.data_center.energy_source.num_servers
+        self.telemetry = None
+        if replay_path is not None:
+            # Reproduz uma execução gravada no lugar da simulação ao vivo
+            log = TelemetryLog(replay_path)
+            num_servers = log.num_servers
+            self.runner = TelemetryReplay(log, speed=simulation_speed)
+        else:
+            if telemetry_path is not None:
+                self.telemetry = TelemetryWriter(telemetry_path, num_servers)
+                self.telemetry.attach(self.simulation)
+            self.runner = SimulationRunner(self.simulation, speed=simulation_speed)
+        # API de estado para clientes externos, só na simulação ao vivo
+        self.api = None
+        if api_port is not None and replay_path is None:
+            self.api = StateServer(self.simulation, port=api_port)
+            self.api.start()
+        self.render_interval_ms = render_interval_ms
+
+        # Frame principal
+        self.container = Frame(master)
+        self.container.pack(fill=BOTH, expand=True)
+
+        # Indicadores com botão de sair
+        self.frame_indicators = Frame(self.container, bg="white")
+        self.frame_indicators.pack(side=TOP, fill=X, padx=10, pady=10)
+
+        self.indicator_width = 15
+
+        self.lbl_active = self.create_indicator(
+            self.frame_indicators, "Servidores Ativos", "0", "#4CAF50"
+        )
+        self.lbl_idle = self.create_indicator(
+            self.frame_indicators, "Servidores Ociosos", "20", "#FF9800"
+        )
+        self.lbl_renewable = self.create_indicator(
+            self.frame_indicators, "Energia Renovável (kW)", "100", "#2196F3"
+        )
+        self.lbl_regular = self.create_indicator(
+            self.frame_indicators, "Energia Comum (kW)", "50", "#E91E63"
+        )
+
+        # Botão de sair
+        self.exit_button = Button(
+            self.frame_indicators, text="Sair", font=("Calibri", 12), 
+            bg="#f44336", fg="white", width=self.indicator_width, 
+            command=self.exit_dashboard
+        )
+        self.exit_button.pack(side=RIGHT, padx=20)
+
+        # Painel de latências (p50/p99 por operação), só com a instrumentação ligada
+        self.instrumented = instrumented
+        self.lbl_latency = None
+        if instrumented:
+            instrumentacao.install()
+            self.lbl_latency = Label(self.container, text="", font=("Consolas", 9), justify=LEFT, anchor=W,
+                                     bg="white")
+            self.lbl_latency.pack(side=TOP, fill=X, padx=10)
+
+        # Gráficos
+        self.frame_graphs = Frame(self.container)
+        self.frame_graphs.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        self.figure = Figure(figsize=(9, 6), dpi=100)
+        self.ax1 = self.figure.add_subplot(221)
+        self.ax2 = self.figure.add_subplot(222)
+        self.ax3 = self.figure.add_subplot(212)
+
+        # Gráfico de consumo de energia
+        self.ax1.set_title("Consumo de Energia Renovável")
+        self.ax2.set_title("Consumo de Energia Comum")
+
+        self.history = TimeSeriesStore(("renewable_used", "regular_used", "active"))
+        self.history_window = 20
+        self.renewable_data = self.history.last("renewable_used", self.history_window, fill=100)
+        self.regular_data = self.history.last("regular_used", self.history_window, fill=50)
+        self.server_loads = [0] * num_servers
+
+        # Gráfico de cargas de servidores
+        self.ax3.set_title("Cargas de Servidores e Ativação")
+        self.ax3.set_xticks(range(len(self.server_loads)))  # Define 1 servidor por unidade no eixo X
+        self.ax3.set_xticklabels([str(i) for i in range(len(self.server_loads))], rotation=90)  # Rotula os servidores no eixo X
+        
+        self.line1, = self.ax1.plot(self.renewable_data, marker='o', label="kW")
+        self.line2, = self.ax2.plot(self.regular_data, marker='o', label="kW")
+        self.bar_servers = self.ax3.bar(range(len(self.server_loads)), self.server_loads, label="Cargas por Servidor")
+
+
+        canvas = FigureCanvasTkAgg(self.figure, self.frame_graphs)
+        canvas.get_tk_widget().pack(fill=BOTH, expand=True)
+
+        # Só as linhas e as barras mudam a cada tick; o restante da figura fica em cache
+        self.renderer = BlitRenderer(self.figure, [self.line1, self.line2, *self.bar_servers])
+
+        # Thread de simulação; o Tkinter só é tocado na thread principal, em drain_snapshots()
+        self.runner.start()
+        self.master.after(self.render_interval_ms, self.drain_snapshots)
+
+    def create_indicator(self, parent, title, value, color):
+        """Cria uma label estilizada com título e valor."""
+        frame = Frame(parent, bg="white", width=self.indicator_width)
+        frame.pack(side=LEFT, padx=20)
+
+        lbl_title = Label(
+            frame, text=title, font=("Calibri", 10, "bold"), bg="white"
+        )
+        lbl_title.pack()
+
+        lbl_value = Label(
+            frame, text=value, font=("Calibri", 14), bg="white", fg=color
+        )
+        lbl_value.pack()
+
+        return lbl_value
+
+    def centralizar_janela(self, largura, altura):
+        largura_tela = self.master.winfo_screenwidth()
+        altura_tela = self.master.winfo_screenheight()
+        pos_x = (largura_tela // 2) - (largura // 2)
+        pos_y = (altura_tela // 2) - (altura // 2)
+        self.master.geometry(f"{largura}x{altura}+{pos_x}+{pos_y}")
+
+    def drain_snapshots(self):
+        if not self.running:
+            return
+        # Todos os ticks entram no histórico, mas o painel é redesenhado uma única vez
+        snapshots = self.runner.drain()
+        for snapshot in snapshots:
+            self.record(snapshot)
+        if snapshots:
+            self.render(snapshots[-1])
+        if self.lbl_latency is not None:
+            self.lbl_latency.config(text=instrumentacao.summary_text())
+        self.master.after(self.render_interval_ms, self.drain_snapshots)
+
+    def record(self, snapshot):
+        self.history.append(snapshot.time, (snapshot.renewable_used, snapshot.regular_used, snapshot.active))
+
+    def render(self, snapshot):
+        """Atualiza indicadores e gráficos com o snapshot mais recente da simulação."""
+        self.server_loads = list(snapshot.server_loads)
+
+        self.lbl_active.config(text=snapshot.active)
+        self.lbl_idle.config(text=snapshot.idle)
+        self.lbl_renewable.config(text=f"{snapshot.renewable:.2f} kW")
+        self.lbl_regular.config(text=f"{snapshot.regular:.2f} kW")
+
+        # Atualiza os gráficos com a janela mais recente do histórico
+        self.renewable_data = self.history.last("renewable_used", self.history_window, fill=100)
+        self.regular_data = self.history.last("regular_used", self.history_window, fill=50)
+        self.line1.set_ydata(self.renewable_data)
+        self.line2.set_ydata(self.regular_data)
+
+        # Ajuste os valores das cargas para serem proporcionais a 200 mil
+        scaled_loads = [load * 20000 for load in self.server_loads]
+
+        for bar, load in zip(self.bar_servers, scaled_loads):
+            bar.set_height(load)
+
+        # Ajuste os limites dos eixos Y
+        max_renewable = self.renewable_data.max()
+        max_regular = self.regular_data.max()
+
+        # Os eixos só são redesenhados quando os limites realmente mudam
+        self.renderer.set_ylim(self.ax1, 0, max(max_renewable + 10, 20))  # Certifica-se de que o mínimo é sempre 20
+        self.renderer.set_ylim(self.ax2, 0, max(max_regular + 10, 20))
+        self.renderer.set_ylim(self.ax3, 0, 210000)  # Mantém o limite fixo para os servidores
+
+        self.renderer.update()  # Atualiza os gráficos
+
+    def simulate_tasks(self):
+        # Simula uma oscilação de tarefas e ajusta os servidores (ver Simulation.tick).
+        # Não deve ser chamado com a thread de simulação em execução.
+        return self.simulation.tick(max_tasks=50, max_load=200000)
+
+    def redistribute_load(self, server_loads, max_capacity=200000):
+        """
+        Redistribui a carga dos servidores caso algum ultrapasse a capacidade máxima.
+
+        Args:
+            server_loads (list): Lista com a carga atual de cada servidor.
+            max_capacity (int): Capacidade máxima de cada servidor.
+
+        Returns:
+            list: Lista de cargas ajustadas após a redistribuição.
+        """
+        return spill_overflow(server_loads, max_capacity)
+
+    def exit_dashboard(self):
+        self.running = False
+        self.runner.stop()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.instrumented:
+            instrumentacao.uninstall()
+        if self.api is not None:
+            self.api.stop()
+        self.master.destroy()
+
+
+
+def main(login=True, **options):
+    """
+    Abre a interface gráfica e roda o laço do Tkinter até a janela ser fechada.
+
+    Args:
+        login (bool): Se começa pela tela de login; sem ela, o painel abre direto.
+        **options: Opções do `Dashboard` (velocidade, telemetria, API etc.).
+    """
+    # Configuração da janela principal
+    window = Tk()
+    window.title("Green Data Center Manager")
+
+    # Instância da aplicação
+    if login:
+        Application(window, **options)
+    else:
+        Dashboard(window, **options)
+
+    # Loop principal
+    window.mainloop()
+
+
+if __name__ == "__main__":
+    main()
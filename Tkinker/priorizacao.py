@@ -1,23 +1,96 @@
+import numpy as np
 from sortedcontainers import SortedList
 from typing import Tuple
 
-class EnergySource:
+from . import main, modelo
+from .eventos import INFO, WARNING, disabled, log, register
+
+register("servidor_ativado", "Servidor {servidor} ativado.")
+register("servidor_desativado", "Servidor {servidor} desativado.")
+register("servidor_ja_ativo", "Servidor {servidor} já está ativo.")
+register("servidor_ja_desativado", "Servidor {servidor} já está desativado.")
+register("energia_insuficiente", "Não há energia suficiente para ativar o servidor {servidor}.")
+register("energia_mista", "Servidor {servidor} está usando energia mista: {renovavel} kW renovável e {comum} kW comum.")
+register("lote_priorizado", "{ativados} de {pendentes} tarefas pendentes atendidas por prioridade.")
+
+
+def schedule_by_priority(priorities, demands, renewable_capacity: float,
+                         regular_capacity: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Representa a fonte de energia de um DataCenter, incluindo capacidades renováveis e comuns.
+    Decide de uma vez a energia de um lote de tarefas pendentes, priorizando as mais importantes.
+
+    É um problema da mochila fracionária: o valor de cada kW renovável é a prioridade da
+    tarefa, então a escolha gulosa por prioridade decrescente maximiza a energia renovável
+    ponderada pela prioridade. As tarefas recebem, nessa ordem, energia renovável até a sua
+    demanda e completam o restante com energia comum. Uma tarefa só é aceita se a demanda
+    for coberta por inteiro; as que não cabem são puladas, e tarefas menores de prioridade
+    mais baixa ainda podem usar o que sobrou. Empates de prioridade mantêm a ordem do lote.
+
+    A ordenação custa O(n log n); o prefixo de tarefas que cabem por inteiro é resolvido
+    com somas de prefixos, e o restante só é percorrido enquanto alguma tarefa ainda couber.
+
+    Args:
+        priorities (array-like): Prioridade de cada tarefa (maior é mais importante).
+        demands (array-like): Demanda de energia de cada tarefa (em kW).
+        renewable_capacity (float): Energia renovável disponível (em kW).
+        regular_capacity (float): Energia comum disponível (em kW).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Energia renovável e comum de cada tarefa,
+        na ordem do lote, e quais tarefas foram aceitas.
     """
-    def __init__(self, renewable_capacity_kW: float, regular_capacity_kW: float, num_servers: int):
-        """
-        Inicializa a fonte de energia.
+    priorities = np.asarray(priorities, dtype=np.float64)
+    demands = np.asarray(demands, dtype=np.float64)
+    count = demands.size
+    order = np.lexsort((np.arange(count), -priorities))
+    sorted_demands = demands[order]
+
+    renewable_before = np.cumsum(sorted_demands) - sorted_demands
+    renewable = np.clip(renewable_capacity - renewable_before, 0, sorted_demands)
+    need = sorted_demands - renewable
+    regular = np.clip(regular_capacity - (np.cumsum(need) - need), 0, need)
+    short = np.flatnonzero(sorted_demands - (renewable + regular) > 1e-9 * np.maximum(sorted_demands, 1))
+    prefix = int(short[0]) if short.size else count
+
+    accepted = np.zeros(count, dtype=bool)
+    accepted[:prefix] = True
+    renewable[prefix:] = 0
+    regular[prefix:] = 0
+    renewable_left = renewable_capacity - renewable[:prefix].sum()
+    regular_left = regular_capacity - regular[:prefix].sum()
+
+    # A partir da primeira tarefa que não cabe, as tarefas são puladas ou aceitas uma a uma,
+    # até que nem a menor demanda restante caiba na energia que sobrou.
+    if prefix < count:
+        smallest_after = np.minimum.accumulate(sorted_demands[::-1])[::-1]
+        for i in range(prefix, count):
+            available = renewable_left + regular_left
+            if smallest_after[i] > available:
+                break
+            demand = sorted_demands[i]
+            if demand <= available:
+                renewable[i] = min(demand, renewable_left)
+                regular[i] = demand - renewable[i]
+                renewable_left -= renewable[i]
+                regular_left -= regular[i]
+                accepted[i] = True
+
+    renewable_used = np.empty(count)
+    regular_used = np.empty(count)
+    accepted_tasks = np.empty(count, dtype=bool)
+    renewable_used[order] = renewable
+    regular_used[order] = regular
+    accepted_tasks[order] = accepted
+    return renewable_used, regular_used, accepted_tasks
+
+
+class EnergySource(main.EnergySource):
+    """
+    Representa a fonte de energia de um DataCenter, incluindo capacidades renováveis e comuns.
 
-        Args:
-            renewable_capacity_kW (float): Capacidade total de energia renovável em kW.
-            regular_capacity_kW (float): Capacidade total de energia comum em kW.
-            num_servers (int): Número de servidores.
-        """
-        self.total_renewable_capacity = renewable_capacity_kW
-        self.renewable_capacity_per_server = renewable_capacity_kW / num_servers
-        self.regular_capacity = regular_capacity_kW
-        self.num_servers = num_servers
+    A alocação, o livro-razão (`ledger`) e as devoluções são os de `main.EnergySource`;
+    aqui ficam a assinatura tipada, com o servidor obrigatório, e a alocação por prioridade.
+    """
 
     def allocate_energy(self, demand_kW: float, server_id: int) -> Tuple[str, Tuple[float, float]]:
         """
@@ -30,66 +103,67 @@ class EnergySource:
         Returns:
             Tuple[str, Tuple[float, float]]: Tipo de energia usada (renovável, mista) e a quantidade de energia consumida.
         """
-        available_renewable = self.renewable_capacity_per_server
+        return super().allocate_energy(demand_kW, server_id)
 
-        if demand_kW <= available_renewable:
-            renewable_used = demand_kW
-            self.total_renewable_capacity -= renewable_used
-            self.renewable_capacity_per_server = self.total_renewable_capacity / self.num_servers
-            return 'renewable', (renewable_used, 0)
-        else:
-            renewable_used = available_renewable
-            self.total_renewable_capacity -= renewable_used
-            self.renewable_capacity_per_server = self.total_renewable_capacity / self.num_servers
+    def allocate_batch(self, demands_kW, server_ids=None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Aloca energia para várias demandas de uma só vez, com o mesmo resultado de chamar
+        `allocate_energy` em ordem para cada demanda.
 
-            regular_needed = demand_kW - renewable_used
-            if regular_needed <= self.regular_capacity:
-                regular_used = regular_needed
-                self.regular_capacity -= regular_used
-            else:
-                regular_used = self.regular_capacity
-                self.regular_capacity = 0
+        Args:
+            demands_kW (array-like): As demandas de energia, na ordem de atendimento.
+            server_ids (array-like): Servidores distintos de cada demanda, para o livro-razão (opcional).
 
-            return 'mixed', (renewable_used, regular_used)
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: A energia renovável e a energia comum usada por demanda.
+        """
+        return super().allocate_batch(demands_kW, server_ids)
 
-    def renewable_status(self) -> float:
+    def allocate_by_priority(self, priorities, demands_kW,
+                             server_ids=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Retorna o status da energia renovável disponível.
+        Aloca energia para um lote de demandas por ordem de prioridade (ver `schedule_by_priority`),
+        usando toda a energia renovável restante, e não a parcela por servidor de `allocate_energy`.
+
+        Args:
+            priorities (array-like): Prioridade de cada demanda.
+            demands_kW (array-like): As demandas de energia.
+            server_ids (array-like): Servidores distintos de cada demanda, para o livro-razão (opcional).
 
         Returns:
-            float: A energia renovável total disponível.
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: A energia renovável e comum usada por
+            demanda e quais demandas foram atendidas.
         """
-        return self.total_renewable_capacity
-
-    def regular_status(self) -> float:
+        renewable_used, regular_used, accepted = schedule_by_priority(
+            priorities, demands_kW, self.total_renewable_capacity, self.regular_capacity)
+        self.total_renewable_capacity -= float(renewable_used.sum())
+        self.regular_capacity = max(self.regular_capacity - float(regular_used.sum()), 0)
+        if server_ids is not None:
+            accepted_ids = np.asarray(server_ids, dtype=np.int64)[accepted]
+            self.ledger.record_batch(accepted_ids, renewable_used[accepted], regular_used[accepted])
+        return renewable_used, regular_used, accepted
+
+    def release(self, server_id: int) -> Tuple[float, float]:
         """
-        Retorna o status da energia comum disponível.
+        Devolve à fonte a energia alocada a um servidor.
+
+        Args:
+            server_id (int): O ID do servidor.
 
         Returns:
-            float: A energia comum total disponível.
+            Tuple[float, float]: A energia renovável e comum devolvida.
         """
-        return self.regular_capacity
+        return super().release(server_id)
 
     def __repr__(self):
         return f"EnergySource(renewable_total={self.total_renewable_capacity} kW, regular={self.regular_capacity} kW)"
 
-class Server:
+class Server(modelo.Server):
     """
-    Representa um servidor no DataCenter.
+    Representa um servidor no DataCenter: o modelo único de `modelo.Server`, registrando
+    a ativação e a desativação. Ao ser desativado, mantém o registro da última energia usada.
     """
-    def __init__(self, server_id: int, energy_consumption_kW: float):
-        """
-        Inicializa um servidor.
-
-        Args:
-            server_id (int): Identificador do servidor.
-            energy_consumption_kW (float): Consumo de energia do servidor por tarefa.
-        """
-        self.server_id = server_id
-        self.energy_consumption = energy_consumption_kW
-        self.is_active = False
-        self.renewable_used = 0
-        self.regular_used = 0
+    __slots__ = ()
 
     def activate(self, renewable_used: float, regular_used: float):
         """
@@ -102,14 +176,16 @@ class Server:
         self.is_active = True
         self.renewable_used = renewable_used
         self.regular_used = regular_used
-        print(f"Servidor {self.server_id} ativado.")
+        if log.level <= INFO:
+            log.emit("servidor_ativado", INFO, servidor=self.server_id)
 
     def deactivate(self):
         """
         Desativa o servidor.
         """
         self.is_active = False
-        print(f"Servidor {self.server_id} desativado.")
+        if log.level <= INFO:
+            log.emit("servidor_desativado", INFO, servidor=self.server_id)
 
     def __repr__(self):
         return f"Server(id={self.server_id}, consumption={self.energy_consumption} kW, active={self.is_active}, renewable_used={self.renewable_used} kW, regular_used={self.regular_used} kW)"
@@ -140,33 +216,78 @@ class DataCenter:
         """
         server = self.servers[server_id]
         if server.is_active:
-            print(f"Servidor {server_id} já está ativo.")
+            if log.level <= INFO:
+                log.emit("servidor_ja_ativo", INFO, servidor=server_id)
             return
 
         energy_type, energy_used = self.energy_source.allocate_energy(server.energy_consumption, server_id)
         renewable_used, regular_used = energy_used
 
         if energy_type == 'insufficient':
-            print(f"Não há energia suficiente para ativar o servidor {server_id}.")
+            if log.level <= WARNING:
+                log.emit("energia_insuficiente", WARNING, servidor=server_id)
         else:
             server.activate(renewable_used, regular_used)
-            if energy_type == 'mixed':
-                print(f"Servidor {server_id} está usando energia mista: {renewable_used} kW renovável e {regular_used} kW comum.")
+            if energy_type == 'mixed' and log.level <= INFO:
+                log.emit("energia_mista", INFO, servidor=server_id, renovavel=renewable_used, comum=regular_used)
+
+    def assign_tasks_by_priority(self, requests) -> list:
+        """
+        Atribui um lote de tarefas pendentes em uma única decisão, dando energia renovável
+        primeiro às tarefas de maior prioridade (ver `schedule_by_priority`).
+
+        Servidores já ativos são ignorados e, se um servidor aparecer mais de uma vez no
+        lote, vale o primeiro pedido. Tarefas cuja demanda não pode ser coberta continuam pendentes.
+
+        Args:
+            requests (iterable): Tuplas (server_id, prioridade, demanda em kW).
+
+        Returns:
+            list: Identificadores dos servidores ativados.
+        """
+        requests = np.asarray(list(requests), dtype=np.float64).reshape(-1, 3)
+        server_ids = requests[:, 0].astype(np.int64)
+        _, first = np.unique(server_ids, return_index=True)
+        first.sort()
+        pending = [i for i in first.tolist() if not self.servers[int(server_ids[i])].is_active]
+        requests, server_ids = requests[pending], server_ids[pending]
+
+        renewable_used, regular_used, accepted = self.energy_source.allocate_by_priority(
+            requests[:, 1], requests[:, 2], server_ids)
+        activated = []
+        for i in np.flatnonzero(accepted).tolist():
+            server_id = int(server_ids[i])
+            self.servers[server_id].activate(float(renewable_used[i]), float(regular_used[i]))
+            activated.append(server_id)
+        if log.level <= INFO:
+            log.emit("lote_priorizado", INFO, ativados=len(activated), pendentes=len(pending))
+        return activated
 
     def deactivate_server(self, server_id: int):
         """
-        Desativa um servidor.
+        Desativa um servidor e devolve à fonte a energia que ele usava.
 
         Args:
             server_id (int): Identificador do servidor.
         """
         server = self.servers[server_id]
         if not server.is_active:
-            print(f"Servidor {server_id} já está desativado.")
+            if log.level <= INFO:
+                log.emit("servidor_ja_desativado", INFO, servidor=server_id)
             return
 
+        self.energy_source.release(server_id)
         server.deactivate()
 
+    def energy_used(self) -> Tuple[float, float]:
+        """
+        Retorna o total de energia renovável e comum em uso, mantido pelo livro-razão da fonte.
+
+        Returns:
+            Tuple[float, float]: A energia renovável e a comum em uso (em kW).
+        """
+        return self.energy_source.ledger.totals()
+
     def status(self):
         """
         Exibe o status dos servidores e da fonte de energia.
@@ -179,15 +300,63 @@ class DataCenter:
         print(f"Energia comum disponível: {self.energy_source.regular_status()} kW")
 
 
-# Configuração do DataCenter com capacidades fictícias e servidores
-data_center = DataCenter(renewable_capacity_kW=300, regular_capacity_kW=500, server_energy_consumption_kW=50, num_servers=5)
+def compare_with_call_order(num_tasks: int = 10000, seed: int = 0) -> dict:
+    """
+    Compara, em uma rajada de `num_tasks` pedidos, a atribuição por ordem de chegada
+    (`assign_task` em sequência) com o escalonador por prioridade.
 
-# Ativa servidores e aloca energia
-for i in range(5):
-    data_center.assign_task(i)
+    Returns:
+        dict: Para cada estratégia, o tempo (s), os servidores ativados e a energia
+        renovável ponderada pela prioridade.
+    """
+    import time
+
+    rng = np.random.default_rng(seed)
+    priorities = rng.integers(1, 11, num_tasks)
+    demands = rng.uniform(10, 50, num_tasks)
+
+    def build():
+        data_center = DataCenter(renewable_capacity_kW=num_tasks * 10, regular_capacity_kW=num_tasks * 5,
+                                 server_energy_consumption_kW=30, num_servers=num_tasks)
+        for server, demand in zip(data_center.servers, demands.tolist()):
+            server.energy_consumption = demand
+        return data_center
+
+    results = {}
+    with disabled():
+        data_center = build()
+        start = time.perf_counter()
+        for server_id in range(num_tasks):
+            data_center.assign_task(server_id)
+        elapsed = time.perf_counter() - start
+        renewable = np.array([server.renewable_used for server in data_center.servers])
+        results["ordem de chegada"] = (elapsed, sum(s.is_active for s in data_center.servers),
+                                       float((renewable * priorities).sum()))
+
+        data_center = build()
+        start = time.perf_counter()
+        activated = data_center.assign_tasks_by_priority(zip(range(num_tasks), priorities.tolist(), demands.tolist()))
+        elapsed = time.perf_counter() - start
+        renewable = np.array([server.renewable_used for server in data_center.servers])
+        results["prioridade"] = (elapsed, len(activated), float((renewable * priorities).sum()))
+    return {name: {"tempo": t, "ativados": n, "renovavel_ponderada": v} for name, (t, n, v) in results.items()}
+
+
+if __name__ == "__main__":
+    # Configuração do DataCenter com capacidades fictícias e servidores
+    data_center = DataCenter(renewable_capacity_kW=300, regular_capacity_kW=500, server_energy_consumption_kW=50, num_servers=5)
+
+    # Ativa servidores e aloca energia
+    for i in range(5):
+        data_center.assign_task(i)
+        data_center.status()
+        print("\n---")
+
+    # Desativa um servidor
+    data_center.deactivate_server(1)
     data_center.status()
-    print("\n---")
 
-# Desativa um servidor
-data_center.deactivate_server(1)
-data_center.status()
+    print("\n---")
+    for name, result in compare_with_call_order().items():
+        print(f"{name}: {result['tempo'] * 1000:.1f} ms, {result['ativados']} servidores ativados, "
+              f"energia renovável ponderada {result['renovavel_ponderada']:.0f}")
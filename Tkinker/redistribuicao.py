@@ -0,0 +1,241 @@
+import random
+import time
+
+import numpy as np
+
+from .modelo import AMBIENT_TEMPERATURE, HEAT_PER_LOAD
+
+
+def water_fill(candidates, amount):
+    """
+    Calcula a redistribuição de uma carga por "enchimento de água": os servidores
+    mais frios recebem carga até todos chegarem a um mesmo nível de carga, e só
+    então o nível sobe para os demais.
+
+    A carga é conservada: toda a quantidade `amount` é distribuída, por maior que
+    seja. A redistribuição antiga em pedaços de 10 unidades dava no máximo 10 a
+    cada servidor mais frio e descartava o que sobrasse, então, com poucos
+    servidores e muita carga, as cargas e temperaturas agora crescem sem esse
+    descarte (o total fica no data center).
+
+    Os candidatos são consumidos em ordem crescente de temperatura e a leitura
+    para no primeiro cuja temperatura alcança a do nível calculado no modelo de
+    `modelo.Server`: como o nível só desce quando um servidor entra, todos os
+    seguintes também estão acima dele. Assim, só são visitados os servidores mais
+    frios do que o nível. Entre eles, os que já têm carga no nível (mais frios do
+    que a carga indicaria, por exemplo resfriados por um `termica.ThermalEngine`)
+    são pulados. Com as temperaturas de `modelo.Server`, parar pela temperatura
+    equivale a parar no primeiro servidor com carga no nível.
+
+    Args:
+        candidates (iterable): Servidores em ordem crescente de temperatura (por exemplo,
+            `IndexedMinHeap.smallest()`), sem o servidor superaquecido.
+        amount (int): Carga total a redistribuir.
+
+    Returns:
+        list: Pares (servidor, carga) com a parcela de cada servidor que recebe carga.
+    """
+    if amount <= 0:
+        return []
+
+    chosen = []
+    total = amount
+    for server in candidates:
+        if chosen:
+            level = total // len(chosen)
+            if server.temperature >= AMBIENT_TEMPERATURE + level * HEAT_PER_LOAD:
+                break
+            if server.current_load >= level:
+                continue
+        chosen.append(server)
+        total += server.current_load
+    if not chosen:
+        return []
+
+    # Nível comum sobre as cargas ordenadas: os servidores acima do nível ficam de fora.
+    chosen.sort(key=lambda s: s.current_load)
+    filled = len(chosen)
+    prefix = total - amount
+    while filled > 1 and chosen[filled - 1].current_load * filled > amount + prefix:
+        filled -= 1
+        prefix -= chosen[filled].current_load
+    level, remainder = divmod(amount + prefix, filled)
+
+    allocation = []
+    for i, server in enumerate(chosen[:filled]):
+        share = level - server.current_load + (1 if i < remainder else 0)
+        if share > 0:
+            allocation.append((server, share))
+    return allocation
+
+
+def spill_overflow(server_loads, max_capacity=200000):
+    """
+    Limita cada servidor a `max_capacity` e repassa o excesso aos servidores com
+    espaço livre, na ordem dos índices.
+
+    Produz o mesmo resultado da redistribuição antiga do Dashboard (laços aninhados
+    repetidos até não haver excesso): o excesso total preenche o espaço livre a
+    partir do primeiro servidor, e o que não couber em nenhum servidor é descartado.
+    Aqui isso é feito em tempo linear, com uma passada para somar o excesso e outra
+    para distribuí-lo. Listas são alteradas no lugar; vetores NumPy usam somas de
+    prefixos.
+
+    Args:
+        server_loads (list | np.ndarray): Carga atual de cada servidor.
+        max_capacity (int): Capacidade máxima de cada servidor.
+
+    Returns:
+        list | np.ndarray: As cargas ajustadas (o mesmo objeto recebido).
+    """
+    if isinstance(server_loads, np.ndarray):
+        over = server_loads > max_capacity
+        excess = (server_loads[over] - max_capacity).sum()
+        if excess:
+            server_loads[over] = max_capacity
+            headroom = max_capacity - server_loads
+            before = np.cumsum(headroom) - headroom
+            server_loads += np.clip(excess - before, 0, headroom).astype(server_loads.dtype)
+        return server_loads
+
+    excess = 0
+    for i, load in enumerate(server_loads):
+        if load > max_capacity:
+            excess += load - max_capacity
+            server_loads[i] = max_capacity
+    if excess:
+        for j, load in enumerate(server_loads):
+            if load < max_capacity:
+                transfer = min(excess, max_capacity - load)
+                server_loads[j] += transfer
+                excess -= transfer
+                if excess == 0:
+                    break
+    return server_loads
+
+
+def _redistribute_nested(server_loads, max_capacity=200000):
+    """Redistribuição original do Dashboard, mantida como referência para `check_spill_overflow`."""
+    while any(load > max_capacity for load in server_loads):
+        for i, load in enumerate(server_loads):
+            if load > max_capacity:
+                excess = load - max_capacity
+                server_loads[i] = max_capacity
+                for j, other_load in enumerate(server_loads):
+                    if i != j and other_load < max_capacity:
+                        available_space = max_capacity - other_load
+                        transfer = min(excess, available_space)
+                        server_loads[j] += transfer
+                        excess -= transfer
+                        if excess == 0:
+                            break
+    return server_loads
+
+
+def check_spill_overflow(trials=2000, seed=0):
+    """
+    Teste de propriedade: compara `spill_overflow` (listas e vetores NumPy) com a
+    redistribuição original em vetores de carga aleatórios, incluindo casos em que
+    o excesso não cabe no espaço livre.
+
+    Returns:
+        int: Quantos casos divergiram (0 se as versões forem equivalentes).
+    """
+    rng = random.Random(seed)
+    failures = 0
+    for _ in range(trials):
+        size = rng.randint(1, 40)
+        max_capacity = rng.randint(1, 100)
+        loads = [rng.randint(0, 2 * max_capacity) for _ in range(size)]
+        expected = _redistribute_nested(list(loads), max_capacity)
+        if spill_overflow(list(loads), max_capacity) != expected:
+            failures += 1
+        elif spill_overflow(np.array(loads, dtype=np.int64), max_capacity).tolist() != expected:
+            failures += 1
+    return failures
+
+
+def benchmark_spill(num_servers, overloaded_fraction=0.1, seed=0):
+    """
+    Mede a redistribuição do Dashboard com uma fração dos servidores acima da capacidade.
+
+    Returns:
+        dict: Tempo (s) de `spill_overflow` em lista e em vetor NumPy e, até 10 mil
+        servidores, da redistribuição original.
+    """
+    rng = random.Random(seed)
+    max_capacity = 200000
+    loads = [rng.randint(max_capacity - 1000, max_capacity) for _ in range(num_servers)]
+    for i in rng.sample(range(num_servers), int(num_servers * overloaded_fraction)):
+        loads[i] = max_capacity + rng.randint(1, 500)
+
+    results = {}
+    start = time.perf_counter()
+    spill_overflow(list(loads), max_capacity)
+    results["lista"] = time.perf_counter() - start
+    array = np.array(loads, dtype=np.int64)
+    start = time.perf_counter()
+    spill_overflow(array, max_capacity)
+    results["numpy"] = time.perf_counter() - start
+    if num_servers <= 10000:
+        start = time.perf_counter()
+        _redistribute_nested(list(loads), max_capacity)
+        results["original"] = time.perf_counter() - start
+    return results
+
+
+def benchmark_overheats(num_servers=10000, num_tasks=1000, seed=0):
+    """
+    Mede `carga.DataCenter` com superaquecimentos frequentes, comparando o
+    enchimento de água com a redistribuição antiga em pedaços de 10 unidades.
+
+    As cargas das tarefas são altas o bastante para que boa parte das tarefas
+    superaqueça o servidor escolhido.
+
+    Returns:
+        dict: Para cada estratégia, o tempo total (s), a temperatura máxima e a carga total final.
+    """
+    from .carga import DataCenter
+    from .eventos import disabled
+
+    class ChunkedDataCenter(DataCenter):
+        def redistribute_load(self, overheated_server):
+            redistribute_amount = overheated_server.current_load // 2
+            overheated_server.release_task(redistribute_amount)
+            self._reindex(overheated_server)
+            cooler_servers = sorted([s for s in self.servers if s != overheated_server], key=lambda s: s.temperature)
+            for server in cooler_servers:
+                if redistribute_amount <= 0:
+                    break
+                task_chunk = min(redistribute_amount, 10)
+                server.add_task(task_chunk)
+                self._reindex(server)
+                overheated_server.tasks_transferred += task_chunk
+                redistribute_amount -= task_chunk
+
+    results = {}
+    for name, factory in (("enchimento", DataCenter), ("pedacos", ChunkedDataCenter)):
+        rng = random.Random(seed)
+        data_center = factory(num_servers=num_servers)
+        start = time.perf_counter()
+        with disabled():
+            for _ in range(num_tasks):
+                data_center.add_task(rng.randint(50, 500))
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            "tempo": elapsed,
+            "temperatura_maxima": max(s.temperature for s in data_center.servers),
+            "carga_total": sum(s.current_load for s in data_center.servers),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(f"Casos divergentes da redistribuição original: {check_spill_overflow()}")
+    for num_servers in [10000, 100000]:
+        times = ", ".join(f"{name} {elapsed * 1000:.2f} ms" for name, elapsed in benchmark_spill(num_servers).items())
+        print(f"Redistribuição do Dashboard com {num_servers} servidores: {times}")
+    for num_servers in [10000, 50000]:
+        for name, result in benchmark_overheats(num_servers).items():
+            print(f"{num_servers} servidores, {name}: {result['tempo']:.2f} s, "
+                  f"temperatura máxima {result['temperatura_maxima']:.2f}°C, carga total {result['carga_total']}")
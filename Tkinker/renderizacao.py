@@ -0,0 +1,130 @@
+import random
+import time
+
+
+class BlitRenderer:
+    """
+    Renderizador incremental de gráficos Matplotlib baseado em blitting.
+
+    O fundo estático da figura (eixos, marcações, títulos e rótulos) é desenhado
+    uma vez e guardado em cache. A cada quadro, o fundo é restaurado e apenas os
+    artistas animados (linhas e barras) são redesenhados e copiados para a tela.
+    A figura inteira só é redesenhada quando os limites de algum eixo mudam ou
+    quando o próprio canvas pede um redesenho (por exemplo, ao redimensionar a janela).
+
+    Atributos:
+        figure (Figure): A figura renderizada.
+        canvas (FigureCanvasBase): O canvas da figura.
+        artists (list): Os artistas atualizados a cada quadro.
+        full_redraws (int): Quantos quadros precisaram redesenhar a figura inteira.
+
+    Métodos:
+        set_ylim(axis, bottom, top): Ajusta os limites do eixo Y apenas se mudaram.
+        update(): Desenha um quadro.
+        close(): Desconecta o renderizador do canvas.
+    """
+
+    def __init__(self, figure, artists):
+        self.figure = figure
+        self.canvas = figure.canvas
+        self.artists = list(artists)
+        self.full_redraws = 0
+        self._background = None
+        self._stale = True
+        for artist in self.artists:
+            artist.set_animated(True)
+        self._draw_connection = self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_ylim(self, axis, bottom, top):
+        if tuple(axis.get_ylim()) != (bottom, top):
+            axis.set_ylim(bottom, top)
+            self._stale = True
+
+    def update(self):
+        if self._stale or self._background is None:
+            # O redesenho completo dispara _on_draw, que guarda o novo fundo e desenha os artistas.
+            self._stale = False
+            self.full_redraws += 1
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self._background)
+            self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
+
+    def close(self):
+        self.canvas.mpl_disconnect(self._draw_connection)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists:
+            artist.axes.draw_artist(artist)
+
+
+def _dashboard_figure(num_servers=20, history=20):
+    """Monta, com o backend Agg, uma figura com o mesmo layout do Dashboard."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(9, 6), dpi=100)
+    FigureCanvasAgg(figure)
+    ax1 = figure.add_subplot(221)
+    ax2 = figure.add_subplot(222)
+    ax3 = figure.add_subplot(212)
+    ax1.set_title("Consumo de Energia Renovável")
+    ax2.set_title("Consumo de Energia Comum")
+    ax3.set_title("Cargas de Servidores e Ativação")
+    ax3.set_xticks(range(num_servers))
+    ax3.set_xticklabels([str(i) for i in range(num_servers)], rotation=90)
+    line1, = ax1.plot([100] * history, marker='o', label="kW")
+    line2, = ax2.plot([50] * history, marker='o', label="kW")
+    bars = ax3.bar(range(num_servers), [0] * num_servers, label="Cargas por Servidor")
+    ax1.set_ylim(0, 110)
+    ax2.set_ylim(0, 60)
+    ax3.set_ylim(0, 210000)
+    return figure, (ax1, ax2, ax3), line1, line2, bars
+
+
+def measure_frame_time(frames=200, seed=0):
+    """
+    Mede o tempo por quadro do painel com o backend Agg, comparando o redesenho
+    completo da figura a cada tick com o renderizador por blitting.
+
+    Os dados mudam a cada quadro como no Dashboard, mas os limites dos eixos só
+    mudam raramente, que é o caso comum.
+
+    Args:
+        frames (int): Número de quadros medidos em cada modo.
+        seed (int): Semente dos dados gerados.
+
+    Returns:
+        dict: Milissegundos por quadro em cada modo ("completo" e "blitting").
+    """
+    results = {}
+    for mode in ("completo", "blitting"):
+        rng = random.Random(seed)
+        figure, axes, line1, line2, bars = _dashboard_figure()
+        renderer = BlitRenderer(figure, [line1, line2, *bars]) if mode == "blitting" else None
+        figure.canvas.draw()
+        start = time.perf_counter()
+        for frame in range(frames):
+            line1.set_ydata([rng.uniform(60, 100) for _ in range(20)])
+            line2.set_ydata([rng.uniform(20, 50) for _ in range(20)])
+            for bar in bars:
+                bar.set_height(rng.uniform(0, 200000))
+            top = 110 if frame % 50 else 120
+            if renderer is None:
+                axes[0].set_ylim(0, top)
+                figure.canvas.draw()
+            else:
+                renderer.set_ylim(axes[0], 0, top)
+                renderer.update()
+        results[mode] = (time.perf_counter() - start) / frames * 1000
+    return results
+
+
+if __name__ == "__main__":
+    for mode, frame_time in measure_frame_time().items():
+        print(f"{mode}: {frame_time:.2f} ms por quadro")
@@ -0,0 +1,206 @@
+import random
+import time
+
+import numpy as np
+
+# Resolução (s) e capacidade (linhas) de cada nível: 1 hora a 1 s, 1 dia a 1 min e 30 dias a 1 h.
+DEFAULT_LEVELS = ((1, 3600), (60, 1440), (3600, 720))
+
+STATS = ("min", "max", "mean")
+
+
+class _Level:
+    """
+    Um nível de resolução: buffers circulares NumPy com o instante inicial e o
+    mínimo, o máximo e a média de cada intervalo, mais o intervalo ainda aberto.
+    """
+
+    def __init__(self, resolution, capacity, num_fields):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.times = np.zeros(capacity)
+        self.values = {stat: np.zeros((capacity, num_fields)) for stat in STATS}
+        self.head = 0
+        self.size = 0
+        # Intervalo aberto: instante inicial, mínimo, máximo, soma e número de amostras.
+        self.bucket = None
+        self.minimum = np.empty(num_fields)
+        self.maximum = np.empty(num_fields)
+        self.total = np.empty(num_fields)
+        self.count = 0
+
+    def add(self, at, minimum, maximum, total, count):
+        """
+        Acumula amostras (ou um intervalo já agregado) no intervalo aberto.
+
+        Returns:
+            tuple: O intervalo fechado, no mesmo formato dos argumentos, se a amostra
+            iniciou um novo intervalo; None caso contrário.
+        """
+        bucket = at - at % self.resolution
+        closed = None
+        if self.bucket is not None and bucket != self.bucket:
+            closed = self._close()
+        if self.bucket is None:
+            self.bucket = bucket
+            self.minimum[:] = minimum
+            self.maximum[:] = maximum
+            self.total[:] = total
+            self.count = count
+        else:
+            np.minimum(self.minimum, minimum, out=self.minimum)
+            np.maximum(self.maximum, maximum, out=self.maximum)
+            self.total += total
+            self.count += count
+        return closed
+
+    def _close(self):
+        closed = (self.bucket, self.minimum.copy(), self.maximum.copy(), self.total.copy(), self.count)
+        row = self.head
+        self.times[row] = self.bucket
+        self.values["min"][row] = self.minimum
+        self.values["max"][row] = self.maximum
+        self.values["mean"][row] = self.total / self.count
+        self.head = (row + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        self.bucket = None
+        return closed
+
+    def rows_since(self, start):
+        """Índices físicos, em ordem cronológica, das linhas fechadas com instante >= `start`. O(log N + janela)."""
+        first = (self.head - self.size) % self.capacity
+        # As linhas lógicas formam dois trechos ordenados no buffer físico; a busca é feita em
+        # visões dos trechos, sem copiar o buffer, e só as linhas devolvidas são indexadas.
+        n_older = min(self.size, self.capacity - first)
+        n_newer = self.size - n_older
+        skip_older = int(np.searchsorted(self.times[first:first + n_older], start))
+        skip_newer = int(np.searchsorted(self.times[:n_newer], start))
+        return np.concatenate((np.arange(first + skip_older, first + n_older), np.arange(skip_newer, n_newer)))
+
+    def oldest(self):
+        if self.size:
+            return self.times[(self.head - self.size) % self.capacity]
+        return self.bucket
+
+
+class TimeSeriesStore:
+    """
+    Armazém compacto de séries temporais com vários níveis de resolução.
+
+    Cada amostra (um valor por campo) entra no nível mais fino. Quando um intervalo
+    de um nível se fecha, o seu mínimo, máximo e média são guardados em um buffer
+    circular NumPy e repassados ao nível seguinte, mais grosso (por padrão 1 s → 1 min
+    → 1 h). Assim, dias de histórico ocupam poucos MB, e uma consulta lê apenas as
+    linhas da janela pedida, no nível adequado, sem reler as amostras brutas.
+
+    Atributos:
+        fields (tuple): Nomes dos campos de cada amostra.
+        levels (list): Os níveis, do mais fino ao mais grosso.
+
+    Métodos:
+        append(at, values): Registra uma amostra no instante `at` (em segundos).
+        window(field, seconds, stat, resolution): Retorna os instantes e valores dos últimos `seconds` segundos.
+        last(field, count, fill): Retorna os `count` valores mais recentes na resolução mais fina.
+        nbytes: Memória ocupada pelos buffers, em bytes.
+    """
+
+    def __init__(self, fields, levels=DEFAULT_LEVELS):
+        self.fields = tuple(fields)
+        self._columns = {field: i for i, field in enumerate(self.fields)}
+        self.levels = [_Level(resolution, capacity, len(self.fields)) for resolution, capacity in levels]
+        self.latest = None
+
+    def append(self, at, values):
+        values = np.asarray(values, dtype=np.float64)
+        sample = (at, values, values, values, 1)
+        for level in self.levels:
+            sample = level.add(*sample)
+            if sample is None:
+                break
+        self.latest = at
+
+    def window(self, field, seconds, stat="mean", resolution=None):
+        """
+        Consulta os últimos `seconds` segundos de um campo.
+
+        Sem `resolution`, usa o nível mais fino cujo histórico ainda cobre a janela inteira.
+        O intervalo aberto de cada nível também é devolvido, como última linha.
+
+        Args:
+            field (str): Campo consultado.
+            seconds (float): Tamanho da janela.
+            stat (str): "min", "max" ou "mean".
+            resolution (int): Resolução do nível consultado, em segundos.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Instantes iniciais dos intervalos e valores.
+        """
+        if self.latest is None:
+            return np.empty(0), np.empty(0)
+        start = self.latest - seconds
+        if resolution is not None:
+            level = next(level for level in self.levels if level.resolution == resolution)
+        else:
+            # O nível mais fino que cobre a janela; se nenhum cobre, o mais grosso que já tem dados.
+            level = self.levels[0]
+            for candidate in self.levels:
+                oldest = candidate.oldest()
+                if oldest is None:
+                    break
+                level = candidate
+                if oldest <= start - start % candidate.resolution:
+                    break
+        column = self._columns[field]
+        rows = level.rows_since(start - start % level.resolution)
+        times = level.times[rows]
+        values = level.values[stat][rows, column]
+        if level.bucket is not None:
+            pending = {"min": level.minimum, "max": level.maximum, "mean": level.total / level.count}[stat]
+            times = np.append(times, level.bucket)
+            values = np.append(values, pending[column])
+        return times, values
+
+    def last(self, field, count, fill=0.0):
+        """Os `count` valores mais recentes do nível mais fino, completados à esquerda com `fill`."""
+        level = self.levels[0]
+        _, values = self.window(field, count * level.resolution, resolution=level.resolution)
+        values = values[-count:]
+        if values.size < count:
+            values = np.concatenate((np.full(count - values.size, fill), values))
+        return values
+
+    @property
+    def nbytes(self):
+        return sum(level.times.nbytes + sum(array.nbytes for array in level.values.values())
+                   for level in self.levels)
+
+
+def benchmark_history(days=7, seed=0):
+    """
+    Registra `days` dias de amostras por segundo dos três campos do Dashboard e mede
+    a inserção, a memória ocupada e o tempo de consultas de janelas de tamanhos variados.
+
+    Returns:
+        dict: Microssegundos por amostra, MB ocupados, e microssegundos por consulta de cada janela.
+    """
+    rng = random.Random(seed)
+    store = TimeSeriesStore(("renewable_used", "regular_used", "active"))
+    samples = days * 24 * 60 * 60
+    start = time.perf_counter()
+    for second in range(samples):
+        store.append(second, (rng.uniform(0, 100), rng.uniform(0, 50), rng.randint(0, 20)))
+    results = {
+        "insercao_us": (time.perf_counter() - start) / samples * 1e6,
+        "memoria_mb": store.nbytes / 2 ** 20,
+    }
+    for label, seconds in (("20 s", 20), ("1 h", 3600), ("1 dia", 86400), ("7 dias", 7 * 86400)):
+        start = time.perf_counter()
+        for _ in range(100):
+            times, _ = store.window("renewable_used", seconds, stat="max")
+        results[f"consulta {label} ({times.size} linhas)_us"] = (time.perf_counter() - start) / 100 * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_history().items():
+        print(f"{name}: {value:.2f}")
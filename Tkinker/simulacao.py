@@ -0,0 +1,331 @@
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from typing import NamedTuple, Tuple
+
+from .redistribuicao import spill_overflow
+
+
+class Snapshot(NamedTuple):
+    """
+    Estado do data center ao fim de um tick da simulação.
+
+    Atributos:
+        time (float): Instante virtual do tick (em segundos).
+        active (int): Servidores ativos.
+        idle (int): Servidores ociosos.
+        renewable (float): Energia renovável restante (kW).
+        regular (float): Energia comum restante (kW).
+        renewable_used (float): Energia renovável em uso pelos servidores (kW).
+        regular_used (float): Energia comum em uso pelos servidores (kW).
+        server_loads (tuple): Carga de cada servidor.
+    """
+    time: float
+    active: int
+    idle: int
+    renewable: float
+    regular: float
+    renewable_used: float
+    regular_used: float
+    server_loads: Tuple[int, ...]
+
+
+# Ordem de processamento de eventos no mesmo instante: reabastecimento, chegadas e por fim o tick.
+REFILL, TASK, TICK = 0, 1, 2
+
+
+class Simulation:
+    """
+    Simulação de eventos discretos do data center, com relógio virtual.
+
+    Os eventos (ticks do Dashboard, reabastecimentos de energia e chegadas de tarefas)
+    ficam em uma fila de prioridade ordenada pelo instante virtual e são processados
+    tão rápido quanto a CPU permitir, sem `time.sleep`. Um dia simulado leva segundos.
+    A interface gráfica é apenas um assinante opcional dos snapshots publicados a
+    cada tick.
+
+    Atributos:
+        data_center: O data center simulado (`main.DataCenter`, `frota.FleetDataCenter`,
+            ou `carga`/`resfriamento.DataCenter` para chegadas de tarefas).
+        clock (float): O instante virtual atual (em segundos).
+        server_loads (list): Carga de cada servidor usada pelo tick do Dashboard.
+        last_active (int): Servidores ativos no último tick.
+        subscribers (list): Funções chamadas com o `Snapshot` de cada tick.
+
+    Métodos:
+        schedule(at, kind, action): Agenda uma ação para o instante virtual `at`.
+        schedule_ticks(interval, max_tasks, max_load): Agenda os ticks periódicos do Dashboard.
+        schedule_refills(interval, renewable, regular): Agenda o reabastecimento periódico de energia.
+        schedule_arrivals(loads, interval): Agenda chegadas de tarefas a partir de um iterável de cargas.
+        subscribe(callback): Registra um assinante dos snapshots.
+        run(until, max_events): Processa eventos até o instante `until`.
+        tick(max_tasks, max_load): Executa um tick do Dashboard imediatamente e retorna o snapshot.
+        snapshot(): Retorna o estado atual como `Snapshot`.
+    """
+
+    def __init__(self, data_center, seed=None):
+        self.data_center = data_center
+        self.clock = 0.0
+        self.random = random.Random(seed)
+        num_servers = getattr(data_center, "num_servers", None) or len(data_center.servers)
+        self.server_loads = [0] * num_servers
+        self.last_active = 0
+        self.subscribers = []
+        self._events = []
+        self._sequence = itertools.count()
+
+    def schedule(self, at, kind, action):
+        """
+        Agenda `action()` para o instante virtual `at`.
+
+        Args:
+            at (float): Instante virtual do evento (em segundos).
+            kind (int): Prioridade do evento no mesmo instante (REFILL, TASK ou TICK).
+            action (callable): Função sem argumentos executada no evento.
+        """
+        heapq.heappush(self._events, (at, kind, next(self._sequence), action))
+
+    def schedule_ticks(self, interval=1.0, max_tasks=50, max_load=200000):
+        def on_tick():
+            self.tick(max_tasks, max_load)
+            self.schedule(self.clock + interval, TICK, on_tick)
+
+        self.schedule(self.clock, TICK, on_tick)
+
+    def schedule_refills(self, interval=1.0, renewable=(80, 5), regular=(40, 3)):
+        """
+        Agenda o reabastecimento de energia: a cada `interval`, a energia renovável recebe
+        `renewable[1]` kW se estiver abaixo de `renewable[0]`, e o mesmo para a comum.
+
+        Modela geração externa de energia. Não é necessário para manter o data center em
+        funcionamento, pois servidores desligados devolvem a sua energia à fonte.
+        """
+        source = self.data_center.energy_source
+
+        def on_refill():
+            if source.total_renewable_capacity < renewable[0]:
+                source.total_renewable_capacity += renewable[1]
+            if source.regular_capacity < regular[0]:
+                source.regular_capacity += regular[1]
+            self.schedule(self.clock + interval, REFILL, on_refill)
+
+        self.schedule(self.clock, REFILL, on_refill)
+
+    def schedule_arrivals(self, loads, interval=0.01):
+        """
+        Agenda a chegada de uma tarefa a cada `interval` segundos virtuais, a partir do
+        instante atual, chamando `data_center.add_task(load)`. O iterável é consumido sob
+        demanda, uma tarefa por vez, então pode ser um gerador arbitrariamente longo.
+        """
+        loads = iter(loads)
+
+        def schedule_next(at):
+            for load in loads:
+                self.schedule(at, TASK, lambda load=load: on_arrival(load))
+                break
+
+        def on_arrival(load):
+            self.data_center.add_task(load)
+            schedule_next(self.clock + interval)
+
+        schedule_next(self.clock)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def run(self, until=None, max_events=None):
+        """
+        Processa eventos em ordem de instante virtual.
+
+        Args:
+            until (float): Processa apenas eventos com instante menor que `until`; o relógio
+                termina em `until`. Se None, processa até a fila esvaziar.
+            max_events (int): Limite opcional de eventos processados.
+
+        Returns:
+            int: Número de eventos processados.
+        """
+        processed = 0
+        while self._events:
+            if max_events is not None and processed >= max_events:
+                return processed
+            if until is not None and self._events[0][0] >= until:
+                break
+            at, _, _, action = heapq.heappop(self._events)
+            self.clock = at
+            action()
+            processed += 1
+        if until is not None:
+            self.clock = max(self.clock, until)
+        return processed
+
+    def tick(self, max_tasks=50, max_load=200000):
+        """
+        Executa um tick do Dashboard: oscila o número de tarefas, ativa ou desativa
+        servidores conforme a energia disponível e ajusta as cargas.
+
+        Returns:
+            Snapshot: O estado ao fim do tick, também entregue aos assinantes.
+        """
+        data_center = self.data_center
+        new_tasks = max(0, min(max_tasks, self.last_active + (1 if self.random.random() > 0.5 else -1)))
+
+        if hasattr(data_center, "simulate_tick"):
+            data_center.simulate_tick(new_tasks)
+        else:
+            source = data_center.energy_source
+            for i, server in enumerate(data_center.servers):
+                if i < new_tasks:
+                    if not server.is_active and source.total_renewable_capacity >= server.energy_consumption:
+                        data_center.assign_task(i)
+                    self.server_loads[i] = min(self.server_loads[i] + 1, max_load)
+                else:
+                    if server.is_active:
+                        data_center.deactivate_server(i)
+                    self.server_loads[i] = max(self.server_loads[i] - 1, 0)
+            self.server_loads = spill_overflow(self.server_loads, max_capacity=max_load)
+
+        snapshot = self.snapshot()
+        self.last_active = snapshot.active
+        for callback in self.subscribers:
+            callback(snapshot)
+        return snapshot
+
+    def snapshot(self):
+        data_center = self.data_center
+        active, idle, renewable, regular = data_center.get_status()
+        renewable_used, regular_used = data_center.energy_used()
+        loads = getattr(data_center, "loads", None)
+        server_loads = tuple(loads.tolist()) if loads is not None else tuple(self.server_loads)
+        return Snapshot(self.clock, active, idle, renewable, regular, renewable_used, regular_used, server_loads)
+
+
+class SnapshotRunner:
+    """
+    Base das fontes de snapshots que rodam em uma thread própria e os publicam em uma
+    fila limitada, para serem consumidos por outra thread (por exemplo, a da interface
+    Tkinter via `master.after()`).
+
+    A thread nunca espera o consumidor: com a fila cheia, o snapshot mais antigo é
+    descartado. Assim, uma renderização lenta reduz apenas a taxa de quadros, não a
+    taxa de produção. As subclasses implementam `_run`, que deve publicar cada snapshot
+    com `_publish` e terminar quando `_stop` for sinalizado.
+
+    Atributos:
+        snapshots (queue.Queue): Fila limitada de snapshots publicados.
+        dropped (int): Quantos snapshots foram descartados por falta de espaço na fila.
+
+    Métodos:
+        start(): Inicia a thread.
+        stop(timeout): Sinaliza a parada e aguarda a thread terminar.
+        drain(): Retorna todos os snapshots pendentes, do mais antigo ao mais recente.
+    """
+
+    def __init__(self, maxsize=32):
+        self.snapshots = queue.Queue(maxsize)
+        self.dropped = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def drain(self):
+        pending = []
+        while True:
+            try:
+                pending.append(self.snapshots.get_nowait())
+            except queue.Empty:
+                return pending
+
+    def _publish(self, snapshot):
+        while True:
+            try:
+                self.snapshots.put_nowait(snapshot)
+                return
+            except queue.Full:
+                try:
+                    self.snapshots.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _run(self):
+        raise NotImplementedError
+
+
+class SimulationRunner(SnapshotRunner):
+    """
+    Executa uma `Simulation` em uma thread própria e publica os snapshots de cada tick
+    em uma fila limitada (ver `SnapshotRunner`). A simulação nunca espera o consumidor.
+
+    Atributos:
+        simulation (Simulation): A simulação executada.
+        speed (float): Segundos virtuais por segundo real; None roda o mais rápido possível.
+        step (float): Segundos virtuais avançados a cada iteração da thread.
+        snapshots (queue.Queue): Fila limitada de snapshots publicados.
+        dropped (int): Quantos snapshots foram descartados por falta de espaço na fila.
+
+    Métodos:
+        start(): Inicia a thread de simulação.
+        stop(timeout): Sinaliza a parada e aguarda a thread terminar.
+        drain(): Retorna todos os snapshots pendentes, do mais antigo ao mais recente.
+    """
+
+    def __init__(self, simulation, speed=1.0, step=1.0, maxsize=32):
+        super().__init__(maxsize)
+        self.simulation = simulation
+        self.speed = speed
+        self.step = step
+        simulation.subscribe(self._publish)
+
+    def _run(self):
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            self.simulation.run(until=self.simulation.clock + self.step)
+            if self.speed:
+                deadline += self.step / self.speed
+                self._stop.wait(max(0.0, deadline - time.monotonic()))
+
+
+def simulate_day(data_center, seed=0):
+    """
+    Simula 24 horas do modelo do Dashboard (um tick por segundo).
+
+    Returns:
+        Tuple[float, Snapshot]: Tempo real gasto (s) e o último snapshot.
+    """
+    simulation = Simulation(data_center, seed=seed)
+    simulation.schedule_ticks()
+    last = []
+    simulation.subscribe(last.append)
+    start = time.perf_counter()
+    simulation.run(until=24 * 60 * 60)
+    return time.perf_counter() - start, last[-1]
+
+
+if __name__ == "__main__":
+    from .carga import DataCenter as LoadDataCenter, generate_user_tasks
+    from .eventos import disabled
+    from .main import DataCenter
+
+    elapsed, last = simulate_day(DataCenter(renewable_capacity_kW=100, regular_capacity_kW=50,
+                                            server_energy_consumption_kW=5, num_servers=20))
+    print(f"Um dia simulado (86400 ticks) em {elapsed:.2f} s. Último estado: {last.active} ativos, "
+          f"{last.renewable:.2f} kW renováveis, {last.regular:.2f} kW comuns")
+
+    # As 100 mil tarefas do teste de carga, a cada 10 ms virtuais, sem esperar o relógio real.
+    simulation = Simulation(LoadDataCenter(num_servers=5))
+    simulation.schedule_arrivals(generate_user_tasks(100000), interval=0.01)
+    start = time.perf_counter()
+    with disabled():
+        simulation.run()
+    print(f"100000 tarefas ({simulation.clock:.0f} s virtuais) em {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,365 @@
+"""
+Registro de telemetria da simulação em arquivo binário.
+
+O arquivo tem um cabeçalho fixo seguido de um registro de tamanho fixo por tick. Cada
+registro guarda o instante, a energia restante e, em colunas contíguas, o estado de cada
+servidor (atividade, carga, energia renovável e comum usada e temperatura). O arquivo só
+cresce no fim, então pode ser lido com `np.memmap` enquanto ainda está sendo escrito, e
+cada coluna de todos os ticks é uma visão sem cópia do arquivo.
+"""
+import operator
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+from .simulacao import Snapshot, SnapshotRunner
+
+MAGIC = b"GDCTELE1"
+# Cabeçalho: assinatura, número de servidores e espaço reservado, em 64 bytes.
+HEADER = struct.Struct("<8sI52x")
+
+_is_active = operator.attrgetter("is_active")
+
+
+def record_dtype(num_servers):
+    """Tipo NumPy de um registro (um tick) para uma frota de `num_servers` servidores."""
+    return np.dtype([
+        ("time", "<f8"),
+        ("renewable", "<f8"),
+        ("regular", "<f8"),
+        ("active", "u1", (num_servers,)),
+        ("load", "<i4", (num_servers,)),
+        ("renewable_used", "<f4", (num_servers,)),
+        ("regular_used", "<f4", (num_servers,)),
+        ("temperature", "<f4", (num_servers,)),
+    ])
+
+
+def _server_columns(data_center):
+    """
+    Atividade, energia renovável, energia comum e temperatura de cada servidor.
+
+    A energia vem do livro-razão da fonte, quando há um: um `Server` desligado mantém a
+    última alocação em `renewable_used` e `regular_used`, mas não usa mais energia. Sem
+    livro-razão, esses campos são mascarados pela atividade.
+    """
+    if hasattr(data_center, "is_active"):
+        temperature = getattr(data_center, "temperature", None)
+        return (data_center.is_active, data_center.renewable_used, data_center.regular_used,
+                np.nan if temperature is None else temperature)
+    servers = data_center.servers
+    active = np.fromiter(map(_is_active, servers), dtype=bool, count=len(servers))
+    ledger = getattr(getattr(data_center, "energy_source", None), "ledger", None)
+    if ledger is not None:
+        renewable_used, regular_used = ledger.renewable, ledger.regular
+    else:
+        renewable_used = np.where(active, [server.renewable_used for server in servers], 0.0)
+        regular_used = np.where(active, [server.regular_used for server in servers], 0.0)
+    return active, renewable_used, regular_used, [getattr(server, "temperature", np.nan) for server in servers]
+
+
+class TelemetryWriter:
+    """
+    Escreve o registro de telemetria de uma simulação, um registro por tick.
+
+    Os registros são montados diretamente em um lote NumPy pré-alocado e gravados no
+    arquivo de uma só vez quando o lote enche (ou em `flush`), sem criar objetos Python
+    por campo.
+
+    Atributos:
+        path (str): Caminho do arquivo.
+        num_servers (int): Número de servidores de cada registro.
+        ticks (int): Número de registros escritos (incluindo os do lote ainda não gravado).
+
+    Métodos:
+        append(at, renewable, regular, active, loads, renewable_used, regular_used, temperature):
+            Acrescenta o registro de um tick.
+        attach(simulation): Registra um tick a cada snapshot publicado pela simulação.
+        flush(): Grava o lote pendente no arquivo.
+        close(): Grava o lote pendente e fecha o arquivo.
+    """
+
+    def __init__(self, path, num_servers, batch_ticks=256):
+        self.path = path
+        self.num_servers = num_servers
+        self.ticks = 0
+        self._batch = np.zeros(batch_ticks, dtype=record_dtype(num_servers))
+        # Visões de cada campo do lote, para escrever sem passar por registros intermediários.
+        self._columns = {field: self._batch[field] for field in self._batch.dtype.names}
+        self._pending = 0
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, "ab")
+        if exists:
+            with open(path, "rb") as existing:
+                magic, stored_servers = HEADER.unpack(existing.read(HEADER.size))
+            if magic != MAGIC or stored_servers != num_servers:
+                self._file.close()
+                raise ValueError(f"{path} não é um registro de telemetria de {num_servers} servidores")
+            self.ticks = (os.path.getsize(path) - HEADER.size) // self._batch.itemsize
+        else:
+            self._file.write(HEADER.pack(MAGIC, num_servers))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, at, renewable, regular, active, loads, renewable_used, regular_used, temperature=np.nan):
+        row = self._pending
+        columns = self._columns
+        columns["time"][row] = at
+        columns["renewable"][row] = renewable
+        columns["regular"][row] = regular
+        columns["active"][row] = active
+        columns["load"][row] = loads
+        columns["renewable_used"][row] = renewable_used
+        columns["regular_used"][row] = regular_used
+        columns["temperature"][row] = temperature
+        self._pending += 1
+        self.ticks += 1
+        if self._pending == len(self._batch):
+            self.flush()
+
+    def attach(self, simulation):
+        """Assina os snapshots da simulação e grava o estado do seu data center a cada tick."""
+        data_center = simulation.data_center
+
+        def on_snapshot(snapshot):
+            active, renewable_used, regular_used, temperature = _server_columns(data_center)
+            self.append(snapshot.time, snapshot.renewable, snapshot.regular, active, snapshot.server_loads,
+                        renewable_used, regular_used, temperature)
+
+        simulation.subscribe(on_snapshot)
+
+    def flush(self):
+        if self._pending:
+            self._file.write(memoryview(self._batch[:self._pending]).cast("B"))
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class TelemetryLog:
+    """
+    Leitura de um registro de telemetria mapeado em memória.
+
+    `records` é um vetor estruturado NumPy sobre o arquivo (via `np.memmap`), então
+    abrir um registro de milhões de ticks não lê nem copia os dados, e cada coluna
+    (por exemplo, `log.column("load")`, de formato ticks × servidores) é uma visão do arquivo.
+
+    Atributos:
+        path (str): Caminho do arquivo.
+        num_servers (int): Número de servidores de cada registro.
+        records (np.memmap): Os registros, um por tick.
+
+    Métodos:
+        column(field): Visão de um campo em todos os ticks.
+        snapshot(index): O registro `index` como `simulacao.Snapshot`.
+        snapshots(start, stop): Gera os snapshots de um intervalo de ticks.
+        refresh(): Remapeia o arquivo para incluir registros escritos depois da abertura.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as log_file:
+            magic, self.num_servers = HEADER.unpack(log_file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um registro de telemetria")
+        self.dtype = record_dtype(self.num_servers)
+        self.records = None
+        self.refresh()
+
+    def __len__(self):
+        return len(self.records)
+
+    def refresh(self):
+        ticks = (os.path.getsize(self.path) - HEADER.size) // self.dtype.itemsize
+        if ticks:
+            self.records = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER.size, shape=(ticks,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def column(self, field):
+        return self.records[field]
+
+    def snapshot(self, index):
+        record = self.records[index]
+        active = int(np.count_nonzero(record["active"]))
+        return Snapshot(float(record["time"]), active, self.num_servers - active,
+                        float(record["renewable"]), float(record["regular"]),
+                        float(record["renewable_used"].sum()), float(record["regular_used"].sum()),
+                        tuple(record["load"].tolist()))
+
+    def snapshots(self, start=0, stop=None):
+        for index in range(*slice(start, stop).indices(len(self))):
+            yield self.snapshot(index)
+
+
+class TelemetryReplay(SnapshotRunner):
+    """
+    Reproduz um registro de telemetria em uma thread própria, publicando os snapshots
+    em uma fila limitada, com a mesma base e interface de `simulacao.SimulationRunner`
+    (`start`, `stop`, `drain`). Assim, o Dashboard ou qualquer ferramenta de análise
+    consome uma execução gravada como se fosse uma simulação ao vivo.
+
+    Atributos:
+        log (TelemetryLog): O registro reproduzido.
+        speed (float): Segundos gravados por segundo real; None reproduz o mais rápido possível.
+        snapshots (queue.Queue): Fila limitada de snapshots publicados.
+        dropped (int): Quantos snapshots foram descartados por falta de espaço na fila.
+        finished (bool): Se a reprodução chegou ao fim do registro.
+    """
+
+    def __init__(self, log, speed=1.0, start=0, stop=None, maxsize=32):
+        super().__init__(maxsize)
+        self.log = log
+        self.speed = speed
+        self.start_index = start
+        self.stop_index = stop
+        self.finished = False
+
+    def _run(self):
+        started = time.monotonic()
+        first = None
+        for snapshot in self.log.snapshots(self.start_index, self.stop_index):
+            if self._stop.is_set():
+                return
+            if self.speed:
+                first = snapshot.time if first is None else first
+                delay = started + (snapshot.time - first) / self.speed - time.monotonic()
+                if delay > 0 and self._stop.wait(delay):
+                    return
+            self._publish(snapshot)
+        self.finished = True
+
+
+def replay(log, callback, speed=None, start=0, stop=None):
+    """
+    Reproduz um registro na thread atual, chamando `callback(snapshot)` para cada tick.
+
+    Args:
+        log (TelemetryLog): O registro.
+        callback (callable): Função chamada com cada `Snapshot`.
+        speed (float): Segundos gravados por segundo real; None reproduz o mais rápido possível.
+
+    Returns:
+        int: Número de ticks reproduzidos.
+    """
+    started = time.monotonic()
+    first = None
+    count = 0
+    for snapshot in log.snapshots(start, stop):
+        if speed:
+            first = snapshot.time if first is None else first
+            delay = started + (snapshot.time - first) / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        callback(snapshot)
+        count += 1
+    return count
+
+
+def check_replay(num_servers=20, seconds=300, seed=0):
+    """
+    Grava uma simulação de `main.DataCenter` e compara cada snapshot reproduzido do
+    registro com o publicado ao vivo. A energia usada é gravada em float32, então as
+    somas são comparadas com tolerância relativa.
+
+    Returns:
+        int: Quantos ticks divergiram (0 se a reprodução refaz a execução gravada).
+    """
+    from .main import DataCenter
+    from .simulacao import Simulation
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "execucao.bin")
+        simulation = Simulation(DataCenter(renewable_capacity_kW=num_servers * 5, regular_capacity_kW=num_servers * 5 / 2,
+                                           server_energy_consumption_kW=5, num_servers=num_servers), seed=seed)
+        simulation.schedule_ticks()
+        live = []
+        with TelemetryWriter(path, num_servers) as writer:
+            writer.attach(simulation)
+            simulation.subscribe(live.append)
+            simulation.run(until=seconds)
+        log = TelemetryLog(path)
+        replayed = list(log.snapshots())
+        del log
+    mismatches = abs(len(live) - len(replayed))
+    for expected, actual in zip(live, replayed):
+        exact = expected._replace(renewable_used=0, regular_used=0) == actual._replace(renewable_used=0, regular_used=0)
+        close = np.allclose([expected.renewable_used, expected.regular_used],
+                            [actual.renewable_used, actual.regular_used], rtol=1e-5, atol=1e-4)
+        mismatches += not (exact and close)
+    return mismatches
+
+
+def benchmark_telemetry(num_ticks=1000000, num_servers=20, directory=None):
+    """
+    Mede a escrita de `num_ticks` registros e a leitura de uma coluna de todos os ticks.
+
+    Returns:
+        dict: Microssegundos por tick escrito, MB no disco, milissegundos para abrir o
+        registro e para somar a carga de todos os servidores em todos os ticks.
+    """
+    rng = np.random.default_rng(0)
+    active = rng.integers(0, 2, num_servers).astype(bool)
+    loads = rng.integers(0, 200000, num_servers)
+    renewable_used = rng.uniform(0, 5, num_servers)
+    regular_used = rng.uniform(0, 5, num_servers)
+    temperature = rng.uniform(25, 80, num_servers)
+
+    with tempfile.TemporaryDirectory(dir=directory) as folder:
+        path = os.path.join(folder, "telemetria.bin")
+        start = time.perf_counter()
+        with TelemetryWriter(path, num_servers, batch_ticks=4096) as writer:
+            for tick in range(num_ticks):
+                writer.append(tick, 100.0, 50.0, active, loads, renewable_used, regular_used, temperature)
+        write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        log = TelemetryLog(path)
+        opened = time.perf_counter() - start
+        start = time.perf_counter()
+        total_load = int(log.column("load").sum(dtype=np.int64))
+        scanned = time.perf_counter() - start
+        assert total_load == int(loads.sum()) * num_ticks
+        size = os.path.getsize(path)
+        del log
+    return {
+        "escrita_us_por_tick": write / num_ticks * 1e6,
+        "tamanho_mb": size / 2 ** 20,
+        "abertura_ms": opened * 1000,
+        "soma_das_cargas_ms": scanned * 1000,
+    }
+
+
+if __name__ == "__main__":
+    from .main import DataCenter
+    from .simulacao import Simulation
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "dia.bin")
+        simulation = Simulation(DataCenter(renewable_capacity_kW=100, regular_capacity_kW=50,
+                                           server_energy_consumption_kW=5, num_servers=20), seed=0)
+        simulation.schedule_ticks()
+        with TelemetryWriter(path, 20) as writer:
+            writer.attach(simulation)
+            simulation.run(until=3600)
+        log = TelemetryLog(path)
+        last = []
+        replayed = replay(log, last.append)
+        print(f"Uma hora gravada: {len(log)} ticks; reproduzidos {replayed}, último com {last[-1].active} ativos "
+              f"e {last[-1].renewable:.2f} kW renováveis")
+        del log
+
+    print(f"Ticks reproduzidos diferentes da execução ao vivo: {check_replay()}")
+    for name, value in benchmark_telemetry().items():
+        print(f"{name}: {value:.2f}")
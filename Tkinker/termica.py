@@ -0,0 +1,312 @@
+"""
+Motor térmico vetorizado dos racks do data center.
+
+No modelo antigo (`modelo.Server`), a temperatura de um servidor vai na hora para
+`25 + carga * 0.5` e cada resfriamento tira 5 °C. Aqui cada servidor é um nó RC
+(capacitância térmica ligada ao ar ambiente por uma resistência), aquecido pela carga,
+acoplado aos vizinhos no rack e resfriado pela unidade de refrigeração da sua fileira:
+
+    dT_i/dt = g (T_amb - T_i) + g * HEAT_PER_LOAD * carga_i
+              + sum_j g * w_ij (T_j - T_i) + u_k * g * c (T_insuflamento - T_i)
+
+com g = 1 / constante de tempo. Sem vizinhos e sem refrigeração, o regime permanente é
+exatamente o do modelo antigo. O acoplamento é uma matriz de adjacência esparsa, guardada
+como listas de arestas (linhas, colunas, pesos) e aplicada com `np.bincount`; o passo é
+semi-implícito (os termos do próprio servidor são implícitos e os dos vizinhos,
+explícitos), então é estável para qualquer `dt`. Um passo de 100 mil servidores leva
+poucos milissegundos.
+
+`step_data_center` avança o motor com as cargas de um `carga.DataCenter` ou
+`resfriamento.DataCenter`, copia as temperaturas para os servidores com
+`sync_temperatures` e roda o `check_and_cool` do data center sobre elas.
+"""
+import time
+import weakref
+from operator import attrgetter
+
+import numpy as np
+
+from .modelo import AMBIENT_TEMPERATURE, HEAT_PER_LOAD
+
+
+def rack_adjacency(num_servers, rack_size=42, racks_per_row=10, vertical=0.3, lateral=0.05):
+    """
+    Matriz de adjacência esparsa dos servidores, em formato de coordenadas, com cada
+    aresta uma única vez. Os servidores ocupam os racks em ordem de ID, `rack_size` por
+    rack, e os racks formam fileiras de `racks_per_row`.
+
+    Args:
+        num_servers (int): Número de servidores.
+        rack_size (int): Servidores por rack.
+        racks_per_row (int): Racks por fileira.
+        vertical (float): Acoplamento entre servidores vizinhos no mesmo rack (relativo ao ar ambiente).
+        lateral (float): Acoplamento entre servidores na mesma posição de racks vizinhos na fileira.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Linhas, colunas e pesos das arestas.
+    """
+    ids = np.arange(num_servers)
+    slot = ids % rack_size
+    rack = ids // rack_size
+    below = ids[:-1][slot[:-1] != rack_size - 1]
+    beside = ids[:max(num_servers - rack_size, 0)]
+    beside = beside[(rack[beside] + 1) % racks_per_row != 0]
+    rows = np.concatenate((below, beside))
+    cols = np.concatenate((below + 1, beside + rack_size))
+    weights = np.concatenate((np.full(len(below), float(vertical)), np.full(len(beside), float(lateral))))
+    return rows, cols, weights
+
+
+class ThermalEngine:
+    """
+    Dinâmica térmica RC de todos os servidores, avançada em um passo vetorizado.
+
+    Cada unidade de refrigeração atende `racks_per_unit` racks consecutivos. Sem uma
+    entrada explícita, o termostato liga cada unidade proporcionalmente ao quanto o
+    servidor mais quente dos seus racks passa de `setpoint`, até a potência máxima a
+    `setpoint + band`.
+
+    Atributos:
+        temperature (np.ndarray): Temperatura de cada servidor (°C).
+        ambient (float | np.ndarray): Temperatura do ar de cada rack (°C), um valor ou um por rack.
+        cooling (np.ndarray): Potência de cada unidade de refrigeração no último passo (0 a 1).
+        rack (np.ndarray): Rack de cada servidor.
+        unit (np.ndarray): Unidade de refrigeração de cada servidor.
+        rows, cols, weights (np.ndarray): Arestas da matriz de adjacência (ver `rack_adjacency`).
+
+    Métodos:
+        step(loads, dt, cooling): Avança `dt` segundos e retorna as temperaturas.
+        thermostat(): Potência de cada unidade de refrigeração pedida pelo termostato.
+        steady_state(loads, cooling): Resolve o regime permanente diretamente (só para frotas pequenas).
+    """
+
+    def __init__(self, num_servers, rack_size=42, racks_per_row=10, racks_per_unit=4, time_constant=120.0,
+                 vertical_coupling=0.3, lateral_coupling=0.05, ambient=AMBIENT_TEMPERATURE,
+                 supply_temperature=18.0, cooling_conductance=1.0, setpoint=60.0, band=15.0, adjacency=None):
+        self.num_servers = num_servers
+        self.time_constant = time_constant
+        self.supply_temperature = supply_temperature
+        self.cooling_conductance = cooling_conductance
+        self.setpoint = setpoint
+        self.band = band
+        self.ambient = ambient
+        ids = np.arange(num_servers)
+        self.rack = ids // rack_size
+        self.unit = self.rack // racks_per_unit
+        self.num_units = int(self.unit[-1]) + 1 if num_servers else 0
+        self._unit_starts = np.flatnonzero(np.r_[True, self.unit[1:] != self.unit[:-1]]) if num_servers else ids
+        if adjacency is None:
+            adjacency = rack_adjacency(num_servers, rack_size, racks_per_row, vertical_coupling, lateral_coupling)
+        self.rows, self.cols, self.weights = (np.asarray(column) for column in adjacency)
+        self.degree = (np.bincount(self.rows, self.weights, num_servers)
+                       + np.bincount(self.cols, self.weights, num_servers))
+        self.temperature = self._ambient() + np.zeros(num_servers)
+        self.cooling = np.zeros(self.num_units)
+
+    def _ambient(self):
+        ambient = np.asarray(self.ambient, dtype=np.float64)
+        return ambient if ambient.ndim == 0 else ambient[self.rack]
+
+    def thermostat(self):
+        if not self.num_servers:
+            return self.cooling
+        hottest = np.maximum.reduceat(self.temperature, self._unit_starts)
+        return np.clip((hottest - self.setpoint) / self.band, 0.0, 1.0)
+
+    def step(self, loads, dt=1.0, cooling=None):
+        """
+        Avança a temperatura de todos os servidores em `dt` segundos.
+
+        Args:
+            loads (array): Carga de cada servidor, na ordem de ID.
+            dt (float): Duração do passo (s).
+            cooling (array): Potência de cada unidade de refrigeração (0 a 1); sem ela, usa o termostato.
+
+        Returns:
+            np.ndarray: As novas temperaturas (o próprio `temperature`).
+        """
+        g = 1.0 / self.time_constant
+        temperature = self.temperature
+        cooling = self.thermostat() if cooling is None else np.asarray(cooling, dtype=np.float64)
+        chilled = cooling[self.unit] * (g * self.cooling_conductance)
+        # Calor vindo dos vizinhos, com as temperaturas do início do passo: (W T)_i, sem montar W.
+        flow = self.weights * temperature[self.cols]
+        neighbors = np.bincount(self.rows, flow, self.num_servers)
+        np.multiply(self.weights, temperature[self.rows], out=flow)
+        neighbors += np.bincount(self.cols, flow, self.num_servers)
+
+        numerator = np.multiply(loads, g * HEAT_PER_LOAD, dtype=np.float64)
+        numerator += g * self._ambient()
+        numerator += g * neighbors
+        numerator += chilled * self.supply_temperature
+        numerator *= dt
+        numerator += temperature
+        denominator = chilled
+        denominator += g * (1.0 + self.degree)
+        denominator *= dt
+        denominator += 1.0
+        np.divide(numerator, denominator, out=temperature)
+        self.cooling = cooling
+        return temperature
+
+    def steady_state(self, loads, cooling=None):
+        """
+        Temperaturas de equilíbrio para cargas e refrigeração constantes, resolvendo o
+        sistema linear denso. O(N^3): serve para conferir `step` em frotas pequenas.
+        """
+        g = 1.0 / self.time_constant
+        cooling = self.cooling if cooling is None else np.asarray(cooling, dtype=np.float64)
+        chilled = cooling[self.unit] * (g * self.cooling_conductance)
+        system = np.diag(g * (1.0 + self.degree) + chilled)
+        np.subtract.at(system, (self.rows, self.cols), g * self.weights)
+        np.subtract.at(system, (self.cols, self.rows), g * self.weights)
+        rhs = g * HEAT_PER_LOAD * np.asarray(loads, dtype=np.float64) + g * self._ambient() \
+            + chilled * self.supply_temperature
+        return np.linalg.solve(system, rhs + np.zeros(self.num_servers))
+
+
+# Identificadores e temperaturas máximas de cada frota sincronizada, que não mudam entre passos.
+_columns = weakref.WeakKeyDictionary()
+
+
+def server_loads(data_center):
+    """Carga de cada servidor de um data center, na ordem de ID."""
+    servers = data_center.servers
+    return np.fromiter(map(attrgetter("current_load"), servers), dtype=np.int64, count=len(servers))
+
+
+def sync_temperatures(data_center, temperatures, loads=None):
+    """
+    Substitui a temperatura de todos os servidores de um `carga.DataCenter` ou
+    `resfriamento.DataCenter` (na ordem de ID) e reconstrói os seus índices de uma só vez,
+    com uma ordenação em NumPy, em vez de reposicionar os servidores um a um.
+
+    Os identificadores e as temperaturas máximas são lidos dos servidores na primeira
+    sincronização de cada frota e reaproveitados enquanto a lista de servidores for a mesma.
+
+    Args:
+        data_center (DataCenter): O data center sincronizado.
+        temperatures (array-like): Nova temperatura de cada servidor (°C).
+        loads (np.ndarray): Carga atual de cada servidor, se já calculada (ver `server_loads`).
+    """
+    servers = data_center.servers
+    cached = _columns.get(data_center)
+    if cached is None or cached[0] is not servers or cached[1].size != len(servers):
+        ids = np.fromiter(map(attrgetter("server_id"), servers), dtype=np.int64, count=len(servers))
+        max_temps = np.fromiter(map(attrgetter("max_temp"), servers), dtype=np.float64, count=len(servers))
+        cached = _columns[data_center] = (servers, ids, max_temps)
+    _, ids, max_temps = cached
+    temperatures = np.asarray(temperatures, dtype=np.float64)
+    if loads is None:
+        loads = server_loads(data_center)
+
+    for server, temperature in zip(servers, temperatures.tolist()):
+        server.temperature = temperature
+    # As temperaturas do motor raramente empatam: a ordenação simples basta, e o desempate por
+    # carga e identificador só é feito quando há empates.
+    order = np.argsort(temperatures)
+    ordered = temperatures[order]
+    if np.any(ordered[1:] == ordered[:-1]):
+        order = np.lexsort((ids, loads, temperatures))
+        ordered = temperatures[order]
+    data_center.queue.replace_sorted(list(map(servers.__getitem__, order.tolist())),
+                                     zip(ordered.tolist(), loads[order].tolist(), ids[order].tolist()))
+    data_center.overheated = set(map(servers.__getitem__, np.flatnonzero(temperatures > max_temps).tolist()))
+
+
+def step_data_center(engine, data_center, dt=1.0, cooling=None):
+    """
+    Avança o motor com as cargas atuais do data center, copia as temperaturas para os
+    servidores e roda o `check_and_cool` do data center sobre elas.
+
+    Entre dois passos, as temperaturas dos servidores que recebem ou cedem carga seguem as
+    estimativas instantâneas de `modelo.Server` (usadas para escolher onde alocar); o passo
+    seguinte as substitui pela saída do motor, que reage à nova carga com inércia.
+
+    Returns:
+        np.ndarray: As temperaturas calculadas pelo motor, antes do resfriamento.
+    """
+    loads = server_loads(data_center)
+    temperatures = engine.step(loads, dt, cooling)
+    sync_temperatures(data_center, temperatures, loads)
+    data_center.check_and_cool()
+    return temperatures
+
+
+def check_steady_state(num_servers=300, seed=0):
+    """
+    Confere o motor em uma frota pequena: sem vizinhos e sem refrigeração, o regime
+    permanente deve ser o do modelo antigo (`25 + carga * 0.5`); com vizinhos e
+    refrigeração, muitos passos de `step` devem convergir para a solução do sistema linear.
+
+    Returns:
+        Tuple[float, float]: Maior erro (°C) em cada um dos dois casos.
+    """
+    rng = np.random.default_rng(seed)
+    loads = rng.integers(0, 100, num_servers)
+    isolated = ThermalEngine(num_servers, vertical_coupling=0.0, lateral_coupling=0.0)
+    off = np.zeros(isolated.num_units)
+    for _ in range(200):
+        isolated.step(loads, dt=60.0, cooling=off)
+    legacy = AMBIENT_TEMPERATURE + loads * HEAT_PER_LOAD
+    coupled = ThermalEngine(num_servers, rack_size=10, racks_per_row=3, racks_per_unit=2)
+    cooling = rng.uniform(0, 1, coupled.num_units)
+    for _ in range(400):
+        coupled.step(loads, dt=60.0, cooling=cooling)
+    return (float(np.abs(isolated.temperature - legacy).max()),
+            float(np.abs(coupled.temperature - coupled.steady_state(loads, cooling)).max()))
+
+
+def benchmark_termica(num_servers=100000, steps=100, seed=0):
+    """
+    Mede um passo do motor para `num_servers` servidores e um passo completo sobre um
+    `carga.DataCenter` (motor, sincronização dos índices e `check_and_cool`).
+
+    Returns:
+        dict: Tempo médio (ms) de cada um e quantos servidores estavam superaquecidos no fim.
+    """
+    from .carga import DataCenter
+    from .eventos import disabled
+
+    rng = np.random.default_rng(seed)
+    engine = ThermalEngine(num_servers)
+    loads = rng.integers(0, 90, num_servers)
+    start = time.perf_counter()
+    for _ in range(steps):
+        engine.step(loads, dt=1.0)
+    engine_ms = (time.perf_counter() - start) / steps * 1e3
+
+    data_center = DataCenter(num_servers=num_servers)
+    for server, load in zip(data_center.servers, loads.tolist()):
+        server.current_load = load
+    engine = ThermalEngine(num_servers)
+    cycles = max(steps // 10, 1)
+    with disabled():
+        start = time.perf_counter()
+        for _ in range(cycles):
+            step_data_center(engine, data_center, dt=30.0)
+        cycle_ms = (time.perf_counter() - start) / cycles * 1e3
+    return {"passo_do_motor_ms": engine_ms, "passo_com_data_center_ms": cycle_ms,
+            "superaquecidos": int((engine.temperature > 75).sum())}
+
+
+if __name__ == "__main__":
+    # Um rack de 8 servidores: uma carga alta no servidor 3 aquece aos poucos ele e, menos, os vizinhos.
+    engine = ThermalEngine(8, rack_size=8, racks_per_unit=1)
+    loads = np.zeros(8)
+    loads[3] = 120
+    for minute in range(0, 11):
+        if minute in (0, 1, 2, 5, 10):
+            print(f"{minute:2d} min: " + " ".join(f"{t:5.1f}" for t in engine.temperature)
+                  + f"  (refrigeração {engine.cooling[0]:.0%})")
+        for _ in range(60):
+            engine.step(loads, dt=1.0)
+
+    isolated, coupled = check_steady_state()
+    print(f"Regime permanente: erro máximo {isolated:.2e} °C sem acoplamento (contra 25 + carga * 0.5) "
+          f"e {coupled:.2e} °C com acoplamento (contra o sistema linear)")
+
+    results = benchmark_termica()
+    print(f"100000 servidores: {results['passo_do_motor_ms']:.2f} ms por passo do motor, "
+          f"{results['passo_com_data_center_ms']:.1f} ms com sincronização e check_and_cool "
+          f"({results['superaquecidos']} superaquecidos)")